@@ -1,11 +1,10 @@
 import streamlit as st
 import pandas as pd
-import copy
+import numpy as np
 import json
-import io 
 import os
+import hmac
 from datetime import date
-from dateutil.relativedelta import relativedelta 
 
 # --- 0. Yapılandırma ---
 st.set_page_config(
@@ -15,45 +14,84 @@ st.set_page_config(
 )
 
 # --- 0.1 Kalıcılık Sabiti ---
-DATA_FILE = 'finans_data.json'
+# Sunucu tarafı profil deposu (otomatik kayıt) isteğe bağlıdır. Depodaki profilleri sunucuyu kullanan herkes
+# listeleyebilir, ?profil= ile açabilir ve üzerine yazabilir; bu yüzden yalnızca ortam değişkeninde bir dizin
+# verilen (tek kullanıcılı ya da yerel) kurulumlarda açılır. Tanımlı değilse profiller yalnızca JSON yedeğiyle taşınır.
+PROFIL_DIZINI_ORTAM_DEGISKENI = 'BORC_PLANI_PROFIL_DIZINI'
+PROFIL_DIZINI = os.environ.get(PROFIL_DIZINI_ORTAM_DEGISKENI) or None
 
 # --- 1. Sabitler ve Kurallar ---
 
-STRATEJILER = {
-    "Minimum Çaba (Minimum Ek Ödeme)": 0.0,
-    "Temkinli (Yüzde 50)": 0.5,
-    "Maksimum Çaba (Tüm Ek Ödeme)": 1.0, 
-    "Aşırı Çaba (x1.5 Ek Ödeme)": 1.5,
-}
-
-ONCELIK_STRATEJILERI = {
-    "Borç Çığı (Avalanche - Önce Faiz)": "Avalanche",
-    "Borç Kartopu (Snowball - Önce Tutar)": "Snowball",
-    "Kullanıcı Tanımlı Sıra": "Kullanici"
-}
-
-# Para formatlama fonksiyonu
-def format_tl(tutar):
-    if pd.isna(tutar) or tutar is None:
-        return "0 TL"
-    return f"{int(tutar):,} TL"
+# Hesap çekirdeği borc_plani paketinde (Streamlit'ten bağımsız, toplu.py ve benchmark.py de kullanır).
+from borc_plani import (
+    STRATEJILER, ONCELIK_STRATEJILERI, SIMULASYON_MOTORLARI, VARSAYILAN_TR_PARAMS,
+    PROFILLEME_KIPLERI, MONTE_CARLO_DAGILIMLARI, MONTE_CARLO_VARSAYILAN, OPTIMIZASYON_HEDEFLERI,
+    GIDER_KURALLARI, format_tl, borc_olustur, gelir_olustur, borc_kayitlari, gelir_kayitlari, sozluklere, simule_borc_planı, simule_monte_carlo, optimize_odeme_sirasi,
+    simulasyon_onbellegi, kontrol_noktasi_onbellegi, gelir_takvimi_onbellegi, onbellek_anahtari, generate_report_and_recommendations, excel_raporu_olustur,
+    DUYARLILIK_ADIMI, DUYARLILIK_PARAMETRELERI, duyarlilik_analizi, is_baslat, HEDEF_TURLERI, KALDIRACLAR, hedef_ara, profil_deposu, AKTARIM_TURLERI, BORC_ALANLARI, GELIR_ALANLARI, esleme_oner, basliklari_oku, ice_aktar,
+)
 
 # --- 2. Kalıcılık Fonksiyonları ---
 
-def create_save_data():
-    """st.session_state'i JSON formatında hazırlar."""
-    harcama_df_dict = st.session_state.harcama_kalemleri_df.to_dict() 
+# Kalem listeleri her değiştiğinde (ekleme, silme, yükleme) listenin sürüm sayacı artırılır. Listelerden
+# türetilen tablolar oturumda sürümle birlikte saklanır; sürüm değişmedikçe yeniden kurulmaz.
+
+def surum_artir(*listeler):
+    """Değişen kalem listelerinin ('borclar' / 'gelirler') sürüm sayacını artırır."""
+    for ad in listeler:
+        st.session_state[f'{ad}_surumu'] += 1
+
+def surumlu(ad, listeler, uret, *ekler):
+    """listeler'in sürümü (ve ekler) değişmedikçe uret()'in oturumda saklanan sonucunu döndürür."""
+    anahtar = tuple(st.session_state[f'{liste}_surumu'] for liste in listeler) + ekler
+    kayit = st.session_state.get(f'turetilen_{ad}')
+    if kayit is None or kayit[0] != anahtar:
+        kayit = st.session_state[f'turetilen_{ad}'] = (anahtar, uret())
+    return kayit[1]
+
+def otomatik_kaydet():
+    """Otomatik kayıt açıksa profili gecikmeli kayda bırakır (sayfa sonunda ve profili değiştiren parçalarda çağrılır)."""
+    if PROFIL_DIZINI and st.session_state.aktif_profil:
+        profil_deposu(PROFIL_DIZINI).gecikmeli_kaydet(st.session_state.aktif_profil, profil_anlik_goruntusu())
+
+def profil_anlik_goruntusu():
+    """Oturum verisinin anlık görüntüsü (kayıtlar paylaşılır, kaplar kopyalanır); depo ve JSON yedeği bunu kullanır."""
+    harcama_df = st.session_state.harcama_kalemleri_df
+    return {
+        'borclar': list(st.session_state.borclar),
+        'gelirler': list(st.session_state.gelirler),
+        'harcama_kalemleri': {col: harcama_df[col].tolist() for col in harcama_df.columns},
+        'tr_params': dict(st.session_state.tr_params),
+        'manuel_oncelik_listesi': dict(st.session_state.manuel_oncelik_listesi),
+        'baslangic_tarihi': st.session_state.baslangic_tarihi,
+    }
+
+def create_save_data(profil):
+    """Profil anlık görüntüsünü JSON yedek formatında hazırlar (yalnızca indirme istendiğinde çağrılır)."""
+    harcama_df_dict = pd.DataFrame(profil['harcama_kalemleri']).to_dict() 
     
     data = {
-        'borclar': st.session_state.borclar,
-        'gelirler': st.session_state.gelirler,
+        'borclar': sozluklere(profil['borclar']),
+        'gelirler': sozluklere(profil['gelirler']),
         'harcama_kalemleri_df': harcama_df_dict,
-        'tr_params': st.session_state.tr_params,
-        'manuel_oncelik_listesi': st.session_state.manuel_oncelik_listesi,
-        'baslangic_tarihi': st.session_state.baslangic_tarihi.isoformat()
+        'tr_params': profil['tr_params'],
+        'manuel_oncelik_listesi': profil['manuel_oncelik_listesi'],
+        'baslangic_tarihi': profil['baslangic_tarihi'].isoformat()
     }
     return json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
 
+def profil_uygula(profil):
+    """Depodan okunan profili session state'e yükler."""
+    st.session_state.borclar = profil['borclar']
+    st.session_state.gelirler = profil['gelirler']
+    surum_artir('borclar', 'gelirler')
+    if profil['harcama_kalemleri']:
+        st.session_state.harcama_kalemleri_df = pd.DataFrame(profil['harcama_kalemleri'])
+    st.session_state.tr_params.update(profil['tr_params'])
+    st.session_state.manuel_oncelik_listesi = profil['manuel_oncelik_listesi']
+    if profil['baslangic_tarihi']:
+        st.session_state.baslangic_tarihi = profil['baslangic_tarihi']
+
 def load_data_from_upload(uploaded_file):
     """Yüklenen dosyadan veriyi okur ve session state'e yükler."""
     if uploaded_file is not None:
@@ -61,8 +99,9 @@ def load_data_from_upload(uploaded_file):
             json_bytes = uploaded_file.read()
             data = json.loads(json_bytes.decode('utf-8'))
             
-            st.session_state.borclar = data.get('borclar', [])
-            st.session_state.gelirler = data.get('gelirler', [])
+            st.session_state.borclar = list(borc_kayitlari(data.get('borclar', [])))
+            st.session_state.gelirler = list(gelir_kayitlari(data.get('gelirler', [])))
+            surum_artir('borclar', 'gelirler')
             
             df_dict = data.get('harcama_kalemleri_df', None)
             if df_dict:
@@ -86,118 +125,51 @@ def load_data_from_upload(uploaded_file):
 
 if 'borclar' not in st.session_state: st.session_state.borclar = []
 if 'gelirler' not in st.session_state: st.session_state.gelirler = []
+if 'borclar_surumu' not in st.session_state: st.session_state.borclar_surumu = 0
+if 'gelirler_surumu' not in st.session_state: st.session_state.gelirler_surumu = 0
 if 'harcama_kalemleri_df' not in st.session_state: st.session_state.harcama_kalemleri_df = pd.DataFrame({'Kalem Adı': ['Market', 'Ulaşım', 'Eğlence', 'Kişisel Bakım'], 'Aylık Bütçe (TL)': [15000, 3000, 2000, 1500]})
-if 'tr_params' not in st.session_state: st.session_state.tr_params = {'kk_taksit_max_ay': 12, 'kk_asgari_odeme_yuzdesi_default': 20.0, 'kk_aylik_akdi_faiz': 3.66, 'kk_aylik_gecikme_faiz': 3.96, 'kmh_aylik_faiz': 5.0, 'kredi_taksit_max_ay': 36}
+if 'tr_params' not in st.session_state: st.session_state.tr_params = dict(VARSAYILAN_TR_PARAMS)
 if 'manuel_oncelik_listesi' not in st.session_state: st.session_state.manuel_oncelik_listesi = {}
 if 'baslangic_tarihi' not in st.session_state: st.session_state.baslangic_tarihi = date.today()
 
+# Otomatik kayıt açık bir profil adresteki ?profil= parametresiyle açıldıysa yeni oturum onu yükler.
+if 'aktif_profil' not in st.session_state:
+    st.session_state.aktif_profil = None
+    adres_profili = st.query_params.get('profil')
+    try:
+        if PROFIL_DIZINI and adres_profili and profil_deposu(PROFIL_DIZINI).var_mi(adres_profili):
+            profil_uygula(profil_deposu(PROFIL_DIZINI).yukle(adres_profili))
+            st.session_state.aktif_profil = adres_profili
+    except (OSError, ValueError) as e:
+        st.warning(f"'{adres_profili}' profili yüklenemedi: {e}")
 
-# --- 3. Yardımcı Fonksiyonlar ---
-
-def hesapla_min_odeme(borc, faiz_carpani=1.0):
-    kural = borc.get('min_kural')
-    tutar = borc.get('tutar', 0)
-    
-    if kural in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER', 'SABIT_TAKSIT_ANAPARA']:
-        return borc.get('sabit_taksit', 0)
-    
-    elif kural == 'ASGARI_FAIZ': 
-        asgari_anapara_yuzdesi = borc.get('kk_asgari_yuzdesi', 0)
-        return tutar * asgari_anapara_yuzdesi
-    
-    elif kural in ['FAIZ_ART_ANAPARA', 'FAIZ']: 
-        zorunlu_anapara_yuzdesi = borc.get('zorunlu_anapara_yuzdesi', 0)
-        return tutar * zorunlu_anapara_yuzdesi
-    
-    return 0
 
+# --- 3. Yardımcı Fonksiyonlar ---
 
 def add_debt(isim, faizli_anapara, oncelik_str, borc_tipi, sabit_taksit, kalan_ay, faiz_aylik, kk_asgari_yuzdesi, zorunlu_anapara_yuzdesi, kk_limit=0.0, devam_etme_yuzdesi=0.0):
-    
-    borc_listesi = []
-    final_priority = 9999 
-
-    if oncelik_str:
-        try:
-            priority_val = int(oncelik_str.split('.')[0].split(' ')[-1])
-            final_priority = priority_val + 1000 
-        except:
-            if "1. En Yüksek Öncelik" in oncelik_str:
-                final_priority = 1001
-            else:
-                final_priority = 9999
-    
-    # Borç objesini oluştur
-    yeni_borc = {
-        "isim": isim,
-        "tutar": faizli_anapara,
-        "oncelik": final_priority,
-        "faiz_aylik": faiz_aylik,
-        "kalan_ay": kalan_ay if kalan_ay > 0 else 99999,
-        "sabit_taksit": sabit_taksit,
-        "kk_asgari_yuzdesi": kk_asgari_yuzdesi,
-        "zorunlu_anapara_yuzdesi": zorunlu_anapara_yuzdesi,
-        "limit": kk_limit,
-        "devam_etme_yuzdesi": devam_etme_yuzdesi
-    }
-
-    if borc_tipi == "Kredi Kartı Dönem Borcu (Faizli)":
-        if faizli_anapara > 0:
-            yeni_borc["isim"] = f"{isim} (Dönem Borcu)"
-            yeni_borc["min_kural"] = "ASGARI_FAIZ"
-            yeni_borc["faiz_aylik"] = st.session_state.tr_params['kk_aylik_akdi_faiz'] / 100.0
-            yeni_borc["kk_asgari_yuzdesi"] = st.session_state.tr_params['kk_asgari_odeme_yuzdesi_default'] / 100.0
-            borc_listesi.append(yeni_borc)
-
-    elif borc_tipi == "Ek Hesap (KMH)":
-        yeni_borc["min_kural"] = "FAIZ_ART_ANAPARA"
-        borc_listesi.append(yeni_borc)
-
-    elif borc_tipi == "Kredi (Sabit Taksit/Anapara)":
-        yeni_borc["min_kural"] = "SABIT_TAKSIT_ANAPARA"
-        borc_listesi.append(yeni_borc)
-
-    elif borc_tipi == "Diğer Faizli Borç":
-        yeni_borc["min_kural"] = "FAIZ"
-        borc_listesi.append(yeni_borc)
-        
-    elif borc_tipi in ["Zorunlu Sabit Gider (Kira, Aidat vb.)", "Ev Kredisi Taksiti", "Sabit Taksit Gideri (KK Taksiti, Aidat vb.)", "Aylık Harcama Sepeti (Kütüphaneden)"]:
-        yeni_borc["min_kural"] = "SABIT_GIDER"
-        yeni_borc["oncelik"] = 1
-        yeni_borc["tutar"] = 0 
-        yeni_borc["faiz_aylik"] = 0
-        
-        # Kalan ay ayarları
-        if borc_tipi == "Aylık Harcama Sepeti (Kütüphaneden)":
-            yeni_borc["kalan_ay"] = 99999
-        elif borc_tipi == "Ev Kredisi Taksiti" or borc_tipi == "Sabit Taksit Gideri (KK Taksiti, Aidat vb.)":
-             yeni_borc["kalan_ay"] = kalan_ay if kalan_ay > 0 else 99999
-        else: # Kira, Aidat vb.
-            yeni_borc["kalan_ay"] = kalan_ay if kalan_ay < 99999 and kalan_ay > 0 else 99999
-             
-        yeni_borc["sabit_taksit"] = sabit_taksit
-        borc_listesi.append(yeni_borc)
+    borc_listesi = borc_olustur(isim, faizli_anapara, oncelik_str, borc_tipi, sabit_taksit, kalan_ay, faiz_aylik, kk_asgari_yuzdesi, zorunlu_anapara_yuzdesi, kk_limit, devam_etme_yuzdesi, tr_params=st.session_state.tr_params)
 
     if borc_listesi:
         st.session_state.borclar.extend(borc_listesi)
+        surum_artir('borclar')
         st.success(f"'{isim}' yükümlülüğü başarıyla eklendi.")
     else:
         st.warning(f"'{isim}' için eklenecek bir borç veya gider oluşturulamadı. (Tutar 0 olabilir)")
 
 
-def add_income(isim, tutar, baslangic_ay, artis_yuzdesi, tek_seferlik):
-    st.session_state.gelirler.append({
-        "isim": isim,
-        "tutar": tutar,
-        "baslangic_ay": baslangic_ay,
-        "artis_yuzdesi": artis_yuzdesi / 100.0,
-        "tek_seferlik": tek_seferlik
-    })
+def add_income(isim, tutar, baslangic_ay, artis_yuzdesi, tek_seferlik, bitis_ay=0, kademe_ay=0, kademe_yuzdesi=0.0):
+    st.session_state.gelirler.append(gelir_olustur(isim, tutar, baslangic_ay, artis_yuzdesi, tek_seferlik, bitis_ay, kademe_ay, kademe_yuzdesi))
+    surum_artir('gelirler')
     st.success(f"'{isim}' gelir kaynağı başarıyla eklendi.")
 
 
 # --- 4. Form Render Fonksiyonları ---
 
+# Formlar, kalem tabloları ve yönetici kuralları parçalar (fragment) hâlinde çizilir: parçadaki bir
+# etkileşim yalnızca o parçayı yeniden çalıştırır. Kalem listesini değiştiren işlemler st.rerun() ile
+# sayfanın tamamını yeniler.
+
+@st.fragment
 def render_income_form(context):
     st.subheader(f"Gelir Kaynağı Ekle ({context})")
     
@@ -211,19 +183,35 @@ def render_income_form(context):
         with col_i2:
             income_start_month = st.number_input("Başlangıç Ayı (1=Şimdi)", min_value=1, value=1, key=f'inc_start_month_{context}')
             income_growth_perc = st.number_input("Yıllık Artış Yüzdesi (%)", min_value=0.0, value=10.0, step=0.5, key=f'inc_growth_perc_{context}')
+            income_end_month = st.number_input("Bitiş Ayı (0=Süresiz)", min_value=0, value=0, key=f'inc_end_month_{context}', help="Gelir bu aydan sonra kesilir (ör. sözleşme sonu, emeklilik).")
             
         with col_i3:
             income_is_one_time = st.checkbox("Tek Seferlik Gelir Mi? (Bonus, İkramiye vb.)", key=f'inc_one_time_{context}')
-            st.markdown(" ")
-            st.markdown(" ")
+            income_step_month = st.number_input("Kademe Ayı (0=Yok)", min_value=0, value=0, key=f'inc_step_month_{context}', help="Gelirin bu aydan itibaren bir kez değiştiği ay (ör. terfi zammı).")
+            income_step_perc = st.number_input("Kademe Değişimi (%)", min_value=-100.0, value=0.0, step=5.0, key=f'inc_step_perc_{context}', help="Kademe ayından itibaren gelire uygulanan değişim; negatif değer düşüşü gösterir.")
             
             submit_button = st.form_submit_button(label="Gelir Kaynağını Ekle")
             
         if submit_button:
-            add_income(income_name, income_amount, income_start_month, income_growth_perc, income_is_one_time)
+            add_income(income_name, income_amount, income_start_month, income_growth_perc, income_is_one_time, income_end_month, income_step_month, income_step_perc)
             st.rerun()
 
 
+def ek_odeme_secenekleri():
+    """Yeni faizli borç için ek ödeme sırası seçenekleri (mevcut borçlar ilk kayıtlarının önceliğine göre sıralı)."""
+    ilk_oncelik = {}
+    for b in st.session_state.borclar:
+        ilk_oncelik.setdefault(b.isim, b.oncelik)
+    ek_odemeye_acik_borclar_info = [b.isim for b in st.session_state.borclar if b.kural not in GIDER_KURALLARI]
+    ek_odemeye_acik_borclar_info.sort(key=lambda name: ilk_oncelik.get(name, 9999))
+
+    secenekler = ["1. En Yüksek Öncelik (Her Şeyden Önce)"]
+    for i, isim in enumerate(ek_odemeye_acik_borclar_info):
+        secenekler.append(f"Öncelik {i+2}. {isim}'den sonra")
+    secenekler.append(f"Öncelik {len(ek_odemeye_acik_borclar_info) + 2}. En Sona Bırak")
+    return secenekler
+
+@st.fragment
 def render_debt_form(context):
     st.subheader(f"Borçları ve Giderleri Yönet ({context})")
     
@@ -268,17 +256,11 @@ def render_debt_form(context):
         # SÜTUN 1: Öncelik (Sadece Borçlar İçin)
         with col_f1:
             if is_faizli_borc_ve_ek_odemeli:
-                ek_odemeye_acik_borclar_info = [b['isim'] for b in st.session_state.borclar if b.get('min_kural') not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER']]
-                ek_odemeye_acik_borclar_info.sort(key=lambda name: next((b['oncelik'] for b in st.session_state.borclar if b['isim'] == name), 9999))
-                
-                secenekler = ["1. En Yüksek Öncelik (Her Şeyden Önce)"]
-                for i, isim in enumerate(ek_odemeye_acik_borclar_info):
-                    secenekler.append(f"Öncelik {i+2}. {isim}'den sonra")
-                secenekler.append(f"Öncelik {len(ek_odemeye_acik_borclar_info) + 2}. En Sona Bırak") 
+                secenekler = surumlu('ek_odeme_secenekleri', ['borclar'], ek_odeme_secenekleri)
                 
                 varsayilan_index = len(secenekler)-1
 
-                if ek_odemeye_acik_borclar_info:
+                if len(secenekler) > 2:
                     debt_priority_str = st.selectbox("Ek Ödeme Sırası", options=secenekler, index=varsayilan_index,
                                                      help="Bu kalemin, mevcut borçlara göre ek ödeme sırası neresi olmalı?", key=f'priority_select_{context}')
                 else:
@@ -423,28 +405,141 @@ def render_debt_form(context):
             st.rerun()
 
 
+@st.fragment
+def render_bulk_import(context):
+    """CSV / XLSX dosyasından borç/gider veya gelir kalemlerini tek seferde ekler (sütun eşlemeli)."""
+    with st.expander(f"📥 Toplu İçe Aktar (CSV / XLSX) ({context})"):
+        st.markdown("Her satır bir kalemdir. Tip sütununda **KK, KMH, Kredi, Diğer, Kira/Sabit Gider, Ev Kredisi, Taksit** (veya formdaki tam adlar) kullanılabilir. Yüzdeler % olarak yazılır; ';' ile ayrılmış dosyalarda ondalık ayırıcı virgüldür.")
+        dosya = st.file_uploader("Kalem Dosyası", type=['csv', 'xlsx'], key=f'aktarim_dosyasi_{context}')
+        aktarim_turu = st.radio("Kalem Türü", options=list(AKTARIM_TURLERI), horizontal=True, key=f'aktarim_turu_{context}')
+        if dosya is not None:
+            tur = AKTARIM_TURLERI[aktarim_turu]
+            try:
+                basliklar = basliklari_oku(dosya, dosya.name)
+            except ValueError as e:
+                st.error(f"Dosya okunamadı: {e}")
+                basliklar = None
+            if basliklar is not None:
+                onerilen = esleme_oner(basliklar, tur)
+                with st.form(f'aktarim_formu_{context}'):
+                    st.caption("Sütun Eşlemesi (boş bırakılan alanlar formdaki varsayılanı alır)")
+                    alan_tanimlari = BORC_ALANLARI if tur == 'borc' else GELIR_ALANLARI
+                    esleme = {}
+                    esleme_sutunlari = st.columns(4)
+                    for i, (alan, (etiket, _)) in enumerate(alan_tanimlari.items()):
+                        with esleme_sutunlari[i % 4]:
+                            secim = st.selectbox(etiket, options=basliklar, index=basliklar.index(onerilen[alan]) if alan in onerilen else None, placeholder="(Yok)", key=f'aktarim_esleme_{context}_{tur}_{alan}')
+                        if secim is not None:
+                            esleme[alan] = secim
+                    aktar = st.form_submit_button("Kalemleri İçe Aktar")
+                if aktar:
+                    try:
+                        kayitlar, rapor = ice_aktar(dosya, dosya.name, tur, esleme, tr_params=st.session_state.tr_params)
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        # Tüm kalemler tek seferde eklenir; sayfa bir kez yeniden çalışır.
+                        (st.session_state.borclar if tur == 'borc' else st.session_state.gelirler).extend(kayitlar)
+                        surum_artir('borclar' if tur == 'borc' else 'gelirler')
+                        st.session_state[f'aktarim_sonucu_{context}'] = (len(kayitlar), rapor)
+                        st.rerun()
+
+        sonuc = st.session_state.get(f'aktarim_sonucu_{context}')
+        if sonuc is not None:
+            eklenen, rapor = sonuc
+            st.success(f"{eklenen} kalem eklendi.")
+            if len(rapor):
+                st.warning(f"{len(rapor)} satır hatalı olduğu için eklenmedi.")
+                st.dataframe(rapor, hide_index=True, height=min(400, 38 + 35 * len(rapor)))
+                st.download_button("Hata Raporunu İndir (CSV)", data=rapor.to_csv(index=False).encode('utf-8-sig'), file_name="aktarim_hata_raporu.csv", mime="text/csv", key=f'aktarim_rapor_indir_{context}')
+
+
 # --- 5. Görüntüleme ve Yönetim Fonksiyonları ---
 
+# Tablolardaki sayılar ham kalır; TL ve yüzde biçimi tarayıcıda column_config ile uygulanır (hücre başına Python yok).
+TL_FORMATI = st.column_config.NumberColumn(format="%,d TL")
+YUZDE_FORMATI = st.column_config.NumberColumn(format="%.2f%%")
+TAMAMLANDI_STILI = "background-color: rgba(33, 195, 84, 0.25); color: #1b7f3b;"
+DETAY_SAYFA_BOYUTU = 60  # Ay (satır); stil yalnızca görünen sayfaya uygulanır
+
+def sure_metni(ay_sayilari):
+    """Ay sayısı serisini vektörel olarak 'X Yıl Y Ay' metnine çevirir."""
+    ay_sayilari = pd.Series(ay_sayilari).round().astype(int)
+    return (ay_sayilari // 12).astype(str) + " Yıl " + (ay_sayilari % 12).astype(str) + " Ay"
+
+def sonuc_tutamagi(sonuc, borclar, gelirler, manuel_oncelikler, sim_params):
+    """Sonucu süreç genelindeki sonuç deposuna yazar ve oturumun tutacağı tutamağı (depo anahtarını) döndürür."""
+    # Profilli çalıştırmalar önbelleği atlar ve 'profil' tablosunu taşır; ayrı anahtarla saklanırlar.
+    ekler = ['profilli'] if sim_params.get('profilleme') else []
+    tutamak = onbellek_anahtari('simule_borc_planı', borclar, gelirler, manuel_oncelikler, sim_params, *ekler)
+    simulasyon_onbellegi().kaydet(tutamak, sonuc)
+    return tutamak
+
+def excel_verisi(tutamak, detay_ayri_sayfalar):
+    """Excel çalışma kitabını depodaki sonuçtan üretir; aynı plan için tüm oturumlar aynı tamponu paylaşır."""
+    onbellek = simulasyon_onbellegi()
+    sonuc = onbellek.getir(tutamak)
+    if sonuc is None:
+        return b""
+    return onbellek.getir_veya_hesapla(f"excel:{tutamak}:{int(detay_ayri_sayfalar)}", lambda: excel_raporu_olustur(sonuc, detay_ayri_sayfalar))
+
+@st.fragment
+def render_plan_detay_tablosu(tutamak):
+    """Aylık plan tablosunu sayfa sayfa gösterir; sayfa değişimi yalnızca bu parçayı yeniden çalıştırır."""
+    sonuc = simulasyon_onbellegi().getir(tutamak)
+    if sonuc is None:
+        st.warning("Bu planın sonuçları sunucu önbelleğinden çıkarıldı. Tabloyu görmek için planı yeniden hesaplayın.")
+        return
+
+    # Streamlit'te gösterilecek sadeleştirilmiş sütunlar:
+    kalan_sutunlar = [col for col in sonuc['df'].columns if '(Kalan)' in col]
+    df = sonuc['df'][['Ay', 'Toplam Gelir', 'Ek Ödeme Gücü', 'Toplam Birikim'] + kalan_sutunlar]
+    tamamlandi = sonuc['tamamlandi']
+
+    sayfa_sayisi = max(1, -(-len(df) // DETAY_SAYFA_BOYUTU))
+    sayfa = st.number_input(f"Sayfa (1-{sayfa_sayisi}, sayfa başına {DETAY_SAYFA_BOYUTU} ay)", min_value=1, max_value=sayfa_sayisi, value=1, key='plan_detay_sayfa') if sayfa_sayisi > 1 else 1
+    dilim = slice((sayfa - 1) * DETAY_SAYFA_BOYUTU, sayfa * DETAY_SAYFA_BOYUTU)
+    df_sayfa = df.iloc[dilim]
+    maske = tamamlandi[[col for col in df.columns if col in tamamlandi.columns]].iloc[dilim]
+
+    # Tamamlanan kalemler değer yerine tamamlanma maskesinden gelen hücre stiliyle gösterilir.
+    stil = df_sayfa.style.apply(lambda _: pd.DataFrame(np.where(maske.to_numpy(), TAMAMLANDI_STILI, ''), index=maske.index, columns=maske.columns), axis=None, subset=list(maske.columns))
+    st.dataframe(stil, hide_index=True, column_config={col: TL_FORMATI for col in df.columns if col != 'Ay'})
+    st.caption("🟢 Yeşil hücreler: kalemin tamamlandığı (kapandığı) aylar.")
+
+def borc_tablosu():
+    """Gider kalemleri tablosu; iki sekme, borç listesi değişene kadar aynı tabloyu kullanır."""
+    display_df = pd.DataFrame(sozluklere(st.session_state.borclar))
+    
+    cols_to_show = ['isim', 'min_kural', 'tutar', 'sabit_taksit', 'faiz_aylik', 'oncelik', 'kalan_ay']
+    display_df_filtered = display_df[[col for col in cols_to_show if col in display_df.columns]].copy()
+    
+    display_df_filtered.columns = ["Gider Kalemi Adı", "Kural", "Kalan Anapara", "Aylık Taksit/Gider", "Aylık Faiz (%)", "Öncelik", "Kalan Ay"]
+    
+    display_df_filtered['Aylık Faiz (%)'] = display_df_filtered['Aylık Faiz (%)'].fillna(0.0) * 100
+    return display_df_filtered
+
+def gelir_tablosu():
+    """Gelir kaynakları tablosu; iki sekme, gelir listesi değişene kadar aynı tabloyu kullanır."""
+    gelir_df = pd.DataFrame(sozluklere(st.session_state.gelirler))
+    gelir_df = gelir_df.reindex(columns=['isim', 'tutar', 'baslangic_ay', 'artis_yuzdesi', 'tek_seferlik', 'bitis_ay'])
+    gelir_df['kademeler'] = [", ".join(f"{ay}. ay: %{(carpan - 1) * 100:+.1f}" for ay, carpan in g.kademeler) for g in st.session_state.gelirler]
+    gelir_df.columns = ["Gelir Adı", "Aylık Tutar", "Başlangıç Ayı", "Artış Yüzdesi", "Tek Seferlik Mi?", "Bitiş Ayı", "Kademeler"]
+    gelir_df['Artış Yüzdesi'] = gelir_df['Artış Yüzdesi'] * 100
+    return gelir_df
+
+@st.fragment
 def display_and_manage_debts(context_key): 
     if st.session_state.borclar:
         st.subheader("📊 Mevcut Finansal Yükümlülükler")
         
-        display_df = pd.DataFrame(st.session_state.borclar)
-        
-        cols_to_show = ['isim', 'min_kural', 'tutar', 'sabit_taksit', 'faiz_aylik', 'oncelik', 'kalan_ay']
-        display_df_filtered = display_df[[col for col in cols_to_show if col in display_df.columns]]
-        
-        display_df_filtered.columns = ["Gider Kalemi Adı", "Kural", "Kalan Anapara", "Aylık Taksit/Gider", "Aylık Faiz (%)", "Öncelik", "Kalan Ay"]
-        
-        display_df_filtered['Kalan Anapara'] = display_df_filtered['Kalan Anapara'].apply(format_tl)
-        display_df_filtered['Aylık Taksit/Gider'] = display_df_filtered['Aylık Taksit/Gider'].apply(format_tl)
-        display_df_filtered['Aylık Faiz (%)'] = (display_df_filtered['Aylık Faiz (%)'].fillna(0.0) * 100).apply(lambda x: f"{x:.2f}%")
+        display_df_filtered = surumlu('borc_tablosu', ['borclar'], borc_tablosu)
         
-        st.dataframe(display_df_filtered, column_config={"index": "Index No (Silmek için Seçin)"}, hide_index=False, key=f"current_debts_editor_{context_key}") 
+        st.dataframe(display_df_filtered, column_config={"index": "Index No (Silmek için Seçin)", "Kalan Anapara": TL_FORMATI, "Aylık Taksit/Gider": TL_FORMATI, "Aylık Faiz (%)": YUZDE_FORMATI}, hide_index=False, key=f"current_debts_editor_{context_key}") 
 
         st.info("Kaldırmak istediğiniz gider kalemlerinin solundaki **index numarasını** seçerek 'Sil' butonuna basın.")
         
-        debt_indices_to_delete = st.multiselect("Silinecek Gider Kaleminin Index Numarası", options=display_df.index.tolist(), key=f'debt_delete_select_{context_key}')
+        debt_indices_to_delete = st.multiselect("Silinecek Gider Kaleminin Index Numarası", options=display_df_filtered.index.tolist(), key=f'debt_delete_select_{context_key}')
         
         if st.button(f"Seçili Gider Kalemini Sil {context_key}", type="secondary", key=f'delete_button_{context_key}'): 
             if not debt_indices_to_delete:
@@ -452,21 +547,19 @@ def display_and_manage_debts(context_key):
                 return
             
             st.session_state.borclar = [borc for i, borc in enumerate(st.session_state.borclar) if i not in debt_indices_to_delete]
+            surum_artir('borclar')
             st.success(f"{len(debt_indices_to_delete)} adet gider kalemi listeden kaldırıldı.")
             st.rerun()
             
     else:
         st.info("Henüz eklenmiş bir borç veya gider kalemi bulunmamaktadır.")
 
+@st.fragment
 def display_and_manage_incomes(context_key): 
     if st.session_state.gelirler:
         st.subheader("💰 Mevcut Gelir Kaynakları")
-        gelir_df = pd.DataFrame(st.session_state.gelirler)
-        gelir_df = gelir_df[['isim', 'tutar', 'baslangic_ay', 'artis_yuzdesi', 'tek_seferlik']]
-        gelir_df.columns = ["Gelir Adı", "Aylık Tutar", "Başlangıç Ayı", "Artış Yüzdesi", "Tek Seferlik Mi?"]
-        gelir_df['Aylık Tutar'] = gelir_df['Aylık Tutar'].apply(format_tl)
-        gelir_df['Artış Yüzdesi'] = (gelir_df['Artış Yüzdesi'] * 100).apply(lambda x: f"{x:.2f}%")
-        st.dataframe(gelir_df, hide_index=False, key=f"current_incomes_editor_{context_key}") 
+        gelir_df = surumlu('gelir_tablosu', ['gelirler'], gelir_tablosu)
+        st.dataframe(gelir_df, column_config={"Aylık Tutar": TL_FORMATI, "Artış Yüzdesi": YUZDE_FORMATI, "Bitiş Ayı": st.column_config.NumberColumn(format="%d", help="Boş: süresiz")}, hide_index=False, key=f"current_incomes_editor_{context_key}") 
 
         st.info("Kaldırmak istediğiniz gelirlerin solundaki **index numarasını** seçerek 'Sil' butonuna basın.")
         
@@ -478,319 +571,101 @@ def display_and_manage_incomes(context_key):
                 return
             
             st.session_state.gelirler = [gelir for i, gelir in enumerate(st.session_state.gelirler) if i not in income_indices_to_delete]
+            surum_artir('gelirler')
             st.success(f"{len(income_indices_to_delete)} adet gelir listeden kaldırıldı.")
             st.rerun()
     else:
         st.info("Henüz eklenmiş bir gelir kaynağı bulunmamaktadır.")
 
 
-# --- 6. Borç Ödeme Planı Hesaplama Fonksiyonu ---
-def simule_borc_planı(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params):
-    
-    if not borclar_initial or not gelirler_initial:
-        return None
-
-    # Sim_params'tan zorunlu parametreleri çek
-    total_birikim_hedefi = sim_params.get('total_birikim_hedefi', 0.0)
-    birikim_tipi_str = sim_params.get('birikim_tipi_str', 'Aylık Sabit Tutar')
-    baslangic_tarihi = sim_params.get('baslangic_tarihi', date.today()) 
-
-    mevcut_borclar = copy.deepcopy(borclar_initial)
-    mevcut_gelirler = copy.deepcopy(gelirler_initial)
-    
-    if sim_params.get('oncelik_stratejisi') == 'Kullanici':
-        for borc in mevcut_borclar:
-            if borc.get('min_kural') not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER'] and borc['isim'] in manuel_oncelikler:
-                borc['oncelik'] = manuel_oncelikler[borc['isim']]
-    
-    ay_sayisi = 0
-    mevcut_birikim = sim_params.get('baslangic_birikim', 0.0)
-    birikime_ayrilan = sim_params.get('aylik_zorunlu_birikim', 0.0)
-    faiz_carpani = sim_params.get('faiz_carpani', 1.0)
-    agresiflik_carpan = sim_params.get('agresiflik_carpan', 1.0)
-    birikim_artis_aylik = sim_params.get('birikim_artis_aylik', 0.0) / 12 / 100
-    
-    toplam_faiz_maliyeti = 0.0
-    baslangic_faizli_borc = sum(b['tutar'] for b in borclar_initial if b.get('min_kural') not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER'])
-    
-    aylik_detaylar = [] 
-    
-    limit_asimi = False
-    
-    while True:
-        ay_sayisi += 1
-        
-        # Gerçek Tarihi Hesapla
-        rapor_tarihi = baslangic_tarihi + relativedelta(months=ay_sayisi - 1)
-        ay_adi = rapor_tarihi.strftime("%b %Y") # Örn: Oct 2025
-        
-        # --- Bitiş Kontrolleri ---
-        borc_tamamlandi = not any(b['tutar'] > 1 for b in mevcut_borclar if b.get('min_kural') not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER'])
-        
-        if birikim_tipi_str == "Borç Bitimine Kadar Toplam Tutar":
-            birikim_hedefi_tamamlandi = mevcut_birikim >= total_birikim_hedefi
-        else:
-            birikim_hedefi_tamamlandi = True
-
-        if ay_sayisi > 1 and borc_tamamlandi and birikim_hedefi_tamamlandi:
-            break
-        
-        if ay_sayisi > 360:
-            limit_asimi = True
-            break
-        
-        # --- Gelir Hesaplama ---
-        toplam_gelir = 0.0
-        for gelir in mevcut_gelirler:
-            if ay_sayisi >= gelir['baslangic_ay']:
-                if gelir['tek_seferlik']:
-                    if ay_sayisi == gelir['baslangic_ay']:
-                        toplam_gelir += gelir['tutar']
-                else:
-                    artis_carpan = (1 + gelir['artis_yuzdesi']) ** ((ay_sayisi - gelir['baslangic_ay']) / 12)
-                    toplam_gelir += gelir['tutar'] * artis_carpan
-
-        # --- Giderlerin Kapanması ve Yeniden Atanması ---
-        
-        zorunlu_gider_toplam = birikime_ayrilan
-        min_borc_odeme_toplam = 0.0
-        
-        aktif_borclar_sonraki_ay = []
-        serbest_kalan_nakit_bu_ay = 0.0
-        kapanan_giderler_listesi = []
-        aylik_kapanan_borclar = [] 
+YONETICI_SIFRESI_ORTAM_DEGISKENI = 'BORC_PLANI_YONETICI_SIFRESI'
 
-        faizli_borc_durumlari = {} 
+def onbellek_yoneticisi_mi():
+    """Ortam değişkeninde yönetici şifresi tanımlıysa girilen şifreyi doğrular; tanımlı değilse (yerel kullanım) True."""
+    sifre = os.environ.get(YONETICI_SIFRESI_ORTAM_DEGISKENI)
+    if not sifre:
+        return True
+    girilen = st.text_input("Yönetici Şifresi (önbellek ayarları için)", type="password", key='onbellek_yonetici_sifresi')
+    return hmac.compare_digest(girilen.encode('utf-8'), sifre.encode('utf-8'))
 
-        for borc in mevcut_borclar:
-            min_odeme_miktar = hesapla_min_odeme(borc, faiz_carpani)
-            is_sureli_gider = borc['min_kural'] in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER', 'SABIT_TAKSIT_ANAPARA'] and borc.get('kalan_ay', 99999) < 99999
-            
-            if borc['min_kural'] in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER']:
-                zorunlu_gider_toplam += min_odeme_miktar
-                
-            else: # Faizli Borçlar (KK, KMH, Kredi, Diğer)
-                min_borc_odeme_toplam += min_odeme_miktar
-                
-                etkilenen_faiz_orani = borc['faiz_aylik'] * faiz_carpani
-                eklenen_faiz = borc['tutar'] * etkilenen_faiz_orani
-                
-                # KRİTİK FİNANSAL MANTIK: KMH/Diğer'de faiz borcun üzerine eklenir (KK'da eklenmez).
-                if borc['min_kural'] in ['FAIZ_ART_ANAPARA', 'FAIZ']:
-                    borc['tutar'] += eklenen_faiz 
-                
-                toplam_faiz_maliyeti += eklenen_faiz 
-                
-                # Min Ödeme Çıkarma
-                borc['tutar'] -= min_odeme_miktar
-                
-                faizli_borc_durumlari[borc['isim']] = {
-                    'faiz': round(eklenen_faiz),
-                    # Anapara Min Ödeme: Ödenen Min Tutar - Faiz (KK/Kredi için)
-                    'anapara_min_odeme': round(min_odeme_miktar - eklenen_faiz if (min_odeme_miktar - eklenen_faiz) > 0 else 0)
-                }
-
-
-            # Giderlerin Kapanması ve Yeniden Atanması
-            if is_sureli_gider:
-                if borc['kalan_ay'] == 1:
-                    odenen_miktar = borc.get('sabit_taksit', 0)
-                    devam_yuzdesi = borc.get('devam_etme_yuzdesi', 0.0)
-                    serbest_kalan_nakit_bu_ay += odenen_miktar * (1 - devam_yuzdesi)
-                    devam_eden_miktar = odenen_miktar * devam_yuzdesi
-                    
-                    if devam_eden_miktar > 0:
-                        yeni_gider = {"isim": f"Serbest Kalan Harcama ({borc['isim']})", "tutar": 0, "min_kural": "SABIT_GIDER", "oncelik": 1, "sabit_taksit": devam_eden_miktar, "kalan_ay": 99999, "faiz_aylik": 0, "kk_asgari_yuzdesi": 0, "limit": 0, "zorunlu_anapara_yuzdesi": 0, "devam_etme_yuzdesi": 1.0}
-                        aktif_borclar_sonraki_ay.append(yeni_gider)
-                        
-                    kapanan_giderler_listesi.append(borc['isim'])
-                else:
-                    borc['kalan_ay'] -= 1
-                    aktif_borclar_sonraki_ay.append(borc)
-            else:
-                aktif_borclar_sonraki_ay.append(borc)
-                
-        mevcut_borclar = aktif_borclar_sonraki_ay
-        
-        # --- Saldırı Gücü Hesaplama ---
-        if ay_sayisi == 1:
-            ilk_ay_toplam_gelir = toplam_gelir
-            # NOT: Toplam giderler kaldırıldığı için ilk_ay_toplam_gider'i zorunlu ödemelerden hesaplıyoruz
-            ilk_ay_toplam_gider = zorunlu_gider_toplam + min_borc_odeme_toplam
-
-        kalan_nakit = toplam_gelir - zorunlu_gider_toplam - min_borc_odeme_toplam
-        saldırı_gucu = max(0, kalan_nakit * agresiflik_carpan)
-        saldırı_gucu += serbest_kalan_nakit_bu_ay 
-
-        # --- Ek Ödeme / Borç Saldırısı ---
-        saldırı_kalan = saldırı_gucu
-        
-        # Önceliklendirme
-        if sim_params['oncelik_stratejisi'] == 'Avalanche':
-            mevcut_borclar.sort(key=lambda x: (x.get('faiz_aylik', 0), x.get('tutar', 0)), reverse=True)
-        elif sim_params['oncelik_stratejisi'] == 'Snowball':
-            mevcut_borclar.sort(key=lambda x: x.get('tutar', float('inf')) if x.get('tutar', 0) > 1 else float('inf'))
-        else:
-            mevcut_borclar.sort(key=lambda x: x.get('oncelik', float('inf')))
-
-        ek_odeme_dagilimi = {}
-
-        for borc in mevcut_borclar:
-            if borc.get('min_kural') not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER']:
-                if borc['tutar'] > 1 and saldırı_kalan > 0:
-                    odecek_tutar = min(saldırı_kalan, borc['tutar'])
-                    borc['tutar'] -= odecek_tutar
-                    saldırı_kalan -= odecek_tutar
-                    ek_odeme_dagilimi[borc['isim']] = round(odecek_tutar)
-                    
-                    if borc['tutar'] <= 1:
-                        aylik_kapanan_borclar.append(borc['isim'])
-                        borc['tutar'] = 0
 
-        
-        # --- Birikim Güncelleme ---
-        mevcut_birikim += saldırı_kalan 
-        mevcut_birikim *= (1 + birikim_artis_aylik)
+def onbellekleri_temizle():
+    """Süreç genelindeki önbellekleri temizler ve onayı kaldırır (düğme geri çağrısı: sayfa yeniden çalışmadan önce)."""
+    simulasyon_onbellegi().temizle()
+    kontrol_noktasi_onbellegi().temizle()
+    gelir_takvimi_onbellegi().temizle()
+    st.session_state.onbellek_temizle_onay = False
 
-        
-        # --- DETAYLI RAPORLAMA OLUŞTURMA (Her Kalem Ayrı Sütun) ---
-        
-        # Streamlit ve Excel raporunda sadece Kalan Tutar, Toplamlar ve Ana Akış sütunları gösterilecek
-        aylik_veri = {
-            'Ay': ay_adi,
-            'Toplam Gelir': round(toplam_gelir),
-            # TOPLAM GİDER SÜTUNU KALDIRILDI
-            'Ek Ödeme Gücü': round(saldırı_gucu),
-            'Toplam Birikim': round(mevcut_birikim)
-        }
-
-        # Detaylı Borç/Gider Kalemlerini Ekle
-        for b in borclar_initial: 
-            isim = b['isim']
-            
-            guncel_borc = next((item for item in mevcut_borclar if item['isim'] == isim), None)
-            
-            if guncel_borc:
-                kalan_tutar = round(guncel_borc['tutar'])
-                kalan_ay = guncel_borc.get('kalan_ay', 99999)
-            else:
-                 kalan_tutar = 0
-                 kalan_ay = 0
-            
-            # Ana sütun: Kalan Tutar (Streamlit'te gösterilecek ana veri)
-            if kalan_tutar <= 1 and b['min_kural'] not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER']:
-                aylik_veri[f'{isim} (Kalan)'] = "TAMAMLANDI"
-            elif b['min_kural'] in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER'] and kalan_ay <= 0:
-                 aylik_veri[f'{isim} (Kalan)'] = "TAMAMLANDI"
-            else:
-                 aylik_veri[f'{isim} (Kalan)'] = kalan_tutar
-            
-            # --- EXCEL İÇİN GEREKLİ DETAYLAR --- (Streamlit'te gizli)
-            if b['min_kural'] not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER'] and guncel_borc:
-                durum = faizli_borc_durumlari.get(isim, {})
-                aylik_veri[f'{isim} (Ek Ödeme)'] = ek_odeme_dagilimi.get(isim, 0)
-                aylik_veri[f'{isim} (Faiz)'] = durum.get('faiz', 0)
-                aylik_veri[f'{isim} (Anapara Min)'] = durum.get('anapara_min_odeme', 0)
-                
-            elif b['min_kural'] in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER'] and guncel_borc:
-                 aylik_veri[f'{isim} (Taksit/Gider)'] = round(guncel_borc['sabit_taksit']) if guncel_borc['kalan_ay'] > 0 else 0
-
-
-        aylik_detaylar.append(aylik_veri)
-    
-    df_detay = pd.DataFrame(aylik_detaylar).fillna(0)
-    
-    return {"df": df_detay, "ay_sayisi": ay_sayisi, "toplam_faiz": round(toplam_faiz_maliyeti), "toplam_birikim": round(mevcut_birikim), "baslangic_faizli_borc": round(baslangic_faizli_borc), "ilk_ay_gelir": ilk_ay_toplam_gelir if 'ilk_ay_toplam_gelir' in locals() else 0, "ilk_ay_gider": ilk_ay_toplam_gider if 'ilk_ay_toplam_gider' in locals() else 0, "limit_asimi": limit_asimi}
-
-# --- YENİ RAPORLAMA VE TAVSİYE FONKSİYONLARI ---
 
-def run_alternative_scenario(borclar, gelirler, current_params, new_strategy_name, new_agresiflik_name):
-    """Farklı bir stratejiyle ödeme planını çalıştırır."""
-    
-    agresiflik_carpan = STRATEJILER[new_agresiflik_name]
-    oncelik_stratejisi = ONCELIK_STRATEJILERI.get(new_strategy_name, current_params['oncelik_stratejisi'])
-    
-    sim_params = copy.deepcopy(current_params)
-    sim_params.update({
-        'agresiflik_carpan': agresiflik_carpan,
-        'oncelik_stratejisi': oncelik_stratejisi
-    })
-    
-    sonuc = simule_borc_planı(borclar, gelirler, {}, **sim_params)
-    
-    return {
-        'isim': f"{new_strategy_name} ({new_agresiflik_name})",
-        'ay_sayisi': sonuc['ay_sayisi'],
-        'toplam_faiz': sonuc['toplam_faiz'],
-        'toplam_birikim': sonuc['toplam_birikim']
-    }
-
-def generate_report_and_recommendations(sonuc, current_params):
-    
-    # 1. Alternatif Senaryoların Çalıştırılması
-    alternatifler = []
-    
-    current_strat_list = [k for k, v in ONCELIK_STRATEJILERI.items() if v == current_params['oncelik_stratejisi']]
-    current_strat = current_strat_list[0] if current_strat_list else "Kullanıcı Tanımlı Sıra"
-    is_avalanche = current_strat.startswith("Borç Çığı")
+@st.fragment
+def render_yonetici_kurallari():
+    """Yasal limitler, harcama kütüphanesi ve önbellek ayarları; buradaki değişiklikler yalnızca bu parçayı yeniden çalıştırır."""
+    st.subheader("🇹🇷 BDDK ve Yasal Limitler (Türkiye)")
+    st.warning("Kredi Kartı Dönem Borcu hesaplamaları bu değerleri kullanır.")
     
-    current_agresiflik_val = current_params['agresiflik_carpan']
-    current_agresiflik_name_list = [k for k, v in STRATEJILER.items() if v == current_agresiflik_val]
-    current_agresiflik_name = current_agresiflik_name_list[0] if current_agresiflik_name_list else "Maksimum Çaba (Tüm Ek Ödeme)"
-
-    # a) Öncelik Tersine Çevirme (Avalanche vs Snowball)
-    if current_strat == "Kullanıcı Tanımlı Sıra":
-        alt_strat_name = "Borç Çığı (Avalanche - Önce Faiz)" 
-    elif is_avalanche:
-        alt_strat_name = "Borç Kartopu (Snowball - Önce Tutar)"
-    else:
-        alt_strat_name = "Borç Çığı (Avalanche - Önce Faiz)"
-        
-    try:
-        if current_strat != alt_strat_name: 
-            alternatifler.append(run_alternative_scenario(st.session_state.borclar, st.session_state.gelirler, current_params, alt_strat_name, current_agresiflik_name))
-    except: pass
-        
-    # b) Agresiflik Değiştirme (Maksimum Çaba vs. Temkinli/Aşırı Çaba)
-    alt_agresiflik_name = ""
+    col_l1, col_l2, col_l3 = st.columns(3)
     
-    if current_agresiflik_val == STRATEJILER["Maksimum Çaba (Tüm Ek Ödeme)"]:
-        alt_agresiflik_name = "Temkinli (Yüzde 50)"
-    elif current_agresiflik_val <= STRATEJILER["Temkinli (Yüzde 50)"]:
-        alt_agresiflik_name = "Maksimum Çaba (Tüm Ek Ödeme)"
+    with col_l1:
+        st.session_state.tr_params['kk_taksit_max_ay'] = st.number_input("KK Mal/Hizmet Max Taksit Ayı", min_value=1, value=st.session_state.tr_params['kk_taksit_max_ay'], step=1, key='bddk_kk_taksit_max')
+        st.session_state.tr_params['kk_aylik_akdi_faiz'] = st.number_input("KK Aylık Akdi Faiz (%) (Dönem Borcu)", min_value=0.0, value=st.session_state.tr_params['kk_aylik_akdi_faiz'], step=0.01, key='bddk_kk_faiz')
         
-    if alt_agresiflik_name and alt_agresiflik_name != current_agresiflik_name:
-        try:
-            alternatifler.append(run_alternative_scenario(st.session_state.borclar, st.session_state.gelirler, current_params, current_strat, alt_agresiflik_name))
-        except: pass
-    
-    # 2. Tavsiye Oluşturma
-    tavsiyeler = []
-    
-    if sonuc['limit_asimi']:
-        tavsiyeler.append("🚨 **ACİL DURUM:** Ödeme planı süresi 30 yılı aştı! Mevcut gelir ve gider yapınızla borçlarınızı kapatmanız mümkün görünmüyor. **Gelir artışı veya sabit giderlerde ciddi kesintiler** yapmayı düşünün.")
-    elif sonuc['ay_sayisi'] <= 12:
-        tavsiyeler.append("✅ **TEBRİKLER!** Borçlarınızı bir yıldan kısa sürede kapatıyorsunuz. Finansal olarak çok iyi bir yoldasınız.")
-    
-    
-    # Senaryo Karşılaştırma Tavsiyeleri
-    for alt in alternatifler:
-        faiz_farki = sonuc['toplam_faiz'] - alt['toplam_faiz']
-        süre_farki = sonuc['ay_sayisi'] - alt['ay_sayisi']
+    with col_l2:
+        st.session_state.tr_params['kk_asgari_odeme_yuzdesi_default'] = st.number_input("KK Asgari Ödeme Yüzdesi (%) (Dönem Borcu)", min_value=0.0, max_value=100.0, value=st.session_state.tr_params['kk_asgari_odeme_yuzdesi_default'], step=1.0, key='bddk_kk_asgari_yuzde')
+        st.session_state.tr_params['kk_aylik_gecikme_faiz'] = st.number_input("KK Aylık Gecikme Faiz (%)", min_value=0.0, value=st.session_state.tr_params['kk_aylik_gecikme_faiz'], step=0.01, key='bddk_kk_gecikme')
         
-        if faiz_farki > 0 and süre_farki >= 0:
-            tavsiyeler.append(f"💰 **DAHA UCUZ/HIZLI FIRSAT:** '{alt['isim'].split('(')[0].strip()}' stratejisini uygularsanız, borç sürenizi **{süre_farki} ay** kısaltabilir ve **{format_tl(faiz_farki)}** ek faiz tasarrufu sağlayabilirsiniz.")
-        elif süre_farki > 0 and faiz_farki > -(sonuc['toplam_faiz'] * 0.05):
-             tavsiyeler.append(f"⏱️ **MOTİVASYON KAZANCI:** '{alt['isim'].split('(')[0].strip()}' stratejisi ile borçlarınızı **{süre_farki} ay** daha erken kapatabilirsiniz. Bu, motivasyonunuzu artırabilir!")
-
-    # 3. Excel İndirme İçin DataFrame Hazırlığı
-    excel_data = io.BytesIO()
-    with pd.ExcelWriter(excel_data, engine='xlsxwriter') as writer:
-        sonuc['df'].to_excel(writer, index=False, sheet_name='Aylık Finansal Akış')
+    with col_l3:
+        st.session_state.tr_params['kredi_taksit_max_ay'] = st.number_input("İhtiyaç Kredisi Max Taksit Ayı", min_value=1, value=st.session_state.tr_params['kredi_taksit_max_ay'], step=1, key='bddk_kredi_max')
+        st.session_state.tr_params['kmh_aylik_faiz'] = st.number_input("KMH/Kredi Piyasa Faizi (%) (Max)", min_value=0.0, value=st.session_state.tr_params['kmh_aylik_faiz'], step=0.1, key='bddk_kmh_faiz')
         
-    excel_data.seek(0)
+    st.markdown("---")
+    st.subheader("💳 Aylık Harcama Kalemleri Kütüphanesi")
     
-    return {"alternatifler": alternatifler, "tavsiyeler": tavsiyeler, "excel_data": excel_data}
+    edited_df = st.data_editor(st.session_state.harcama_kalemleri_df, column_config={"Kalem Adı": st.column_config.TextColumn("Kalem Adı", required=True), "Aylık Bütçe (TL)": st.column_config.NumberColumn("Aylık Bütçe (TL)", min_value=0, step=100, format="%.0f TL")}, num_rows="dynamic", hide_index=True, key='harcama_editor')
+    st.session_state.harcama_kalemleri_df = edited_df
+
+    toplam_butce = st.session_state.harcama_kalemleri_df['Aylık Bütçe (TL)'].sum()
+    st.markdown(f"**Tanımlanan Toplam Aylık Bütçe:** **{int(toplam_butce):,} TL**")
+    otomatik_kaydet()  # Limit ve harcama değişiklikleri sayfanın geri kalanı çalışmadan da kaydedilir
+    st.markdown("---")
+
+    st.subheader("🗄️ Simülasyon Önbelleği")
+    st.info("Aynı borç, gelir ve parametrelerle yapılan hesaplamalar (tüm oturumlarda) önbellekten anında döner. Sonuçlar ve Excel tamponları sunucuda tek kopya tutulur; oturumlar yalnızca tutamak saklar. Bellek bütçesi aşılınca en eski kayıtlar sıkıştırılıp diske taşınır.")
+    onbellek = simulasyon_onbellegi()
+    col_b1, col_b2 = st.columns(2)
+    yeni_max_kayit = col_b1.number_input("Önbellek Boyutu (Saklanacak Sonuç Sayısı)", min_value=1, value=onbellek.max_kayit, step=16, key='onbellek_boyutu_rule')
+    yeni_max_mb = col_b2.number_input("Bellek Bütçesi (MB)", min_value=16, value=int(onbellek.max_bayt // 1024 ** 2), step=64, key='onbellek_butce_rule')
+    # Sınırlar ve temizleme süreç genelindedir (tüm oturumlar): yalnızca açık düğme basışıyla ve
+    # YONETICI_SIFRESI_ORTAM_DEGISKENI tanımlıysa doğru şifreyle uygulanır.
+    yonetici = onbellek_yoneticisi_mi()
+    if st.button("Sınırları Uygula", key='onbellek_sinir_uygula', disabled=not yonetici):
+        onbellek.boyut_ayarla(yeni_max_kayit, yeni_max_mb * 1024 ** 2)
+        st.success("Önbellek sınırları tüm oturumlar için güncellendi.")
+    onbellek_ist = onbellek.istatistikler()
+    col_o1, col_o2, col_o3, col_o4 = st.columns(4)
+    col_o1.metric("Kayıt", f"{onbellek_ist['kayit']} / {onbellek_ist['max_kayit']}")
+    col_o2.metric("İsabet", onbellek_ist['isabet'], help=f"İsabet oranı: %{onbellek_ist['isabet_orani'] * 100:.1f}")
+    col_o3.metric("Iskalama", onbellek_ist['iskalama'])
+    col_o4.metric("Tahliye (LRU)", onbellek_ist['tahliye'])
+    col_o5, col_o6, col_o7, col_o8 = st.columns(4)
+    col_o5.metric("Bellekte", f"{onbellek_ist['bayt'] / 1024 ** 2:,.1f} / {onbellek_ist['max_bayt'] / 1024 ** 2:,.0f} MB")
+    col_o6.metric("Diskte", f"{onbellek_ist['disk_kayit']} kayıt", help=f"{onbellek_ist['disk_bayt'] / 1024 ** 2:,.1f} MB (sıkıştırılmış)")
+    col_o7.metric("Diske Taşınan", onbellek_ist['tasma'])
+    col_o8.metric("Disk İsabeti", onbellek_ist['disk_isabet'])
+    tum_onbellekler = [{'Önbellek': ad, **o.istatistikler()} for ad, o in [("Sonuçlar", onbellek), ("Kontrol Noktaları", kontrol_noktasi_onbellegi()), ("Gelir Takvimleri", gelir_takvimi_onbellegi())]]
+    kontrol_ist = tum_onbellekler[1]
+    st.caption(f"Tüm önbellekler bellekte: {sum(o['bayt'] for o in tum_onbellekler) / 1024 ** 2:,.1f} / {sum(o['max_bayt'] or 0 for o in tum_onbellekler) / 1024 ** 2:,.0f} MB, "
+               f"toplam tahliye: {sum(o['tahliye'] for o in tum_onbellekler)} (kontrol noktaları: {kontrol_ist['bayt'] / 1024 ** 2:,.1f} / {kontrol_ist['max_bayt'] / 1024 ** 2:,.0f} MB, {kontrol_ist['tahliye']} tahliye)")
+    with st.expander("Tüm Önbellekler"):
+        st.dataframe(pd.DataFrame(tum_onbellekler),
+                     hide_index=True, column_config={"isabet_orani": st.column_config.NumberColumn(format="percent"), "bayt": st.column_config.NumberColumn(format="bytes"), "max_bayt": st.column_config.NumberColumn(format="bytes"), "disk_bayt": st.column_config.NumberColumn(format="bytes")})
+    temizle_onay = st.checkbox("Tüm oturumların paylaştığı önbelleği temizlemeyi onaylıyorum", value=False, key='onbellek_temizle_onay', disabled=not yonetici)
+    st.button("Önbelleği Temizle", type="secondary", key='onbellek_temizle', disabled=not (yonetici and temizle_onay), on_click=onbellekleri_temizle)
+
+def manuel_siralama_tablosu(odemeye_acik_borclar):
+    """Manuel sıralama düzenleyicisinin tablosu: mevcut ve (manuel listeden) yeni öncelik, yeni önceliğe göre sıralı."""
+    manuel = st.session_state.manuel_oncelik_listesi
+    siralama_df = pd.DataFrame([{'isim': b.isim, 'mevcut_oncelik': b.oncelik - 1000 if b.oncelik > 999 else b.oncelik, 'yeni_oncelik': manuel.get(b.isim, b.oncelik) - 1000 if manuel.get(b.isim, b.oncelik) > 999 else manuel.get(b.isim, b.oncelik)} for b in odemeye_acik_borclar])
+    return siralama_df.sort_values(by='yeni_oncelik', ascending=True)
 
 
 # --- 7. Ana Uygulama Düzeni ---
@@ -799,10 +674,12 @@ st.title("Borç Kapatma ve Finansal Ödeme Planı")
 # --- KRİTİK ALAN: YÜKLEME VE KAYDETME ---
 st.header("🗂️ Profil Yönetimi (Yerel Kayıt)")
 st.info("""
-    Bu uygulama, verilerinizi hiçbir sunucuda saklamaz. Verilerinizin kalıcı olması için:
+    Otomatik kayıt açılmadıkça bu uygulama verilerinizi sunucuda saklamaz. Verilerinizin kalıcı olması için:
     1. Uygulamadan çıkmadan önce **Mevcut Verileri İndir (Yedekleme)** butonuna basın.
     2. Geri dönmek istediğinizde indirdiğiniz JSON dosyasını **Yedekleme Dosyasını Yükle** alanına sürükleyip bırakın.
-""")
+""" + ("""
+    Ya da aşağıdan bir profil adıyla **Otomatik Kaydet**'i açın: her değişiklik birkaç saniye içinde sunucuya kaydedilir ve sayfa adresi (?profil=...) profili yeniden açar.
+""" if PROFIL_DIZINI else ""))
 col_load, col_save = st.columns(2)
 
 # YÜKLEME ALANI
@@ -814,14 +691,54 @@ with col_load:
 # KAYDETME/İNDİRME ALANI
 with col_save:
     st.markdown(" ")
-    data_to_save = create_save_data()
+    # JSON yedeği yalnızca butona basıldığında, bu çalıştırmadaki anlık görüntüden üretilir.
+    profil_goruntusu = profil_anlik_goruntusu()
     st.download_button(
         label="💾 Mevcut Verileri İndir (Yedekleme)",
-        data=data_to_save,
+        data=lambda: create_save_data(profil_goruntusu),
         file_name=f"finans_plan_yedekleme_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.json",
         mime="application/json",
         help="Mevcut tüm gelir/gider/kural verilerini JSON dosyası olarak PC'nize indirir."
     )
+
+# SUNUCU TARAFI PROFİL DEPOSU
+# Yalnızca PROFIL_DIZINI_ORTAM_DEGISKENI tanımlıysa gösterilir (bkz. 0.1).
+if PROFIL_DIZINI:
+    with st.expander("💽 Sunucuda Profil Sakla (Otomatik Kayıt)", expanded=bool(st.session_state.aktif_profil)):
+        depo = profil_deposu(PROFIL_DIZINI)
+        col_p1, col_p2 = st.columns(2)
+        with col_p1:
+            secilen_profil = st.selectbox("Kayıtlı Profiller", options=depo.listele(), index=None, placeholder="Profil seçin", key='profil_secimi')
+            if st.button("Profili Yükle", disabled=secilen_profil is None, key='profil_yukle'):
+                try:
+                    profil_uygula(depo.yukle(secilen_profil))
+                except (OSError, ValueError) as e:
+                    st.error(f"Profil yüklenemedi: {e}")
+                else:
+                    st.session_state.aktif_profil = secilen_profil
+                    st.query_params['profil'] = secilen_profil
+                    st.rerun()
+        with col_p2:
+            profil_adi = st.text_input("Profil Adı", value=st.session_state.aktif_profil or "", key='profil_adi', help="Harf, rakam, boşluk, '-', '_' ve '.' kullanılabilir.")
+            otomatik_kayit = st.toggle("Otomatik Kaydet", value=bool(st.session_state.aktif_profil), key='profil_otomatik', help="Açıkken her değişiklik, son değişiklikten birkaç saniye sonra tek seferde kaydedilir.")
+            if otomatik_kayit and profil_adi:
+                try:
+                    # Kayıtlı bir profile bağlanmak onun üzerine yazar: profil önce yüklenmeli ya da bağlama açıkça onaylanmalıdır.
+                    bagla = True
+                    if profil_adi != st.session_state.aktif_profil and depo.var_mi(profil_adi):
+                        st.warning(f"'{profil_adi}' adlı kayıtlı bir profil var; otomatik kayıt onun üzerine bu oturumun verilerini yazar. Önce yüklemek için soldan seçin ya da üzerine yazmayı onaylayın.")
+                        bagla = st.button("Üzerine Yazmayı Onayla", key='profil_uzerine_yaz')
+                    if bagla:
+                        st.session_state.aktif_profil = profil_adi
+                        st.query_params['profil'] = profil_adi
+                    if st.session_state.aktif_profil:
+                        st.caption(f"Otomatik kayıt açık: **{st.session_state.aktif_profil}**")
+                except ValueError as e:
+                    st.error(str(e))
+                    st.session_state.aktif_profil = None
+            elif st.session_state.aktif_profil:
+                st.session_state.aktif_profil = None
+                st.query_params.pop('profil', None)
 st.markdown("---")
 # --- SON KRİTİK ALAN ---
 
@@ -888,6 +805,7 @@ with tab_basic:
     render_income_form("basic")
     st.markdown("---")
     render_debt_form("basic")
+    render_bulk_import("basic")
 
     st.markdown("---")
     display_and_manage_incomes("basic")
@@ -902,6 +820,10 @@ with tab_basic:
 with tab_advanced:
     st.header("🚀 Gelişmiş Planlama ve Senaryo Yönetimi")
     
+    # Optimizasyonun önerdiği agresiflik, seçim kutusu oluşturulmadan önce uygulanır.
+    if 'bekleyen_agresiflik_adv' in st.session_state:
+        st.session_state['agresiflik_adv'] = st.session_state.pop('bekleyen_agresiflik_adv')
+
     col_st1, col_st2, col_st3 = st.columns(3)
     with col_st1:
         AGRESIFLIK_ADVANCED = st.selectbox("Ek Ödeme Agresifliği", options=list(STRATEJILER.keys()), index=2, key='agresiflik_adv')
@@ -912,6 +834,7 @@ with tab_advanced:
         with st.expander("❓ Faiz Çarpanı Ne İşe Yarar?"):
             st.markdown("Bu çarpan, girdiğiniz tüm faiz oranlarını test amaçlı artırmanıza veya azaltmanıza olanak tanır.")
         AYLIK_ARTIS_ADVANCED = st.number_input("Birikim Yıllık Artış Yüzdesi (%)", value=3.5, min_value=0.0, step=0.1, key='aylik_artis_adv')
+        MOTOR_ADVANCED = st.selectbox("Simülasyon Motoru", options=list(SIMULASYON_MOTORLARI.keys()), index=0, key='motor_adv', help="Hızlı motor aynı sonucu üretir; yüzlerce kalemli profillerde belirgin şekilde daha hızlıdır. Hızlı ve olay güdümlü motorlar, yalnızca gelirler değiştiğinde planı değişikliğin başladığı aya en yakın kontrol noktasından sürdürür.")
         
     with col_st3:
         BIRIKIM_TIPI_ADVANCED = st.radio("Birikim Hedefi Tipi", ["Aylık Sabit Tutar", "Borç Bitimine Kadar Toplam Tutar"], index=0, key='birikim_tipi_adv')
@@ -919,24 +842,112 @@ with tab_advanced:
         TOPLAM_BIRIKIM_HEDEFI_ADVANCED = st.number_input("Hedef Toplam Birikim Tutarı", value=50000, step=5000, min_value=0, key='zorunlu_birikim_toplam_adv', disabled=BIRIKIM_TIPI_ADVANCED != "Borç Bitimine Kadar Toplam Tutar")
         BASLANGIC_BIRIKIM_ADVANCED = st.number_input("Mevcut Başlangıç Birikimi", value=0, step=1000, min_value=0, key='baslangic_birikim_adv')
 
+    SIM_PARAMS_ADVANCED = {'agresiflik_carpan': STRATEJILER[AGRESIFLIK_ADVANCED], 'oncelik_stratejisi': ONCELIK_STRATEJILERI[ONCELIK_ADVANCED], 'faiz_carpani': FAIZ_CARPANI_ADVANCED, 'birikim_artis_aylik': AYLIK_ARTIS_ADVANCED, 'aylik_zorunlu_birikim': AYLIK_ZORUNLU_BIRIKIM_ADVANCED if BIRIKIM_TIPI_ADVANCED == "Aylık Sabit Tutar" else 0, 'baslangic_birikim': BASLANGIC_BIRIKIM_ADVANCED, 'motor': SIMULASYON_MOTORLARI[MOTOR_ADVANCED],
+                           'total_birikim_hedefi': TOPLAM_BIRIKIM_HEDEFI_ADVANCED, 'birikim_tipi_str': BIRIKIM_TIPI_ADVANCED, 'baslangic_tarihi': st.session_state.baslangic_tarihi}
+
+    with st.expander("🎲 Belirsizlik Analizi (Monte Carlo)"):
+        MC_AKTIF_ADVANCED = st.checkbox("Plan oluşturulurken belirsizlik analizi de yapılsın", value=False, key='mc_aktif_adv')
+        col_mc1, col_mc2, col_mc3 = st.columns(3)
+        with col_mc1:
+            MC_YOL_ADVANCED = st.number_input("Yol (Olası Gelecek) Sayısı", value=MONTE_CARLO_VARSAYILAN['yol_sayisi'], min_value=100, max_value=100000, step=1000, key='mc_yol_adv')
+            MC_TOHUM_ADVANCED = st.number_input("Rastgelelik Tohumu", value=MONTE_CARLO_VARSAYILAN['tohum'], step=1, key='mc_tohum_adv', help="Aynı tohum ve ayarlar her zaman aynı sonucu verir.")
+            MC_DAGILIM_ADVANCED = st.selectbox("Dağılım", options=list(MONTE_CARLO_DAGILIMLARI.keys()), index=0, key='mc_dagilim_adv')
+        with col_mc2:
+            MC_GELIR_SAPMA_ADVANCED = st.number_input("Gelir Artışı Sapması (Yıllık, Puan)", value=MONTE_CARLO_VARSAYILAN['gelir_artis_sapma'] * 100, min_value=0.0, step=0.5, key='mc_gelir_sapma_adv')
+            MC_FAIZ_SAPMA_ADVANCED = st.number_input("Faiz Çarpanı Sapması (%)", value=MONTE_CARLO_VARSAYILAN['faiz_carpani_sapma'] * 100, min_value=0.0, step=1.0, key='mc_faiz_sapma_adv')
+            MC_TEK_SEFERLIK_SAPMA_ADVANCED = st.number_input("Tek Seferlik Gelir Sapması (%)", value=MONTE_CARLO_VARSAYILAN['tek_seferlik_sapma'] * 100, min_value=0.0, step=5.0, key='mc_tek_seferlik_sapma_adv')
+        with col_mc3:
+            MC_SUREC_ADVANCED = st.number_input("Süreç Sayısı", value=1, min_value=1, max_value=os.cpu_count() or 1, step=1, key='mc_surec_adv', help="Yollar parçalar hâlinde bu kadar süreçte paralel simüle edilir; sonuç değişmez.")
+    MONTE_CARLO_ADVANCED = {
+        'yol_sayisi': int(MC_YOL_ADVANCED), 'tohum': int(MC_TOHUM_ADVANCED), 'dagilim': MONTE_CARLO_DAGILIMLARI[MC_DAGILIM_ADVANCED],
+        'gelir_artis_sapma': MC_GELIR_SAPMA_ADVANCED / 100, 'faiz_carpani_sapma': MC_FAIZ_SAPMA_ADVANCED / 100,
+        'tek_seferlik_sapma': MC_TEK_SEFERLIK_SAPMA_ADVANCED / 100, 'surec_sayisi': int(MC_SUREC_ADVANCED),
+    } if MC_AKTIF_ADVANCED else None
+
+    with st.expander("🌪️ Duyarlılık Analizi (Hangi Kalem Ne Kadar Etkili?)"):
+        DUYARLILIK_AKTIF_ADVANCED = st.checkbox("Plan oluşturulurken duyarlılık analizi de yapılsın", value=False, key='duyarlilik_aktif_adv')
+        DUYARLILIK_ADIMI_ADVANCED = st.number_input("Değişim Miktarı (%)", value=DUYARLILIK_ADIMI * 100, min_value=1.0, max_value=50.0, step=1.0, key='duyarlilik_adim_adv',
+                                                    help="Her borcun faizi, her sabit gider ve her gelir tutarı bu oranda azaltılıp artırılır; gelir artış oranları ±1 puan değiştirilir.")
+    DUYARLILIK_ADVANCED = DUYARLILIK_ADIMI_ADVANCED / 100 if DUYARLILIK_AKTIF_ADVANCED else None
+
+    with st.expander("🎯 Hedef Çözücü (Gereken Ek Gelir, Gider Kesintisi veya Birikim)"):
+        st.markdown("Bir hedef seçin; çözücü yukarıdaki plan ayarlarıyla hedefi tutturan **en küçük ek aylık geliri** ya da **sabit gider kesintisini**, veya hedefi bozmadan ayrılabilecek **en büyük aylık zorunlu birikimi** bulur.")
+        col_h1, col_h2, col_h3 = st.columns(3)
+        with col_h1:
+            HEDEF_TURU_ADVANCED = st.selectbox("Hedef", options=list(HEDEF_TURLERI.keys()), index=0, key='hedef_turu_adv')
+        with col_h2:
+            if HEDEF_TURLERI[HEDEF_TURU_ADVANCED] == 'ay':
+                HEDEF_DEGERI_ADVANCED = st.number_input("Hedef Süre (Ay)", min_value=2, max_value=360, value=36, step=1, key='hedef_ay_adv')
+            else:
+                HEDEF_DEGERI_ADVANCED = st.number_input("Hedef Tutar (TL)", min_value=0, value=100000, step=5000, key='hedef_tutar_adv')
+        with col_h3:
+            KALDIRAC_ADVANCED = st.selectbox("Çözülecek Değer", options=list(KALDIRACLAR.keys()), index=0, key='kaldirac_adv')
+        if st.button("Hedefi Çöz", key='hedef_coz_adv', disabled=not (st.session_state.borclar and st.session_state.gelirler)):
+            hedef_params = {**SIM_PARAMS_ADVANCED, 'profilleme': st.session_state.get('profilleme')}
+            st.session_state['hedef_sonucu'] = (HEDEF_TURU_ADVANCED, HEDEF_DEGERI_ADVANCED, KALDIRAC_ADVANCED,
+                                                hedef_ara(st.session_state.borclar, st.session_state.gelirler, st.session_state.manuel_oncelik_listesi, hedef_params,
+                                                          HEDEF_TURLERI[HEDEF_TURU_ADVANCED], HEDEF_DEGERI_ADVANCED, KALDIRACLAR[KALDIRAC_ADVANCED]))
+        if st.session_state.get('hedef_sonucu'):
+            hedef_adi, hedef_degeri, kaldirac_adi, cozum = st.session_state['hedef_sonucu']
+            kaldirac = KALDIRACLAR[kaldirac_adi]
+            hedef_metni = f"{hedef_adi}: **{hedef_degeri} ay**" if HEDEF_TURLERI[hedef_adi] == 'ay' else f"{hedef_adi}: **{format_tl(hedef_degeri)}**"
+            if cozum is None:
+                st.warning(f"{hedef_metni} — sabit gider kalemi olmadığı için kesinti çözülemiyor.")
+            elif not cozum['ulasilabilir']:
+                st.warning(f"{hedef_metni} — denenen aralıkta tutturulamıyor" + (" (birikim ayrılmasa bile)." if kaldirac == 'aylik_birikim' else "."))
+            elif cozum.get('sinirsiz'):
+                st.info(f"{hedef_metni} — hedef, ayrılan aylık birikim tutarından etkilenmiyor.")
+            elif cozum['deger'] == 0 and kaldirac != 'aylik_birikim':
+                st.success(f"{hedef_metni} — mevcut plan hedefi zaten tutturuyor.")
+            else:
+                cozum_metni = {'ek_gelir': f"En az **{format_tl(cozum['deger'])}** ek aylık gelir gerekiyor.",
+                               'gider_kesintisi': f"Sabit giderlerde en az **%{cozum['deger'] * 100:.1f}** kesinti gerekiyor.",
+                               'aylik_birikim': f"Hedefi bozmadan ayrılabilecek en fazla aylık birikim: **{format_tl(cozum['deger'])}**."}[kaldirac]
+                ozet = cozum['ozet']
+                st.success(f"{hedef_metni} — {cozum_metni} Bu değerle süre **{sure_metni([ozet['ay_sayisi']])[0]}**, toplam faiz **{format_tl(ozet['toplam_faiz'])}**, kapanış birikimi **{format_tl(ozet['toplam_birikim'])}**.")
+            if cozum:
+                st.caption(f"{cozum['gecis']} geçişte {cozum['degerlendirilen']} senaryo simüle edildi.")
+
+
 
     st.markdown("---")
     render_income_form("advanced")
     st.markdown("---")
     render_debt_form("advanced")
+    render_bulk_import("advanced")
     
     # Manuel Borç Sıralaması Editörü
     st.markdown("---")
     st.subheader("🛠️ Manuel Borç Kapatma Sırası (Gelişmiş)")
     if ONCELIK_ADVANCED == "Kullanıcı Tanımlı Sıra":
         if st.session_state.borclar:
-            odemeye_acik_borclar = [b for b in st.session_state.borclar if b.get('min_kural') not in ['SABIT_GIDER', 'SABIT_TAKSIT_GIDER']]
+            odemeye_acik_borclar = [b for b in st.session_state.borclar if b.kural not in GIDER_KURALLARI]
             if odemeye_acik_borclar:
-                siralama_df = pd.DataFrame([{'isim': b['isim'], 'mevcut_oncelik': b['oncelik'] - 1000 if b['oncelik'] > 999 else b['oncelik'], 'yeni_oncelik': st.session_state.manuel_oncelik_listesi.get(b['isim'], b['oncelik']) - 1000 if st.session_state.manuel_oncelik_listesi.get(b['isim'], b['oncelik']) > 999 else st.session_state.manuel_oncelik_listesi.get(b['isim'], b['oncelik'])} for b in odemeye_acik_borclar])
-                siralama_df = pd.DataFrame(siralama_df).sort_values(by='yeni_oncelik', ascending=True)
+                # Tablo borç listesi ya da manuel öncelikler değişince yeniden kurulur (düzenleyici her çalıştırmada aynı listeyi geri yazar).
+                siralama_df = surumlu('manuel_siralama', ['borclar'], lambda: manuel_siralama_tablosu(odemeye_acik_borclar), tuple(sorted(st.session_state.manuel_oncelik_listesi.items())))
                 st.info("Borç önceliklerini manuel olarak ayarlamak için **'Yeni Öncelik'** sütunundaki numaraları değiştirin.")
                 edited_siralama_df = st.data_editor(siralama_df, column_config={"yeni_oncelik": st.column_config.NumberColumn("Yeni Öncelik", min_value=1, step=1), "isim": st.column_config.TextColumn("Borç Adı", disabled=True), "mevcut_oncelik": st.column_config.TextColumn("Mevcut Sıra", disabled=True)}, hide_index=True, key='advanced_priority_editor')
                 st.session_state.manuel_oncelik_listesi = edited_siralama_df.set_index('isim')['yeni_oncelik'].apply(lambda x: x + 1000).to_dict()
+
+                with st.expander("🧠 En İyi Sırayı Bul (Optimizasyon)"):
+                    st.markdown("Mevcut kurallarla simüle ederek toplam faizi (ya da süreyi) en aza indiren kapatma sırasını arar ve yukarıdaki tabloya yazar.")
+                    col_opt1, col_opt2 = st.columns(2)
+                    with col_opt1:
+                        OPTIMIZASYON_HEDEFI_ADVANCED = st.selectbox("Optimizasyon Hedefi", options=list(OPTIMIZASYON_HEDEFLERI.keys()), index=0, key='opt_hedef_adv')
+                    with col_opt2:
+                        OPTIMIZASYON_AGRESIFLIK_ADVANCED = st.checkbox("Ek ödeme agresifliğini de optimize et", value=False, key='opt_agresiflik_adv')
+                    if st.button("Sırayı Optimize Et", key='opt_calistir_adv', disabled=not st.session_state.gelirler):
+                        optimizasyon = optimize_odeme_sirasi(st.session_state.borclar, st.session_state.gelirler, SIM_PARAMS_ADVANCED, OPTIMIZASYON_HEDEFLERI[OPTIMIZASYON_HEDEFI_ADVANCED], OPTIMIZASYON_AGRESIFLIK_ADVANCED, st.session_state.manuel_oncelik_listesi)
+                        if optimizasyon:
+                            st.session_state.manuel_oncelik_listesi = optimizasyon['manuel_oncelikler']
+                            if OPTIMIZASYON_AGRESIFLIK_ADVANCED:
+                                st.session_state['bekleyen_agresiflik_adv'] = next(k for k, v in STRATEJILER.items() if v == optimizasyon['agresiflik_carpan'])
+                            st.session_state['optimizasyon_sonucu'] = optimizasyon
+                            st.session_state.pop('advanced_priority_editor', None)  # Tablodaki eski düzenlemeler yeni sırayı ezmesin
+                            st.rerun()
+                    optimizasyon = st.session_state.get('optimizasyon_sonucu')
+                    if optimizasyon:
+                        st.success(f"{optimizasyon['tur']} turda {optimizasyon['degerlendirilen']} senaryo değerlendirildi. Toplam faiz: **{format_tl(optimizasyon['baslangic']['toplam_faiz'])}** → **{format_tl(optimizasyon['ozet']['toplam_faiz'])}**, süre: **{optimizasyon['baslangic']['ay_sayisi']} ay** → **{optimizasyon['ozet']['ay_sayisi']} ay**.")
             else:
                 st.info("Ek ödemeye açık borç (KK, KMH, Kredi) bulunmamaktadır.")
         else:
@@ -961,126 +972,257 @@ with tab_rules:
     st.session_state['default_agresiflik'] = st.selectbox("Varsayılan Ek Ödeme Agresifliği", options=list(STRATEJILER.keys()), index=2, key='default_agressiflik_rule')
     st.session_state['default_oncelik'] = st.selectbox("Varsayılan Borç Kapatma Yöntemi", options=list(ONCELIK_STRATEJILERI.keys()), index=0, key='default_oncelik_rule')
     st.session_state['default_aylik_artis'] = st.number_input("Varsayılan Birikim Yıllık Artışı (%)", value=3.5, min_value=0.0, step=0.1, key='default_aylik_artis_rule')
+    st.session_state['default_motor'] = st.selectbox("Varsayılan Simülasyon Motoru", options=list(SIMULASYON_MOTORLARI.keys()), index=0, key='default_motor_rule')
+    st.session_state['excel_ayri_sayfalar'] = st.checkbox("Excel'de borç detaylarını (Ek Ödeme / Faiz / Anapara Min) ayrı sayfalara böl", value=False, key='excel_ayri_sayfalar_rule')
     
     st.markdown("---")
-    st.subheader("🇹🇷 BDDK ve Yasal Limitler (Türkiye)")
-    st.warning("Kredi Kartı Dönem Borcu hesaplamaları bu değerleri kullanır.")
-    
-    col_l1, col_l2, col_l3 = st.columns(3)
-    
-    with col_l1:
-        st.session_state.tr_params['kk_taksit_max_ay'] = st.number_input("KK Mal/Hizmet Max Taksit Ayı", min_value=1, value=st.session_state.tr_params['kk_taksit_max_ay'], step=1, key='bddk_kk_taksit_max')
-        st.session_state.tr_params['kk_aylik_akdi_faiz'] = st.number_input("KK Aylık Akdi Faiz (%) (Dönem Borcu)", min_value=0.0, value=st.session_state.tr_params['kk_aylik_akdi_faiz'], step=0.01, key='bddk_kk_faiz')
-        
-    with col_l2:
-        st.session_state.tr_params['kk_asgari_odeme_yuzdesi_default'] = st.number_input("KK Asgari Ödeme Yüzdesi (%) (Dönem Borcu)", min_value=0.0, max_value=100.0, value=st.session_state.tr_params['kk_asgari_odeme_yuzdesi_default'], step=1.0, key='bddk_kk_asgari_yuzde')
-        st.session_state.tr_params['kk_aylik_gecikme_faiz'] = st.number_input("KK Aylık Gecikme Faiz (%)", min_value=0.0, value=st.session_state.tr_params['kk_aylik_gecikme_faiz'], step=0.01, key='bddk_kk_gecikme')
-        
-    with col_l3:
-        st.session_state.tr_params['kredi_taksit_max_ay'] = st.number_input("İhtiyaç Kredisi Max Taksit Ayı", min_value=1, value=st.session_state.tr_params['kredi_taksit_max_ay'], step=1, key='bddk_kredi_max')
-        st.session_state.tr_params['kmh_aylik_faiz'] = st.number_input("KMH/Kredi Piyasa Faizi (%) (Max)", min_value=0.0, value=st.session_state.tr_params['kmh_aylik_faiz'], step=0.1, key='bddk_kmh_faiz')
-        
+    render_yonetici_kurallari()
     st.markdown("---")
-    st.subheader("💳 Aylık Harcama Kalemleri Kütüphanesi")
-    
-    edited_df = st.data_editor(st.session_state.harcama_kalemleri_df, column_config={"Kalem Adı": st.column_config.TextColumn("Kalem Adı", required=True), "Aylık Bütçe (TL)": st.column_config.NumberColumn("Aylık Bütçe (TL)", min_value=0, step=100, format="%.0f TL")}, num_rows="dynamic", hide_index=True, key='harcama_editor')
-    st.session_state.harcama_kalemleri_df = edited_df
 
-    toplam_butce = st.session_state.harcama_kalemleri_df['Aylık Bütçe (TL)'].sum()
-    st.markdown(f"**Tanımlanan Toplam Aylık Bütçe:** **{int(toplam_butce):,} TL**")
+    st.subheader("⏱️ Performans Profilleme")
+    st.info("Açıkken plan ve rapor önbellek kullanılmadan hesaplanır; sonuç sayfasında aşama bazında süre, çağrı sayısı ve (seçilirse) bellek ayırma tablosu gösterilir. Bellek izleme (tracemalloc) hesaplamayı belirgin şekilde yavaşlatır.")
+    st.session_state['profilleme'] = PROFILLEME_KIPLERI[st.selectbox("Profilleme", options=list(PROFILLEME_KIPLERI.keys()), index=0, key='profilleme_rule')]
     st.markdown("---")
 
 
 # --- 8. Hesaplama Tetikleyicileri ---
 
-if calculate_button_advanced or calculate_button_basic:
-    
-    # --- 1. Parametreleri Hazırla ---
-    if calculate_button_advanced:
+HESAP_ASAMALARI = {'plan': "Ana ödeme planı", 'rapor': "Alternatif senaryolar ve strateji sıralaması", 'monte_carlo': "Belirsizlik analizi (Monte Carlo)", 'duyarlilik': "Duyarlılık analizi"}
+HESAP_YENILEME_ARALIGI = 0.5  # Sn; iş sürerken sonuç paneli bu aralıkla yenilenir
+
+def hesap_girdileri(sekme):
+    """Sekmenin güncel ayarlarından (manuel öncelikler, sim_params, Monte Carlo ayarları, duyarlılık adımı) döndürür."""
+    if sekme == 'advanced':
         total_birikim_hedefi = TOPLAM_BIRIKIM_HEDEFI_ADVANCED
         birikim_tipi_str = BIRIKIM_TIPI_ADVANCED
         manuel_oncelikler = st.session_state.manuel_oncelik_listesi
-        sim_params = {'agresiflik_carpan': STRATEJILER[AGRESIFLIK_ADVANCED], 'oncelik_stratejisi': ONCELIK_STRATEJILERI[ONCELIK_ADVANCED], 'faiz_carpani': FAIZ_CARPANI_ADVANCED, 'birikim_artis_aylik': AYLIK_ARTIS_ADVANCED, 'aylik_zorunlu_birikim': AYLIK_ZORUNLU_BIRIKIM_ADVANCED if BIRIKIM_TIPI_ADVANCED == "Aylık Sabit Tutar" else 0, 'baslangic_birikim': BASLANGIC_BIRIKIM_ADVANCED}
+        monte_carlo_ayarlari = MONTE_CARLO_ADVANCED
+        duyarlilik_adimi = DUYARLILIK_ADVANCED
+        sim_params = dict(SIM_PARAMS_ADVANCED)
     else: # Basit Planlama
         varsayilan_agresiflik_str = st.session_state.get('default_agresiflik', 'Maksimum Çaba (Tüm Ek Ödeme)')
         varsayilan_oncelik_str = st.session_state.get('default_oncelik', 'Borç Çığı (Avalanche - Önce Faiz)')
         total_birikim_hedefi = TOPLAM_BIRIKIM_HEDEFI_BASIC
         birikim_tipi_str = BIRIKIM_TIPI_BASIC
         manuel_oncelikler = {}
-        sim_params = {'agresiflik_carpan': STRATEJILER[varsayilan_agresiflik_str], 'oncelik_stratejisi': ONCELIK_STRATEJILERI[varsayilan_oncelik_str], 'faiz_carpani': 1.0, 'birikim_artis_aylik': st.session_state.get('default_aylik_artis', 3.5), 'aylik_zorunlu_birikim': AYLIK_ZORUNLU_BIRIKIM_BASIC if BIRIKIM_TIPI_BASIC == "Aylık Sabit Tutar" else 0, 'baslangic_birikim': BASLANGIC_BIRIKIM_BASIC}
-    
+        monte_carlo_ayarlari = None
+        duyarlilik_adimi = None
+        sim_params = {'agresiflik_carpan': STRATEJILER[varsayilan_agresiflik_str], 'oncelik_stratejisi': ONCELIK_STRATEJILERI[varsayilan_oncelik_str], 'faiz_carpani': 1.0, 'birikim_artis_aylik': st.session_state.get('default_aylik_artis', 3.5), 'aylik_zorunlu_birikim': AYLIK_ZORUNLU_BIRIKIM_BASIC if BIRIKIM_TIPI_BASIC == "Aylık Sabit Tutar" else 0, 'baslangic_birikim': BASLANGIC_BIRIKIM_BASIC, 'motor': SIMULASYON_MOTORLARI[st.session_state.get('default_motor', "Standart (Python Döngüsü)")]}
+
     sim_params['total_birikim_hedefi'] = total_birikim_hedefi
     sim_params['birikim_tipi_str'] = birikim_tipi_str
     sim_params['baslangic_tarihi'] = st.session_state.baslangic_tarihi
+    sim_params['profilleme'] = st.session_state.get('profilleme')
+    return manuel_oncelikler, sim_params, monte_carlo_ayarlari, duyarlilik_adimi
+
+def hesap_anahtari(girdiler):
+    """Hesap işinin girdilerinin özeti; oturumdaki kalemler ya da ayarlar değişince değişir."""
+    manuel_oncelikler, sim_params, monte_carlo_ayarlari, duyarlilik_adimi = girdiler
+    return onbellek_anahtari('hesap_isi', st.session_state.borclar, st.session_state.gelirler, manuel_oncelikler, sim_params,
+                             sim_params['motor'], sim_params['profilleme'], monte_carlo_ayarlari, duyarlilik_adimi)
+
+def hesap_isi_baslat(sekme):
+    """Planı ve raporları arka planda hesaplayacak işi başlatır; oturum yalnızca iş tutamağını saklar."""
+    girdiler = hesap_girdileri(sekme)
+    anahtar = hesap_anahtari(girdiler)
+    onceki = st.session_state.get('hesap_isi')
+    if onceki and onceki[2].anahtar == anahtar and onceki[2].durum in ('bekliyor', 'calisiyor', 'bitti'):
+        return  # Aynı girdilerle süren ya da biten iş yeniden başlatılmaz
+    if onceki:
+        onceki[2].iptal()
+
+    manuel_oncelikler, sim_params, monte_carlo_ayarlari, duyarlilik_adimi = girdiler
+    # İş parçacığı oturum durumuna dokunmaz: kalem listelerinin o anki kopyası verilir.
+    borclar, gelirler = list(st.session_state.borclar), list(st.session_state.gelirler)
+
+    def plan_asamasi(_):
+        # Aylık tablo sunucudaki sonuç deposunda kalır; iş yalnızca tutamağı ve özeti taşır.
+        sonuc = simule_borc_planı(borclar, gelirler, manuel_oncelikler, **sim_params)
+        ozet = {k: v for k, v in sonuc.items() if k not in ('df', 'tamamlandi')}
+        ozet['tutamak'] = sonuc_tutamagi(sonuc, borclar, gelirler, manuel_oncelikler, sim_params)
+        return ozet
+
+    asamalar = [('plan', plan_asamasi),
+                ('rapor', lambda sonuclar: generate_report_and_recommendations(borclar, gelirler, sonuclar['plan'], sim_params, manuel_oncelikler))]
+    if monte_carlo_ayarlari:
+        asamalar.append(('monte_carlo', lambda _: simule_monte_carlo(borclar, gelirler, manuel_oncelikler, sim_params, monte_carlo_ayarlari)))
+    if duyarlilik_adimi:
+        asamalar.append(('duyarlilik', lambda _: duyarlilik_analizi(borclar, gelirler, manuel_oncelikler, sim_params, duyarlilik_adimi)))
+    st.session_state['hesap_isi'] = (sekme, girdiler, is_baslat(anahtar, asamalar))
+
+def render_hesap_sonuclari(izleniyor=False):
+    """Hesap işinin biten aşamalarını gösterir; iş sürerken simüle edilen ayı ilerleme çubuğunda gösterir."""
+    _, (_, sim_params, _, duyarlilik_adimi), hesap_isi = st.session_state['hesap_isi']
+    if izleniyor and hesap_isi.bitti:
+        st.rerun()  # Son aşama bitti: panel bir kez daha, yenilenmeden çizilir
+    sonuclar = hesap_isi.sonuclar
+    sonuc = sonuclar.get('plan')
+    rapor_sonuclari = sonuclar.get('rapor')
 
+    st.markdown("---")
+    st.header("🏆 Borç Yönetimi Karşılaştırmalı Raporu")
+
+    if not hesap_isi.bitti:
+        col_ilerleme, col_iptal = st.columns([4, 1])
+        with col_ilerleme:
+            aktif_asama = hesap_isi.aktif_asama
+            sira = hesap_isi.asamalar.index(aktif_asama) + 1 if aktif_asama else 1
+            asama_adi = HESAP_ASAMALARI[aktif_asama or hesap_isi.asamalar[0]]
+            ay = hesap_isi.ay
+            metin = f"Adım {sira}/{len(hesap_isi.asamalar)} — {asama_adi}" + (f": {ay}. ay simüle ediliyor" if ay else "")
+            st.progress(min(ay, 360) / 360, text=metin)
+        with col_iptal:
+            if st.button("Hesaplamayı İptal Et", key='hesap_iptal'):
+                hesap_isi.iptal()
+                del st.session_state['hesap_isi']
+                st.rerun()
+    elif hesap_isi.durum == 'hata':
+        st.error(f"Hesaplama sırasında hata oluştu: {hesap_isi.hata}")
+    elif hesap_isi.durum == 'iptal':
+        st.warning("Hesaplama iptal edildi.")
+
+    if sonuc is None:
+        return
+
+    if sonuc.get('limit_asimi'): st.error("‼️ Ödeme planı süresi 30 yılı aştı. Borçlarınızı bu planla kapatmanız mümkün görünmüyor.")
+    else: st.success("✅ Ödeme planınız başarıyla oluşturuldu!")
+
+    # --- ÖZET VE TAVSİYELER ---
+    if rapor_sonuclari:
+        st.subheader("💡 Kişiselleştirilmiş Tavsiyeler ve Analiz")
+        for tavsiye in rapor_sonuclari['tavsiyeler']:
+            st.markdown(tavsiye)
 
-    # Ana Ödeme Planını Çalıştır
-    sonuc = simule_borc_planı(st.session_state.borclar, st.session_state.gelirler, manuel_oncelikler, **sim_params)
+    st.markdown("---")
 
-    if sonuc:
-        
-        # Raporları ve Tavsiyeleri Oluştur
-        rapor_sonuclari = generate_report_and_recommendations(sonuc, sim_params)
-        
-        with st.container():
-            st.markdown("---")
-            st.header("🏆 Borç Yönetimi Karşılaştırmalı Raporu")
-            
-            if sonuc.get('limit_asimi'): st.error("‼️ Ödeme planı süresi 30 yılı aştı. Borçlarınızı bu planla kapatmanız mümkün görünmüyor.")
-            else: st.success("✅ Ödeme planınız başarıyla oluşturuldu!")
-            
-            
-            # --- ÖZET VE TAVSİYELER ---
-            st.subheader("💡 Kişiselleştirilmiş Tavsiyeler ve Analiz")
-            for tavsiye in rapor_sonuclari['tavsiyeler']:
-                st.markdown(tavsiye)
-                
-            st.markdown("---")
-            
-            # --- SENARYO KARŞILAŞTIRMA TABLOSU ---
-            ozet_data = [{'Senaryo': 'Mevcut Plan (Seçiminiz)', 'Süre': sonuc['ay_sayisi'], 'Faiz Maliyeti': sonuc['toplam_faiz'], 'Kapanış Birikimi': sonuc['toplam_birikim']}]
-            for alt in rapor_sonuclari['alternatifler']:
-                 ozet_data.append({'Senaryo': alt['isim'], 'Süre': alt['ay_sayisi'], 'Faiz Maliyeti': alt['toplam_faiz'], 'Kapanış Birikimi': alt['toplam_birikim']})
-            
-            ozet_df = pd.DataFrame(ozet_data)
-            
-            # Veri formatlama
-            ozet_df['Süre'] = ozet_df['Süre'].apply(lambda x: f"{x // 12} Yıl {x % 12} Ay")
-            ozet_df['Faiz Maliyeti'] = ozet_df['Faiz Maliyeti'].apply(format_tl)
-            ozet_df['Kapanış Birikimi'] = ozet_df['Kapanış Birikimi'].apply(format_tl)
-            
-            st.subheader("📊 Senaryo Karşılaştırma Özeti")
-            st.dataframe(ozet_df, hide_index=True)
-            
-            # --- DETAYLI TABLO VE EXCEL İNDİRME ---
-            st.subheader("📋 Aylık Ödeme Planı Detayları (Kalem Bazlı Akış)")
-            
-            # Streamlit'te gösterilecek sadeleştirilmiş sütunlar:
-            kalan_sutunlar = [col for col in sonuc['df'].columns if '(Kalan)' in col]
-            gosterilecek_sutunlar = ['Ay', 'Toplam Gelir', 'Ek Ödeme Gücü', 'Toplam Birikim'] + kalan_sutunlar
-            
-            df_gosterim = sonuc['df'][gosterilecek_sutunlar].copy()
-            
-            # Görselleştirme: Sayı/Para Formatlama ve TAMAMLANDI ibaresi
-            for col in df_gosterim.columns:
-                 if 'Kalan)' in col:
-                     df_gosterim[col] = df_gosterim[col].apply(lambda x: "🟢 TAMAMLANDI" if x == "TAMAMLANDI" else (format_tl(x) if isinstance(x, (int, float)) else x))
-                 elif 'Toplam' in col or 'Ek Ödeme' in col:
-                      df_gosterim[col] = df_gosterim[col].apply(format_tl)
-            
-            
-            col_res1, col_res2 = st.columns([3, 1])
-            with col_res2:
-                 st.download_button(
-                    label="⬇️ Excel İndir (Tüm Detaylar)",
-                    data=rapor_sonuclari['excel_data'],
-                    file_name=f"Borc_Odeme_Plani_Detay_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
-            
-            with col_res1:
-                st.dataframe(df_gosterim, hide_index=True)
+    # --- SENARYO KARŞILAŞTIRMA TABLOSU ---
+    ozet_data = [{'Senaryo': 'Mevcut Plan (Seçiminiz)', 'Süre': sonuc['ay_sayisi'], 'Faiz Maliyeti': sonuc['toplam_faiz'], 'Kapanış Birikimi': sonuc['toplam_birikim']}]
+    for alt in (rapor_sonuclari or {}).get('alternatifler', []):
+         ozet_data.append({'Senaryo': alt['isim'], 'Süre': alt['ay_sayisi'], 'Faiz Maliyeti': alt['toplam_faiz'], 'Kapanış Birikimi': alt['toplam_birikim']})
+
+    ozet_df = pd.DataFrame(ozet_data)
+
+    # Veri formatlama
+    ozet_df['Süre'] = sure_metni(ozet_df['Süre'])
+
+    st.subheader("📊 Senaryo Karşılaştırma Özeti")
+    st.dataframe(ozet_df, hide_index=True, column_config={"Faiz Maliyeti": TL_FORMATI, "Kapanış Birikimi": TL_FORMATI})
+    if rapor_sonuclari is None and not hesap_isi.bitti:
+        st.caption("Alternatif senaryolar hesaplanıyor; bittiklerinde tabloya eklenecek.")
+
+    # --- BELİRSİZLİK ANALİZİ (MONTE CARLO) ---
+    mc_sonuc = sonuclar.get('monte_carlo')
+    if mc_sonuc:
+        st.subheader("🎲 Belirsizlik Analizi (Monte Carlo)")
+        st.info(f"Gelir artışı, faiz oranları ve tek seferlik gelirler rastgele değiştirilerek **{mc_sonuc['yol_sayisi']:,}** olası gelecek simüle edildi. P10 iyi, P50 olası, P90 kötü senaryo sınırıdır (birikimde tersi).")
+        yuzdelik = mc_sonuc['yuzdelikler']
+        # Satırlar yüzdelik, sütunlar ölçüttür: her sütun tek birimde olduğundan biçim column_config ile verilir.
+        mc_df = pd.DataFrame({
+            'Yüzdelik': list(yuzdelik['ay_sayisi']),
+            'Süre': sure_metni(list(yuzdelik['ay_sayisi'].values())),
+            'Faiz Maliyeti': list(yuzdelik['toplam_faiz'].values()),
+            'Kapanış Birikimi': list(yuzdelik['toplam_birikim'].values()),
+        })
+        st.dataframe(mc_df, hide_index=True, column_config={"Faiz Maliyeti": TL_FORMATI, "Kapanış Birikimi": TL_FORMATI})
+        if mc_sonuc['limit_asimi_orani'] > 0:
+            st.warning(f"Olası geleceklerin **%{mc_sonuc['limit_asimi_orani'] * 100:.1f}** kadarında ödeme planı 30 yılı aşıyor.")
+
+    # --- DUYARLILIK ANALİZİ (TORNADO TABLOSU) ---
+    duyarlilik = sonuclar.get('duyarlilik')
+    if duyarlilik:
+        st.subheader("🌪️ Duyarlılık Analizi")
+        st.info(f"Her kalem tek başına **±%{duyarlilik_adimi * 100:g}** (gelir artış oranları ±{duyarlilik['artis_adimi'] * 100:g} puan) değiştirildiğinde toplam faiz ve bitiş süresindeki değişim. "
+                f"Kalemler faiz etkisine göre sıralanmıştır; {duyarlilik['senaryo_sayisi']} senaryo tek geçişte simüle edildi.")
+        if duyarlilik['temel']['limit_asimi']:
+            st.warning("Mevcut plan 30 yılı aştığı için faiz farkları 30. yıl sonuna kadar birikmiş faizi karşılaştırır.")
+        duyarlilik_df = pd.DataFrame(duyarlilik['satirlar'])
+        if duyarlilik_df.empty:
+            st.warning("Duyarlılık analizi için değiştirilebilecek bir kalem bulunamadı.")
+        else:
+            yuzdeli = duyarlilik_df['parametre'].isin(['faiz_aylik', 'artis_yuzdesi'])
+            duyarlilik_df = pd.DataFrame({
+                'Sıra': duyarlilik_df['sira'],
+                'Kalem': duyarlilik_df['kalem'],
+                'Parametre': duyarlilik_df['parametre'].map(DUYARLILIK_PARAMETRELERI),
+                'Temel Değer': np.where(yuzdeli, "%" + (duyarlilik_df['temel_deger'] * 100).round(2).astype(str), duyarlilik_df['temel_deger'].map(format_tl)),
+                'Faiz Farkı (Düşük)': duyarlilik_df['faiz_dusuk'],
+                'Faiz Farkı (Yüksek)': duyarlilik_df['faiz_yuksek'],
+                'Süre Farkı (Düşük)': duyarlilik_df['ay_dusuk'],
+                'Süre Farkı (Yüksek)': duyarlilik_df['ay_yuksek'],
+                'Etki': duyarlilik_df['etki'],
+                'Not': np.where(duyarlilik_df['limit_asimi'], "30 yıl aşıldı", ""),
+            })
+            ay_farki = st.column_config.NumberColumn(format="%+d ay")
+            st.dataframe(duyarlilik_df, hide_index=True, column_config={
+                "Faiz Farkı (Düşük)": TL_FORMATI, "Faiz Farkı (Yüksek)": TL_FORMATI, "Süre Farkı (Düşük)": ay_farki, "Süre Farkı (Yüksek)": ay_farki,
+                "Etki": st.column_config.ProgressColumn(format="%,d TL", min_value=0, max_value=max(1, int(duyarlilik_df['Etki'].max())), help="Faiz maliyetindeki en büyük mutlak değişim"),
+            })
+
+    # --- TÜM STRATEJİ KOMBİNASYONLARI ---
+    if rapor_sonuclari:
+        st.subheader("🏅 Tüm Strateji Kombinasyonları (Sıralı)")
+        st.info("Her faiz oranı çarpanı için tüm öncelik ve agresiflik kombinasyonları faiz maliyetine göre sıralanmıştır. 30 yılı aşan planlar en sona konur.")
+        siralama_df = pd.DataFrame(rapor_sonuclari['strateji_siralamasi'])
+        siralama_df = pd.DataFrame({
+            'Sıra': siralama_df['sira'],
+            'Senaryo': siralama_df['isim'],
+            'Faiz Çarpanı': siralama_df['faiz_carpani'],
+            'Süre': sure_metni(siralama_df['ay_sayisi']) + np.where(siralama_df['limit_asimi'], " (30 yıl aşıldı)", ""),
+            'Faiz Maliyeti': siralama_df['toplam_faiz'],
+            'Kapanış Birikimi': siralama_df['toplam_birikim'],
+            'Seçiminiz': np.where(siralama_df['mevcut'], "✅", ""),
+        })
+        st.dataframe(siralama_df, hide_index=True, column_config={"Faiz Maliyeti": TL_FORMATI, "Kapanış Birikimi": TL_FORMATI})
+
+    # --- DETAYLI TABLO VE EXCEL İNDİRME ---
+    st.subheader("📋 Aylık Ödeme Planı Detayları (Kalem Bazlı Akış)")
+
+    # Oturum sonucun kendisini değil, depodaki tutamağını taşır (tablo parçası ve Excel indirmesi için).
+    tutamak = sonuc['tutamak']
+
+    col_res1, col_res2 = st.columns([3, 1])
+    with col_res2:
+         # Çalışma kitabı sadece butona tıklandığında üretilir; tıklama sayfayı yeniden çalıştırmaz.
+         detay_ayri_sayfalar = st.session_state.get('excel_ayri_sayfalar', False)
+         st.download_button(
+            label="⬇️ Excel İndir (Tüm Detaylar)",
+            data=lambda: excel_verisi(tutamak, detay_ayri_sayfalar),
+            file_name=f"Borc_Odeme_Plani_Detay_{pd.Timestamp.now().strftime('%Y%m%d')}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            on_click="ignore"
+        )
+
+    with col_res1:
+        render_plan_detay_tablosu(tutamak)
+
+    # --- PERFORMANS PROFİLİ (Yönetici Kuralları'ndan açılır) ---
+    if 'profil' in sonuc and rapor_sonuclari:
+        st.subheader("⏱️ Performans Profili")
+        motor_adi = next(k for k, v in SIMULASYON_MOTORLARI.items() if v == sim_params['motor'])
+        for baslik, tablo in [(f"Simülasyon ({motor_adi})", sonuc['profil']), ("Rapor ve Tavsiyeler", rapor_sonuclari.get('profil', []))]:
+            profil_df = pd.DataFrame(tablo)
+            st.markdown(f"**{baslik}** — toplam {profil_df['Süre (ms)'].sum():,.1f} ms")
+            st.dataframe(profil_df, hide_index=True, column_config={col: st.column_config.NumberColumn(format="%.1f") for col in profil_df.columns if col not in ('Aşama', 'Çağrı')})
+
+if calculate_button_advanced or calculate_button_basic:
+    hesap_isi_baslat('advanced' if calculate_button_advanced else 'basic')
+elif st.session_state.get('hesap_isi'):
+    # Girdiler (kalemler ya da işi başlatan sekmenin ayarları) değiştiyse süren iş iptal edilir, sonuçları atılır.
+    sekme, _, hesap_isi = st.session_state['hesap_isi']
+    if hesap_isi.anahtar != hesap_anahtari(hesap_girdileri(sekme)):
+        hesap_isi.iptal()
+        del st.session_state['hesap_isi']
+
+if st.session_state.get('hesap_isi'):
+    with st.container():
+        # Sonuç paneli de bir parçadır; iş sürerken yalnızca o, belirli aralıkla yeniden çalışır.
+        izleniyor = not st.session_state['hesap_isi'][2].bitti
+        st.fragment(run_every=HESAP_YENILEME_ARALIGI if izleniyor else None)(render_hesap_sonuclari)(izleniyor=izleniyor)
                 
+# --- OTOMATİK KAYIT ---
+# Çalıştırmanın sonunda (tüm düzenlemeler uygulandıktan sonra) bekletilir; değişmeyen profil yeniden yazılmaz.
+otomatik_kaydet()
+
 # --- DIPNOT VE TELİF ---
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,277 @@
+"""Simülasyon, rapor/tavsiye, Excel dışa aktarımı ve profil yüklemenin ölçeklenmesini ölçen benchmark paketi.
+
+Tohumlu bir üreteç, JSON yedeklerindeki (create_save_data) biçimde gerçekçi profiller üretir:
+tüm min_kural tipleri (ASGARI_FAIZ, FAIZ_ART_ANAPARA, SABIT_TAKSIT_ANAPARA, FAIZ, süreli ve süresiz
+SABIT_GIDER), artışlı gelirler ve tek seferlik ikramiyeler. Gelir düzeyi, planın seçilen ufukta
+(kisa / orta / uzun = 360 ay sınırı) kapanacağı şekilde ayarlanır.
+
+Profil yükleme aşaması, aynı profilin JSON yedeğinden (json) ve profil deposu dosyasından (ikili)
+oturum kayıtlarına okunmasını karşılaştırır.
+
+Her aşama için duvar saati süresi (tekrarların en iyisi ve ortancası), tepe bellek (tracemalloc,
+ayrı bir çalıştırmada) ve simüle edilen ay başına maliyet raporlanır. Sonuçlar JSON olarak yazılır;
+--karsilastir ile önceki bir sonuç dosyasına göre gerilemeler listelenir.
+
+Kullanım:
+    python benchmark.py --boyutlar 5,50,500,5000 --ufuklar kisa,orta,uzun -o yeni.json --karsilastir eski.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from borc_plani import (borc_kayitlari, excel_raporu_olustur, gelir_kayitlari, generate_report_and_recommendations, kontrol_noktasi_onbellegi, profil_coz,
+                        profil_kodla, simulasyon_onbellegi)
+from borc_plani.sabitler import SIMULASYON_MOTORLARI, STRATEJILER
+from borc_plani.simulasyon import _simule_borc_planı_hesapla
+
+# Kalem tipleri ve profil içindeki ağırlıkları; ilk kalemler her tipten birer tane olacak şekilde sırayla seçilir.
+KALEM_TIPLERI = {
+    'ASGARI_FAIZ': 0.20,
+    'FAIZ_ART_ANAPARA': 0.15,
+    'SABIT_TAKSIT_ANAPARA': 0.20,
+    'FAIZ': 0.15,
+    'SABIT_GIDER_SURELI': 0.15,
+    'SABIT_GIDER_SURESIZ': 0.15,
+}
+
+# Gelir düzeyinin ayarlandığı hedef ay (None: gelir faizi karşılamaz, plan 360 ay sınırına gider). Ek ödeme stratejisi,
+# biten taksitler ve ikramiyeler sayesinde gerçekleşen süre hedeften kısadır (kisa ~2 yıl, orta ~3-6 yıl).
+UFUKLAR = {'kisa': 24, 'orta': 120, 'uzun': None}
+
+VARSAYILAN_BOYUTLAR = [5, 50, 500, 5000]
+VARSAYILAN_MOTORLAR = list(SIMULASYON_MOTORLARI.values())
+ASAMALAR = ['simulasyon', 'rapor', 'excel', 'yukleme']
+
+SIM_PARAMS = {
+    'agresiflik_carpan': STRATEJILER["Maksimum Çaba (Tüm Ek Ödeme)"],
+    'oncelik_stratejisi': 'Avalanche',
+    'faiz_carpani': 1.0,
+    'birikim_artis_aylik': 3.5,
+    'aylik_zorunlu_birikim': 5000,
+    'baslangic_birikim': 0,
+    'total_birikim_hedefi': 0,
+    'birikim_tipi_str': "Aylık Sabit Tutar",
+    'baslangic_tarihi': date(2025, 1, 1),
+}
+
+
+def _annuite(tutar, faiz, ay):
+    return tutar * faiz / (1 - (1 + faiz) ** -ay) if faiz else tutar / ay
+
+
+def sentetik_profil(kalem_sayisi, ufuk='orta', tohum=0):
+    """Tohumlu, gerçekçi bir (borclar, gelirler) profili üretir; aynı argümanlar her zaman aynı profili verir."""
+    rng = random.Random(f"{tohum}-{kalem_sayisi}-{ufuk}")
+    tipler = list(KALEM_TIPLERI)
+    borclar = []
+
+    for i in range(kalem_sayisi):
+        tip = tipler[i] if i < len(tipler) else rng.choices(tipler, weights=list(KALEM_TIPLERI.values()))[0]
+        borc = {'isim': '', 'tutar': 0.0, 'oncelik': 1000 + rng.randint(1, 5), 'faiz_aylik': 0.0, 'kalan_ay': 99999, 'sabit_taksit': 0.0,
+                'kk_asgari_yuzdesi': 0.0, 'zorunlu_anapara_yuzdesi': 0.0, 'limit': 0.0, 'devam_etme_yuzdesi': 0.0}
+
+        if tip == 'ASGARI_FAIZ':
+            tutar = round(rng.uniform(5000, 80000), 2)
+            borc.update(isim=f"Kredi Kartı {i} (Dönem Borcu)", tutar=tutar, faiz_aylik=0.0366, kk_asgari_yuzdesi=rng.choice([0.2, 0.4]), limit=round(tutar * rng.uniform(1.0, 1.5), -3), min_kural='ASGARI_FAIZ')
+        elif tip == 'FAIZ_ART_ANAPARA':
+            borc.update(isim=f"KMH {i}", tutar=round(rng.uniform(2000, 40000), 2), faiz_aylik=0.05, zorunlu_anapara_yuzdesi=rng.choice([0.0, 0.05]), min_kural='FAIZ_ART_ANAPARA')
+        elif tip == 'SABIT_TAKSIT_ANAPARA':
+            tutar, faiz, ay = round(rng.uniform(20000, 400000), 2), round(rng.uniform(0.02, 0.045), 4), rng.randint(6, 120)
+            borc.update(isim=f"Kredi {i}", tutar=tutar, faiz_aylik=faiz, kalan_ay=ay, sabit_taksit=round(_annuite(tutar, faiz, ay), 2), devam_etme_yuzdesi=rng.choice([0.0, 0.0, 0.5]), min_kural='SABIT_TAKSIT_ANAPARA')
+        elif tip == 'FAIZ':
+            borc.update(isim=f"Diğer Borç {i}", tutar=round(rng.uniform(5000, 100000), 2), faiz_aylik=round(rng.uniform(0.01, 0.05), 4), zorunlu_anapara_yuzdesi=rng.choice([0.0, 0.02, 0.05]), min_kural='FAIZ')
+        elif tip == 'SABIT_GIDER_SURELI':
+            borc.update(isim=f"Taksit Gideri {i}", oncelik=1, kalan_ay=rng.randint(3, 360), sabit_taksit=round(rng.uniform(300, 5000), 2), devam_etme_yuzdesi=rng.choice([0.0, 1.0]), min_kural='SABIT_GIDER')
+        else:
+            borc.update(isim=f"Sabit Gider {i}", oncelik=1, sabit_taksit=round(rng.uniform(500, 15000), 2), min_kural='SABIT_GIDER')
+        borclar.append(borc)
+
+    # Gelir: ufuk boyunca ortalama zorunlu ödeme + aylık birikim + faizli borçları ufukta kapatacak fazla. "uzun" ufukta
+    # gelir, yalnızca süresiz giderleri ve faizin yarısını karşılar; biten taksitler serbest kalsa da borç kapanmaz.
+    aylar = np.arange(1, 361)
+    zorunlu = np.zeros(360)
+    for b in borclar:
+        if b['min_kural'] in ('SABIT_GIDER', 'SABIT_TAKSIT_ANAPARA'):
+            zorunlu += b['sabit_taksit'] * np.where(aylar <= b['kalan_ay'], 1.0, b['devam_etme_yuzdesi'])
+    faizli = [b for b in borclar if b['min_kural'] in ('ASGARI_FAIZ', 'FAIZ_ART_ANAPARA', 'FAIZ')]
+    faizli_toplam = sum(b['tutar'] for b in faizli)
+    ortalama_faiz = sum(b['tutar'] * b['faiz_aylik'] for b in faizli) / faizli_toplam if faizli_toplam else 0.0
+    ay = UFUKLAR[ufuk]
+    if ay:
+        ihtiyac = zorunlu[:ay].mean() + SIM_PARAMS['aylik_zorunlu_birikim'] + _annuite(faizli_toplam, ortalama_faiz, ay)
+    else:
+        ihtiyac = zorunlu[-1] + SIM_PARAMS['aylik_zorunlu_birikim'] + 0.5 * faizli_toplam * ortalama_faiz
+    ihtiyac = float(ihtiyac)
+    artis = 0.0 if ay is None else rng.choice([0.0, 0.02, 0.05])
+
+    gelirler = [{'isim': "Maaş", 'tutar': round(0.8 * ihtiyac, 2), 'baslangic_ay': 1, 'artis_yuzdesi': artis, 'tek_seferlik': False}]
+    ek_gelir_sayisi = max(1, kalem_sayisi // 100)
+    for i in range(ek_gelir_sayisi):
+        gelirler.append({'isim': f"Ek Gelir {i}", 'tutar': round(0.2 * ihtiyac / ek_gelir_sayisi, 2), 'baslangic_ay': 1 if i == 0 else rng.randint(1, 60), 'artis_yuzdesi': artis, 'tek_seferlik': False})
+    for i in range(max(1, kalem_sayisi // 200)):
+        gelirler.append({'isim': f"İkramiye {i}", 'tutar': round(ihtiyac * rng.uniform(0.5, 2.0), 2), 'baslangic_ay': rng.randint(2, 360), 'artis_yuzdesi': 0.0, 'tek_seferlik': True})
+
+    return borclar, gelirler
+
+
+def _json_yedekten(yedek):
+    """Arayüzün JSON yedek yükleme yolu (load_data_from_upload): çözümleme ve kayıtlara dönüştürme."""
+    veri = json.loads(yedek.decode('utf-8'))
+    return list(borc_kayitlari(veri['borclar'])), list(gelir_kayitlari(veri['gelirler']))
+
+
+def _onbellekleri_temizle():
+    simulasyon_onbellegi().temizle()
+    kontrol_noktasi_onbellegi().temizle()
+
+
+def _olc(calistir, tekrar):
+    """calistir() fonksiyonunu soğuk önbellekle `tekrar` kez zamanlar, ardından ayrı bir çalıştırmada tepe belleği ölçer."""
+    sureler = []
+    for _ in range(tekrar):
+        _onbellekleri_temizle()
+        baslangic = time.perf_counter()
+        sonuc = calistir()
+        sureler.append(time.perf_counter() - baslangic)
+
+    # tracemalloc zamanlamayı yavaşlattığından bellek ayrı ölçülür.
+    _onbellekleri_temizle()
+    tracemalloc.start()
+    calistir()
+    _, tepe = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sonuc, {'sure_min_sn': min(sureler), 'sure_ortanca_sn': statistics.median(sureler), 'tepe_bellek_mb': tepe / 2**20}
+
+
+def calistir_benchmark(boyutlar, ufuklar, motorlar, asamalar, tekrar=3, tohum=0, ilerleme=True):
+    """Tüm boyut x ufuk x aşama(x motor) kombinasyonlarını ölçer ve sonuç kayıtlarının listesini döndürür."""
+    kayitlar = []
+    for boyut in boyutlar:
+        for ufuk in ufuklar:
+            # Ölçümler, arayüzün oturumda tuttuğu gibi Borc / Gelir kayıtlarıyla yapılır.
+            borclar, gelirler = sentetik_profil(boyut, ufuk, tohum)
+            borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+            referans = _simule_borc_planı_hesapla(borclar, gelirler, {}, **dict(SIM_PARAMS, motor='numpy'))
+            ay = min(referans['ay_sayisi'], 360)
+            olcumler = []
+
+            if 'simulasyon' in asamalar:
+                for motor in motorlar:
+                    params = dict(SIM_PARAMS, motor=motor)
+                    olcumler.append(('simulasyon', motor, lambda params=params: _simule_borc_planı_hesapla(borclar, gelirler, {}, **params)))
+            if 'rapor' in asamalar:
+                olcumler.append(('rapor', None, lambda: generate_report_and_recommendations(borclar, gelirler, referans, dict(SIM_PARAMS, motor='numpy'), {})))
+            if 'excel' in asamalar:
+                olcumler.append(('excel', None, lambda: excel_raporu_olustur(referans)))
+            if 'yukleme' in asamalar:
+                profil = {'borclar': list(borclar), 'gelirler': list(gelirler), 'baslangic_tarihi': SIM_PARAMS['baslangic_tarihi']}
+                yedek = json.dumps({'borclar': [b.sozluk() for b in borclar], 'gelirler': [g.sozluk() for g in gelirler]}, ensure_ascii=False, indent=4).encode('utf-8')
+                ikili = profil_kodla(profil)
+                olcumler.append(('yukleme', 'json', lambda yedek=yedek: _json_yedekten(yedek)))
+                olcumler.append(('yukleme', 'ikili', lambda ikili=ikili: profil_coz(ikili)))
+
+            for asama, motor, calistir in olcumler:
+                _, olcum = _olc(calistir, tekrar)
+                kayit = {'asama': asama, 'motor': motor, 'boyut': boyut, 'ufuk': ufuk, 'tohum': tohum, 'ay_sayisi': referans['ay_sayisi'],
+                         **olcum, 'ay_basina_ms': 1000 * olcum['sure_ortanca_sn'] / ay}
+                kayitlar.append(kayit)
+                if ilerleme:
+                    print(_satir(kayit), file=sys.stderr)
+    return kayitlar
+
+
+def _anahtar(kayit):
+    return (kayit['asama'], kayit['motor'], kayit['boyut'], kayit['ufuk'], kayit['tohum'])
+
+
+def _ad(kayit):
+    return kayit['asama'] + (f"[{kayit['motor']}]" if kayit['motor'] else '')
+
+
+def _satir(kayit):
+    return (f"{_ad(kayit):<18} boyut={kayit['boyut']:<5} ufuk={kayit['ufuk']:<5} ay={kayit['ay_sayisi']:<4} "
+            f"süre={kayit['sure_ortanca_sn'] * 1000:10.1f} ms  bellek={kayit['tepe_bellek_mb']:8.1f} MB  ay başına={kayit['ay_basina_ms']:8.3f} ms")
+
+
+def ortam_bilgisi():
+    """Sonuçların hangi sürüm ve ortamda alındığını kaydeder."""
+    try:
+        surum = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        surum = None
+    return {'zaman': datetime.now().isoformat(timespec='seconds'), 'surum': surum, 'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'platform': platform.platform(), 'islemci': platform.processor() or platform.machine()}
+
+
+def karsilastir(onceki, yeni, esik=0.10):
+    """İki sonuç kümesindeki ortak ölçümleri karşılaştırır; süresi veya belleği `esik` oranından fazla artanları döndürür.
+
+    Süre için tekrarların en iyisi kullanılır; ortancaya göre arka plan yükünden daha az etkilenir.
+    """
+    onceki = {_anahtar(k): k for k in onceki}
+    gerilemeler = []
+    for kayit in yeni:
+        eski = onceki.get(_anahtar(kayit))
+        if eski is None:
+            continue
+        sure_orani = kayit['sure_min_sn'] / eski['sure_min_sn'] if eski['sure_min_sn'] else float('inf')
+        bellek_orani = kayit['tepe_bellek_mb'] / eski['tepe_bellek_mb'] if eski['tepe_bellek_mb'] else float('inf')
+        durum = "GERİLEME" if sure_orani > 1 + esik or bellek_orani > 1 + esik else ("İYİLEŞME" if sure_orani < 1 - esik else "")
+        print(f"{_ad(kayit):<18} boyut={kayit['boyut']:<5} ufuk={kayit['ufuk']:<5} "
+              f"süre x{sure_orani:6.2f}  bellek x{bellek_orani:6.2f}  {durum}")
+        if durum == "GERİLEME":
+            gerilemeler.append(kayit)
+    return gerilemeler
+
+
+def _liste(metin, tip=str):
+    return [tip(x) for x in metin.split(',') if x.strip()]
+
+
+def main(argv=None):
+    ayristirici = argparse.ArgumentParser(description="Simülasyon, rapor, Excel ve profil yükleme aşamalarının ölçeklenme benchmark'ı.")
+    ayristirici.add_argument('--boyutlar', default=','.join(map(str, VARSAYILAN_BOYUTLAR)), help="Kalem sayıları (virgülle ayrılmış)")
+    ayristirici.add_argument('--ufuklar', default=','.join(UFUKLAR), help=f"Plan ufukları: {', '.join(UFUKLAR)}")
+    ayristirici.add_argument('--motorlar', default=','.join(VARSAYILAN_MOTORLAR), help="Simülasyon aşamasında ölçülecek motorlar")
+    ayristirici.add_argument('--asamalar', default=','.join(ASAMALAR), help=f"Ölçülecek aşamalar: {', '.join(ASAMALAR)}")
+    ayristirici.add_argument('--tekrar', type=int, default=3, help="Zamanlama tekrar sayısı (varsayılan: 3)")
+    ayristirici.add_argument('--tohum', type=int, default=0, help="Profil üretecinin tohumu")
+    ayristirici.add_argument('-o', '--cikti', default='benchmark_sonucu.json', help="Sonuçların yazılacağı JSON dosyası")
+    ayristirici.add_argument('--karsilastir', help="Karşılaştırılacak önceki sonuç dosyası; gerileme varsa çıkış kodu 1 olur")
+    ayristirici.add_argument('--esik', type=float, default=0.10, help="Gerileme sayılacak artış oranı (varsayılan: 0.10)")
+    args = ayristirici.parse_args(argv)
+
+    ufuklar = _liste(args.ufuklar)
+    bilinmeyen = set(ufuklar) - set(UFUKLAR)
+    if bilinmeyen:
+        ayristirici.error(f"Bilinmeyen ufuk: {', '.join(sorted(bilinmeyen))}")
+
+    kayitlar = calistir_benchmark(_liste(args.boyutlar, int), ufuklar, _liste(args.motorlar), _liste(args.asamalar), args.tekrar, args.tohum)
+    with open(args.cikti, 'w', encoding='utf-8') as f:
+        json.dump({'ortam': ortam_bilgisi(), 'ayarlar': vars(args), 'sonuclar': kayitlar}, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {args.cikti}", file=sys.stderr)
+
+    if args.karsilastir:
+        with open(args.karsilastir, encoding='utf-8') as f:
+            onceki = json.load(f)['sonuclar']
+        gerilemeler = karsilastir(onceki, kayitlar, args.esik)
+        if gerilemeler:
+            print(f"{len(gerilemeler)} ölçümde gerileme var.", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
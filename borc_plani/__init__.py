@@ -0,0 +1,43 @@
+"""Borç kapatma ve finansal planlama hesap çekirdeği (Streamlit'ten bağımsız).
+
+Alt modüller ilk erişimde yüklenir: `from borc_plani import simule_borc_planı` yalnızca NumPy'ı ve
+simülasyon modülünü yükler. pandas aylık detay tablosu, xlsxwriter Excel dışa aktarımı istendiğinde,
+süreç havuzu bileşenleri de yalnızca Monte Carlo çalıştırıldığında içe aktarılır.
+"""
+
+import importlib
+
+_KONUMLAR = {
+    'sabitler': ['STRATEJILER', 'ONCELIK_STRATEJILERI', 'SIMULASYON_MOTORLARI', 'FAIZ_CARPANI_IZGARASI', 'KURAL_KODLARI', 'KURAL_ADLARI',
+                 'GIDER_KURALLARI', 'VARSAYILAN_TR_PARAMS'],
+    'kayitlar': ['Borc', 'Gelir', 'borc_kayitlari', 'gelir_kayitlari', 'sozluklere'],
+    'yardimcilar': ['format_tl', 'hesapla_min_odeme', 'borc_olustur', 'gelir_olustur'],
+    'profil': ['PROFILLEME_KIPLERI', 'AsamaProfili'],
+    'takvim': ['GelirTakvimi', 'gelir_takvimi'],
+    'simulasyon': ['simule_borc_planı', 'simule_senaryo_izgarasi'],
+    'onbellek': ['SonucOnbellegi', 'simulasyon_onbellegi', 'kontrol_noktasi_onbellegi', 'gelir_takvimi_onbellegi', 'onbellek_anahtari'],
+    'monte_carlo': ['MONTE_CARLO_DAGILIMLARI', 'MONTE_CARLO_VARSAYILAN', 'YUZDELIKLER', 'simule_monte_carlo'],
+    'optimizasyon': ['OPTIMIZASYON_HEDEFLERI', 'optimize_odeme_sirasi'],
+    'duyarlilik': ['DUYARLILIK_ADIMI', 'DUYARLILIK_PARAMETRELERI', 'duyarlilik_analizi'],
+    'hedef': ['HEDEF_TURLERI', 'KALDIRACLAR', 'hedef_ara'],
+    'tavsiye': ['run_alternative_scenario', 'generate_report_and_recommendations'],
+    'isler': ['HESAP_ISCI_SAYISI', 'HesapIsi', 'IsIptalEdildi', 'is_baslat'],
+    'depo': ['SEMA_SURUMU', 'ProfilDeposu', 'profil_deposu', 'profil_kodla', 'profil_coz'],
+    'excel': ['EXCEL_DETAY_SAYFALARI', 'excel_raporu_olustur'],
+    'aktarim': ['AKTARIM_TURLERI', 'BORC_ALANLARI', 'GELIR_ALANLARI', 'esleme_oner', 'basliklari_oku', 'ice_aktar'],
+}
+_MODULLER = {ad: modul for modul, adlar in _KONUMLAR.items() for ad in adlar}
+
+__all__ = list(_MODULLER)
+
+
+def __getattr__(ad):
+    if ad not in _MODULLER:
+        raise AttributeError(f"module {__name__!r} has no attribute {ad!r}")
+    deger = getattr(importlib.import_module(f'.{_MODULLER[ad]}', __name__), ad)
+    globals()[ad] = deger
+    return deger
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,331 @@
+"""Borç/gider ve gelir kalemlerinin CSV / XLSX dosyalarından toplu içe aktarımı."""
+
+import io
+import itertools
+import zipfile
+
+import numpy as np
+
+from .kayitlar import Borc, Gelir
+from .sabitler import KURAL_KODLARI, VARSAYILAN_TR_PARAMS
+
+
+# Dosya parça parça (PARCA_BOYUTU satırlık; XLSX salt okunur modda satır satır) okunur; her parça sütun işlemleriyle doğrulanır,
+# normalize edilir ve kayıtlar sütun listelerinden konumsal olarak kurulur. Kural ve varsayılanlar,
+# arayüzdeki formların borc_olustur / gelir_olustur'a verdiği değerlerle aynıdır. Hatalı satırlar
+# eklenmez; satır numarası (başlık 1. satırdır) ve nedenleriyle hata raporunda listelenir.
+
+PARCA_BOYUTU = 5000
+AKTARIM_TURLERI = {"Borç / Gider": 'borc', "Gelir": 'gelir'}
+
+# Alan -> (arayüzdeki başlık, dosyadaki olası başlıklar). Arayüz tablolarının başlıklarıyla dışa aktarılmış
+# dosyalar eşleme yapılmadan tanınır.
+BORC_ALANLARI = {
+    'isim': ("Gider Kalemi Adı", ['isim', 'ad', 'adı', 'kalem', 'açıklama']),
+    'tip': ("Gider Kalemi Tipi", ['tip', 'tür', 'tipi', 'borç tipi', 'kural']),
+    'tutar': ("Kalan Anapara", ['tutar', 'anapara', 'bakiye', 'kalan borç']),
+    'sabit_taksit': ("Aylık Taksit/Gider", ['taksit', 'aylık taksit', 'aylık gider', 'aylık tutar', 'sabit taksit']),
+    'kalan_ay': ("Kalan Ay", ['kalan taksit', 'kalan taksit ayı', 'vade']),
+    'faiz_aylik': ("Aylık Faiz (%)", ['faiz', 'aylık faiz', 'aylık faiz oranı (%)']),
+    'zorunlu_anapara_yuzdesi': ("Zorunlu Anapara Yüzdesi (%)", ['zorunlu anapara', 'anapara yüzdesi']),
+    'limit': ("Limit", ['kart limiti', 'kk limit']),
+    'devam_etme_yuzdesi': ("Devam Yüzdesi (%)", ['devam', 'devam yüzdesi', 'devam etme yüzdesi']),
+    'oncelik': ("Öncelik", ['sıra', 'ek ödeme sırası']),
+}
+GELIR_ALANLARI = {
+    'isim': ("Gelir Adı", ['isim', 'ad', 'adı', 'gelir', 'açıklama']),
+    'tutar': ("Aylık Tutar", ['tutar', 'aylık gelir', 'net gelir']),
+    'baslangic_ay': ("Başlangıç Ayı", ['başlangıç', 'başlangıç ay']),
+    'artis_yuzdesi': ("Artış Yüzdesi", ['artış', 'yıllık artış', 'yıllık artış yüzdesi (%)']),
+    'tek_seferlik': ("Tek Seferlik Mi?", ['tek seferlik', 'tek seferlik mi']),
+    'bitis_ay': ("Bitiş Ayı", ['bitiş', 'bitiş ay']),
+    'kademe_ay': ("Kademe Ayı", ['zam ayı']),
+    'kademe_yuzdesi': ("Kademe Değişimi (%)", ['kademe', 'zam', 'zam yüzdesi']),
+}
+
+# Dosyadaki tip değeri -> borc_olustur'un borc_tipi. Tam adlar da tanınır.
+BORC_TIPLERI = {
+    "Kredi Kartı Dönem Borcu (Faizli)": ['kk dönem borcu', 'kk', 'kredi kartı', 'kredi kartı dönem borcu', 'asgari_faiz'],
+    "Ek Hesap (KMH)": ['kmh', 'ek hesap', 'faiz_art_anapara'],
+    "Kredi (Sabit Taksit/Anapara)": ['kredi', 'ihtiyaç kredisi', 'taşıt kredisi', 'sabit_taksit_anapara'],
+    "Diğer Faizli Borç": ['diğer', 'faizli borç', 'faiz'],
+    "Zorunlu Sabit Gider (Kira, Aidat vb.)": ['sabit gider', 'zorunlu sabit gider', 'kira', 'aidat', 'sabit_gider'],
+    "Ev Kredisi Taksiti": ['ev kredisi', 'konut kredisi'],
+    "Sabit Taksit Gideri (KK Taksiti, Aidat vb.)": ['taksit', 'kk taksiti', 'sabit taksit gideri', 'sabit_taksit_gider'],
+}
+_FAIZLI_TIPLER = list(BORC_TIPLERI)[:4]
+_SURELI_GIDERLER = ["Ev Kredisi Taksiti", "Sabit Taksit Gideri (KK Taksiti, Aidat vb.)"]
+_YUZDE_ALANLARI = ('faiz_aylik', 'zorunlu_anapara_yuzdesi', 'devam_etme_yuzdesi', 'artis_yuzdesi', 'kademe_yuzdesi')
+
+_EVET = ['evet', 'e', 'true', 'doğru', '1', 'x', 'yes']
+_HAYIR = ['hayır', 'h', 'false', 'yanlış', '0', 'no', '']
+
+
+def _normalize(metinler):
+    """Türkçe büyük/küçük harf ve boşluk farklarını kaldırır (İ/I -> i/ı)."""
+    return (metinler.fillna('').astype(str).str.replace('İ', 'i').str.replace('I', 'ı').str.lower()
+            .str.replace(r'\s+', ' ', regex=True).str.strip())
+
+
+def _normalize_metin(metin):
+    return metin.replace('İ', 'i').replace('I', 'ı').lower().strip()
+
+
+def _tip_sozlugu():
+    return {_normalize_metin(ad): tip for tip, adlar in BORC_TIPLERI.items() for ad in [tip] + adlar}
+
+
+def alanlar(tur):
+    return BORC_ALANLARI if tur == 'borc' else GELIR_ALANLARI
+
+
+def esleme_oner(basliklar, tur):
+    """Dosya başlıklarından alan -> başlık eşlemesini tahmin eder (bulunamayan alanlar eşlemeye girmez)."""
+    normal = {_normalize_metin(str(b)): b for b in basliklar}
+    esleme = {}
+    for alan, (etiket, takma_adlar) in alanlar(tur).items():
+        for aday in [etiket, alan.replace('_', ' ')] + takma_adlar:
+            if _normalize_metin(aday) in normal:
+                esleme[alan] = normal[_normalize_metin(aday)]
+                break
+    return esleme
+
+
+def _okuma_ayarlari(veri):
+    """Kodlama (UTF-8 ya da Windows-1254) ve ayırıcıyı ilk satırdan belirler; ';' ayırıcıda ondalık virgüldür."""
+    try:
+        metin = veri[:65536].decode('utf-8-sig')
+        kodlama = 'utf-8-sig'
+    except UnicodeDecodeError:
+        metin = veri[:65536].decode('cp1254', errors='replace')
+        kodlama = 'cp1254'
+    ilk_satir = metin.split('\n', 1)[0]
+    ayirici = max([',', ';', '\t'], key=ilk_satir.count)
+    return kodlama, ayirici, ayirici == ';'
+
+
+def tablo_parcalari(dosya, dosya_adi, parca_boyutu=PARCA_BOYUTU, nrows=None):
+    """Dosyayı metin sütunlu DataFrame parçaları olarak okur; (parça, ondalık_virgül) çiftleri üretir."""
+    import pandas as pd
+
+    if hasattr(dosya, 'getvalue'):  # BytesIO / Streamlit UploadedFile: okuma konumundan bağımsız
+        veri = dosya.getvalue()
+    elif hasattr(dosya, 'read'):
+        veri = dosya.read()
+    else:
+        with open(dosya, 'rb') as f:
+            veri = f.read()
+    if dosya_adi.lower().endswith(('.xlsx', '.xlsm')):
+        yield from _xlsx_parcalari(veri, parca_boyutu, nrows)
+        return
+    kodlama, ayirici, ondalik_virgul = _okuma_ayarlari(veri)
+    okuyucu = pd.read_csv(io.BytesIO(veri), sep=ayirici, dtype=str, keep_default_na=False, encoding=kodlama, skipinitialspace=True,
+                          chunksize=parca_boyutu if nrows is None else None, nrows=nrows)
+    if nrows is not None:
+        yield okuyucu, ondalik_virgul
+        return
+    for parca in okuyucu:
+        yield parca, ondalik_virgul
+
+
+def _hucre_metni(deger):
+    """Hücre değerini read_excel(dtype=str) gibi metne çevirir: boş hücre NaN, tam sayı değerli float ondalıksız."""
+    if deger is None:
+        return np.nan
+    if isinstance(deger, float) and deger.is_integer():
+        return str(int(deger))
+    return str(deger)
+
+
+def _xlsx_parcalari(veri, parca_boyutu, nrows):
+    """İlk çalışma sayfasını salt okunur modda satır satır okur; parca_boyutu satırlık metin DataFrame'leri üretir."""
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    kitap = load_workbook(io.BytesIO(veri), read_only=True, data_only=True)
+    try:
+        satirlar = kitap.worksheets[0].iter_rows(values_only=True)
+        baslik = next(satirlar, ())
+        sutunlar = [f"Unnamed: {i}" if b is None else str(b) for i, b in enumerate(baslik)]
+        if nrows is not None:
+            satirlar = itertools.islice(satirlar, nrows)
+        parca, okunan = [], 0
+        for satir in satirlar:
+            satir = tuple(satir[:len(sutunlar)]) + (None,) * (len(sutunlar) - len(satir))
+            parca.append([_hucre_metni(d) for d in satir])
+            if len(parca) == parca_boyutu:
+                yield pd.DataFrame(parca, columns=sutunlar, dtype=object), False
+                parca, okunan = [], okunan + len(parca)
+        if parca or okunan == 0:
+            yield pd.DataFrame(parca, columns=sutunlar, dtype=object), False
+    finally:
+        kitap.close()
+
+
+def basliklari_oku(dosya, dosya_adi):
+    """Yalnızca başlık satırını okur."""
+    parca, _ = next(tablo_parcalari(dosya, dosya_adi, nrows=0))
+    return [str(b) for b in parca.columns]
+
+
+def _sayilar(metinler, ondalik_virgul):
+    """Metin sütununu sayıya çevirir; (değerler, boş maske, geçersiz maske) döndürür. 'TL', '%' ve boşluklar atılır."""
+    import pandas as pd
+
+    temiz = metinler.fillna('').astype(str).str.replace(r'(?i)\s|tl|%|₺', '', regex=True)
+    if ondalik_virgul:
+        temiz = temiz.str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    bos = temiz == ''
+    degerler = pd.to_numeric(temiz.mask(bos), errors='coerce')
+    return degerler, bos, degerler.isna() & ~bos
+
+
+class _HataBiriktirici:
+    """Satır başına hata metinlerini sütun işlemleriyle biriktirir."""
+
+    def __init__(self, index):
+        import pandas as pd
+        self.metin = pd.Series('', index=index)
+
+    def ekle(self, maske, mesaj):
+        self.metin = self.metin.where(~maske, self.metin + mesaj + '; ')
+
+    @property
+    def hatali(self):
+        return self.metin != ''
+
+
+def _sutun(parca, esleme, alan):
+    import pandas as pd
+    if alan in esleme and esleme[alan] in parca.columns:
+        return parca[esleme[alan]]
+    return pd.Series('', index=parca.index)
+
+
+def _sayisal_sutunlar(parca, esleme, alan_tanimlari, ondalik_virgul, hatalar):
+    sayilar = {}
+    for alan, (etiket, _) in alan_tanimlari.items():
+        if alan in ('isim', 'tip', 'tek_seferlik'):
+            continue
+        degerler, _, gecersiz = _sayilar(_sutun(parca, esleme, alan), ondalik_virgul)
+        hatalar.ekle(gecersiz, f"'{etiket}' sayı değil")
+        if alan == 'kademe_yuzdesi':  # Kademe azalış da olabilir (ör. %-20 maaş kesintisi); formdaki gibi en az -100
+            hatalar.ekle(degerler < -100, f"'{etiket}' -100'den küçük olamaz")
+        else:
+            hatalar.ekle(degerler < 0, f"'{etiket}' negatif olamaz")
+        sayilar[alan] = degerler / 100.0 if alan in _YUZDE_ALANLARI else degerler
+    return sayilar
+
+
+def _borc_parcasi(parca, esleme, ondalik_virgul, tr_params):
+    hatalar = _HataBiriktirici(parca.index)
+    isim = _sutun(parca, esleme, 'isim').fillna('').astype(str).str.strip()
+    tip = _normalize(_sutun(parca, esleme, 'tip')).map(_tip_sozlugu())
+    hatalar.ekle(isim == '', "İsim boş")
+    hatalar.ekle(tip.isna(), "Tanınmayan kalem tipi")
+
+    s = _sayisal_sutunlar(parca, esleme, {a: t for a, t in BORC_ALANLARI.items() if a != 'kademe_yuzdesi'}, ondalik_virgul, hatalar)
+    faizli = tip.isin(_FAIZLI_TIPLER)
+    gider = tip.notna() & ~faizli
+    kk, kmh = tip == _FAIZLI_TIPLER[0], tip == _FAIZLI_TIPLER[1]
+    kredi, diger = tip == _FAIZLI_TIPLER[2], tip == _FAIZLI_TIPLER[3]
+    sureli_gider = tip.isin(_SURELI_GIDERLER)
+
+    hatalar.ekle(faizli & ~(s['tutar'] >= 1), "Kalan anapara en az 1 olmalı")
+    hatalar.ekle((kredi | gider) & ~(s['sabit_taksit'] > 0), "Aylık taksit/gider tutarı gerekli")
+    hatalar.ekle((kredi | diger) & s['faiz_aylik'].isna(), "Aylık faiz oranı gerekli")
+    hatalar.ekle((kredi | sureli_gider) & ~(s['kalan_ay'] >= 1), "Kalan ay gerekli")
+    hatalar.ekle(kredi & (s['kalan_ay'] > tr_params['kredi_taksit_max_ay']), f"Kredi vadesi en fazla {tr_params['kredi_taksit_max_ay']} ay olabilir")
+
+    gecerli = ~hatalar.hatali
+    tip, isim, faizli, gider, kk, kmh, kredi, sureli_gider = (x[gecerli] for x in (tip, isim, faizli, gider, kk, kmh, kredi, sureli_gider))
+    s = {alan: degerler[gecerli] for alan, degerler in s.items()}
+    kira = gider & ~sureli_gider
+
+    # Öncelik: dosyadaki sıra n ise formdaki "Öncelik n." seçimi gibi n + 1000; 1000 ve üstü değerler (arayüz tablosundan
+    # dışa aktarılmış) olduğu gibi alınır. Giderlerin önceliği 1'dir.
+    oncelik = np.where(s['oncelik'] >= 1000, s['oncelik'], s['oncelik'] + 1000)
+    oncelik = np.where(gider, 1, np.where(np.isnan(oncelik), 9999, oncelik))
+    kalan_ay = s['kalan_ay'].fillna(0).to_numpy()
+    kalan_ay = np.where(kredi | sureli_gider | (kira & (kalan_ay > 0) & (kalan_ay < 99999)), kalan_ay, 0)
+    kalan_ay = np.where(kalan_ay > 0, kalan_ay, 99999)
+    faiz = np.select([kk, kmh, faizli], [tr_params['kk_aylik_akdi_faiz'] / 100.0, s['faiz_aylik'].fillna(tr_params['kmh_aylik_faiz'] / 100.0), s['faiz_aylik']], 0.0)
+    sutunlar = {
+        'isim': np.where(kk & ~isim.str.endswith(" (Dönem Borcu)"), isim + " (Dönem Borcu)", isim),
+        'tutar': np.where(faizli, s['tutar'], 0.0),
+        'oncelik': oncelik.astype(int),
+        'faiz_aylik': faiz,
+        'kalan_ay': kalan_ay.astype(int),
+        'sabit_taksit': np.where(kredi | gider, s['sabit_taksit'], 0.0),
+        'kk_asgari_yuzdesi': np.where(kk, tr_params['kk_asgari_odeme_yuzdesi_default'] / 100.0, 0.0),
+        'zorunlu_anapara_yuzdesi': np.where(kmh, s['zorunlu_anapara_yuzdesi'].fillna(0.05), 0.0),
+        'limit': np.where(kk, s['limit'].fillna(0.0), 0.0),
+        'devam_etme_yuzdesi': np.select([kira, sureli_gider], [1.0, s['devam_etme_yuzdesi'].fillna(0.0)], 0.0),
+        'kural': np.select([kk, kmh, kredi, faizli], [KURAL_KODLARI[k] for k in ('ASGARI_FAIZ', 'FAIZ_ART_ANAPARA', 'SABIT_TAKSIT_ANAPARA', 'FAIZ')], KURAL_KODLARI['SABIT_GIDER']),
+    }
+    kayitlar = [Borc(*satir) for satir in zip(*(np.asarray(sutunlar[alan]).tolist() for alan in Borc.__slots__))]
+    return kayitlar, hatalar, isim
+
+
+def _gelir_parcasi(parca, esleme, ondalik_virgul):
+    hatalar = _HataBiriktirici(parca.index)
+    isim = _sutun(parca, esleme, 'isim').fillna('').astype(str).str.strip()
+    hatalar.ekle(isim == '', "İsim boş")
+    tek = _normalize(_sutun(parca, esleme, 'tek_seferlik'))
+    hatalar.ekle(~tek.isin(_EVET + _HAYIR), "'Tek Seferlik Mi?' evet/hayır olmalı")
+
+    s = _sayisal_sutunlar(parca, esleme, GELIR_ALANLARI, ondalik_virgul, hatalar)
+    baslangic = s['baslangic_ay'].fillna(1)
+    bitis = s['bitis_ay'].fillna(0)
+    hatalar.ekle(~(s['tutar'] >= 1), "Tutar en az 1 olmalı")
+    hatalar.ekle(baslangic < 1, "Başlangıç ayı en az 1 olmalı")
+    hatalar.ekle((bitis > 0) & (bitis < baslangic), "Bitiş ayı başlangıçtan önce olamaz")
+
+    gecerli = ~hatalar.hatali
+    isim = isim[gecerli]
+    kademe_ay = s['kademe_ay'].fillna(0)[gecerli].astype(int).tolist()
+    kademe_carpani = (1 + s['kademe_yuzdesi'].fillna(0.0)[gecerli].astype(float)).tolist()
+    sutunlar = [
+        isim.tolist(),
+        s['tutar'][gecerli].astype(float).tolist(),
+        baslangic[gecerli].astype(int).tolist(),
+        s['artis_yuzdesi'].fillna(0.0)[gecerli].astype(float).tolist(),
+        tek[gecerli].isin(_EVET).tolist(),
+        [ay if ay > 0 else None for ay in bitis[gecerli].astype(int).tolist()],
+        [((ay, carpan),) if ay > 0 and carpan != 1 else () for ay, carpan in zip(kademe_ay, kademe_carpani)],
+    ]
+    return [Gelir(*satir) for satir in zip(*sutunlar)], hatalar, isim
+
+
+def ice_aktar(dosya, dosya_adi, tur, esleme=None, tr_params=None):
+    """Dosyadaki kalemleri Borc / Gelir kayıtlarına çevirir; (kayıtlar, hata_raporu) döndürür.
+
+    esleme alan -> dosya başlığı sözlüğüdür (verilmezse başlıklardan tahmin edilir). hata_raporu, eklenmeyen
+    satırların 'Satır', 'İsim' ve 'Hata' sütunlarını içeren DataFrame'idir. Dosya okunamıyor veya isim
+    sütunu eşlenmemişse ValueError yükseltir.
+    """
+    import pandas as pd
+
+    tr_params = {**VARSAYILAN_TR_PARAMS, **(tr_params or {})}
+    kayitlar, raporlar, satir_ofseti = [], [], 0
+    try:
+        for parca, ondalik_virgul in tablo_parcalari(dosya, dosya_adi):
+            if esleme is None:
+                esleme = esleme_oner(parca.columns, tur)
+            if 'isim' not in esleme or (tur == 'borc' and 'tip' not in esleme):
+                raise ValueError("İsim" + (" ve tip" if tur == 'borc' else "") + " sütunları eşlenmelidir")
+            parca = parca.reset_index(drop=True)
+            if tur == 'borc':
+                parca_kayitlari, hatalar, _ = _borc_parcasi(parca, esleme, ondalik_virgul, tr_params)
+            else:
+                parca_kayitlari, hatalar, _ = _gelir_parcasi(parca, esleme, ondalik_virgul)
+            kayitlar.extend(parca_kayitlari)
+            hatali = hatalar.hatali
+            raporlar.append(pd.DataFrame({'Satır': parca.index[hatali] + 2 + satir_ofseti,
+                                          'İsim': _sutun(parca, esleme, 'isim')[hatali].fillna('').astype(str),
+                                          'Hata': hatalar.metin[hatali].str.rstrip('; ')}))
+            satir_ofseti += len(parca)
+    except (pd.errors.ParserError, UnicodeDecodeError, OSError, KeyError, zipfile.BadZipFile) as e:
+        raise ValueError(f"Dosya okunamadı: {e}") from e
+    rapor = pd.concat(raporlar, ignore_index=True) if raporlar else pd.DataFrame(columns=['Satır', 'İsim', 'Hata'])
+    return kayitlar, rapor
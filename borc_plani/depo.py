@@ -0,0 +1,190 @@
+"""Oturum verisinin (profil) yerel diskte ikili, sütunlu biçimde saklanması ve gecikmeli otomatik kayıt."""
+
+import atexit
+import io
+import os
+import pickle
+import re
+import struct
+import tempfile
+import threading
+from datetime import date
+
+from .kayitlar import Borc, Gelir
+
+
+# Profil dosyası: 8 baytlık imza, 2 baytlık şema sürümü ve yalnızca yerleşik tiplerden (list, dict, str,
+# sayı, None) oluşan bir pickle gövdesi. Kalemler sütun sütun (alan başına tek liste) saklanır; yükleyici
+# kayıtları sözlük kurmadan, konumsal olarak oluşturur. Gövde sınıf içe aktaramayan bir unpickler ile
+# okunur. Dosyalar geçici dosyaya yazılıp os.replace ile yerine konur (yarım yazılmış profil oluşmaz).
+#
+# Şema değiştiğinde SEMA_SURUMU artırılır ve eski sürümü bir sonrakine çeviren işlev _GOCLER'e eklenir.
+# Kayıt tiplerine yeni alan eklemek göç gerektirmez: eksik sütunlar kaydın varsayılanıyla doldurulur.
+
+PROFIL_IMZASI = b'BPPROFIL'
+SEMA_SURUMU = 1
+PROFIL_UZANTISI = '.bpp'
+PROFIL_KAYIT_GECIKMESI = 2.0  # Sn; son değişiklikten bu kadar sonra diske yazılır
+
+_BASLIK = struct.Struct('<8sH')
+_GOCLER = {}  # surum -> profil gövdesini (surum + 1) biçimine çeviren işlev
+_PROFIL_ADI = re.compile(r'^[\w\-. ]{1,64}$')
+
+
+class _YerlesikUnpickler(pickle.Unpickler):
+    def find_class(self, modul, ad):
+        raise pickle.UnpicklingError(f"Profil dosyasında beklenmeyen nesne: {modul}.{ad}")
+
+
+def _sutunlar(kayitlar, tip):
+    return {'alanlar': list(tip.__slots__), 'degerler': [list(sutun) for sutun in zip(*(k.degerler() for k in kayitlar))]}
+
+
+def _kayitlar(sutunlar, tip):
+    satirlar = zip(*sutunlar['degerler'])
+    if tuple(sutunlar['alanlar']) == tip.__slots__:
+        return [tip(*satir) for satir in satirlar]
+    bilinen = [alan in tip.__slots__ for alan in sutunlar['alanlar']]
+    return [tip(**{alan: deger for alan, deger, var in zip(sutunlar['alanlar'], satir, bilinen) if var}) for satir in satirlar]
+
+
+def profil_kodla(profil):
+    """Profil sözlüğünü profil dosyası baytlarına çevirir."""
+    govde = {
+        'borclar': _sutunlar(profil['borclar'], Borc),
+        'gelirler': _sutunlar(profil['gelirler'], Gelir),
+        'harcama_kalemleri': {ad: list(degerler) for ad, degerler in profil.get('harcama_kalemleri', {}).items()},
+        'tr_params': dict(profil.get('tr_params', {})),
+        'manuel_oncelik_listesi': dict(profil.get('manuel_oncelik_listesi', {})),
+        'baslangic_tarihi': profil['baslangic_tarihi'].isoformat() if profil.get('baslangic_tarihi') else None,
+    }
+    return _BASLIK.pack(PROFIL_IMZASI, SEMA_SURUMU) + pickle.dumps(govde, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def profil_coz(veri):
+    """Profil dosyası baytlarını profil sözlüğüne çevirir; kalemler Borc / Gelir kayıt listeleridir."""
+    if len(veri) < _BASLIK.size:
+        raise ValueError("Profil dosyası eksik veya bozuk")
+    imza, surum = _BASLIK.unpack_from(veri)
+    if imza != PROFIL_IMZASI:
+        raise ValueError("Dosya bir profil dosyası değil")
+    if surum > SEMA_SURUMU:
+        raise ValueError(f"Profil dosyası daha yeni bir sürümle yazılmış (şema {surum} > {SEMA_SURUMU})")
+    govde = _YerlesikUnpickler(io.BytesIO(memoryview(veri)[_BASLIK.size:])).load()
+    while surum < SEMA_SURUMU:
+        govde = _GOCLER[surum](govde)
+        surum += 1
+    return {
+        'borclar': _kayitlar(govde['borclar'], Borc),
+        'gelirler': _kayitlar(govde['gelirler'], Gelir),
+        'harcama_kalemleri': govde['harcama_kalemleri'],
+        'tr_params': govde['tr_params'],
+        'manuel_oncelik_listesi': govde['manuel_oncelik_listesi'],
+        'baslangic_tarihi': date.fromisoformat(govde['baslangic_tarihi']) if govde['baslangic_tarihi'] else None,
+    }
+
+
+class ProfilDeposu:
+    """Bir dizindeki adlandırılmış profiller; gecikmeli_kaydet() art arda gelen değişiklikleri tek yazmada toplar."""
+
+    def __init__(self, dizin, gecikme=PROFIL_KAYIT_GECIKMESI):
+        self.dizin = dizin
+        self.gecikme = gecikme
+        self.yazma = 0
+        self._son = {}        # ad -> son yazılan ya da bekleyen profil (değişmeyen profil yeniden yazılmaz)
+        self._bekleyen = {}   # ad -> yazılmayı bekleyen profil
+        self._zamanlayicilar = {}
+        self._kilit = threading.Lock()
+
+    def _yol(self, ad):
+        if not _PROFIL_ADI.match(ad):
+            raise ValueError(f"Geçersiz profil adı: {ad!r} (harf, rakam, boşluk, '-', '_' ve '.' kullanılabilir)")
+        return os.path.join(self.dizin, ad + PROFIL_UZANTISI)
+
+    def listele(self):
+        if not os.path.isdir(self.dizin):
+            return []
+        return sorted(dosya[:-len(PROFIL_UZANTISI)] for dosya in os.listdir(self.dizin) if dosya.endswith(PROFIL_UZANTISI))
+
+    def var_mi(self, ad):
+        return os.path.exists(self._yol(ad))
+
+    def yukle(self, ad):
+        """Profili okur; bekleyen (henüz yazılmamış) bir kayıt varsa önce onu yazar."""
+        self.bekleyenleri_yaz(ad)
+        with open(self._yol(ad), 'rb') as f:
+            profil = profil_coz(f.read())
+        with self._kilit:
+            self._son[ad] = profil
+        return profil
+
+    def kaydet(self, ad, profil):
+        """Profili hemen ve atomik olarak yazar."""
+        yol = self._yol(ad)
+        veri = profil_kodla(profil)
+        os.makedirs(self.dizin, exist_ok=True)
+        fd, gecici = tempfile.mkstemp(dir=self.dizin, prefix=f'.{ad}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(veri)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(gecici, yol)
+        except BaseException:
+            if os.path.exists(gecici):
+                os.remove(gecici)
+            raise
+        with self._kilit:
+            if ad not in self._bekleyen:  # Yazılırken yeni bir değişiklik bekletildiyse karşılaştırma ona göre yapılır
+                self._son[ad] = profil
+            self.yazma += 1
+
+    def gecikmeli_kaydet(self, ad, profil):
+        """Profili `gecikme` sn sonra yazılmak üzere bekletir; bu sürede gelen yeni profil öncekinin yerini alır."""
+        self._yol(ad)
+        with self._kilit:
+            if self._son.get(ad) == profil:
+                return False
+            self._son[ad] = self._bekleyen[ad] = profil
+            if ad in self._zamanlayicilar:
+                self._zamanlayicilar[ad].cancel()
+            zamanlayici = threading.Timer(self.gecikme, self.bekleyenleri_yaz, args=(ad,))
+            zamanlayici.daemon = True
+            self._zamanlayicilar[ad] = zamanlayici
+            zamanlayici.start()
+        return True
+
+    def bekleyenleri_yaz(self, ad=None):
+        """Bekleyen kayıtları (ad verilirse yalnızca onu) hemen yazar."""
+        with self._kilit:
+            adlar = [ad] if ad is not None else list(self._bekleyen)
+            yazilacak = [(a, self._bekleyen.pop(a)) for a in adlar if a in self._bekleyen]
+            for a, _ in yazilacak:
+                zamanlayici = self._zamanlayicilar.pop(a, None)
+                if zamanlayici is not None:
+                    zamanlayici.cancel()
+        for a, profil in yazilacak:
+            self.kaydet(a, profil)
+
+    def sil(self, ad):
+        with self._kilit:
+            self._bekleyen.pop(ad, None)
+            self._son.pop(ad, None)
+            zamanlayici = self._zamanlayicilar.pop(ad, None)
+            if zamanlayici is not None:
+                zamanlayici.cancel()
+        if self.var_mi(ad):
+            os.remove(self._yol(ad))
+
+
+_depolar = {}
+_depolar_kilidi = threading.Lock()
+
+def profil_deposu(dizin):
+    """Dizin başına süreç genelinde tek ProfilDeposu döndürür (bekleyen kayıtlar süreç kapanırken yazılır)."""
+    dizin = os.path.abspath(dizin)
+    with _depolar_kilidi:
+        if dizin not in _depolar:
+            _depolar[dizin] = ProfilDeposu(dizin)
+            atexit.register(_depolar[dizin].bekleyenleri_yaz)
+        return _depolar[dizin]
@@ -0,0 +1,85 @@
+"""Kalem bazında duyarlılık analizi (tornado tablosu)."""
+
+import numpy as np
+
+from .kayitlar import borc_kayitlari, gelir_kayitlari
+from .onbellek import _onbellekli
+from .sabitler import GIDER_KURALLARI
+from .simulasyon import _vektorel_simulasyon
+from .takvim import AY_LIMITI, gelir_satiri, gelir_takvimi
+
+
+# Her faizli borcun aylık faizi, her sabit giderin aylık tutarı ve her gelirin tutarı ±adim oranında,
+# sürekli gelirlerin yıllık artış oranı ±ARTIS_ADIMI puan değiştirilir. Temel plan ve tüm değişimler tek
+# vektörel geçişte senaryo olarak yürür: borç/gider değişimleri senaryonun 'borc_degerleri' ile, gelir
+# değişimleri senaryonun gelir takvimi satırıyla (gelir_matrisi) verilir. Gelir satırları paylaşılan
+# takvimden, yalnızca değişen gelirin satırı yeniden hesaplanarak türetilir.
+
+DUYARLILIK_ADIMI = 0.10
+ARTIS_ADIMI = 0.01  # Yıllık artış oranına ± eklenen puan (0.01 = 1 puan)
+DUYARLILIK_PARAMETRELERI = {'faiz_aylik': "Aylık Faiz (%)", 'sabit_taksit': "Aylık Gider", 'tutar': "Gelir Tutarı", 'artis_yuzdesi': "Yıllık Gelir Artışı (%)"}
+
+
+def _degisimler(borclar, gelirler, adim):
+    """(kalem adı, parametre, temel, düşük, yüksek, slot ya da gelir sırası) demetlerini üretir."""
+    for slot, b in enumerate(borclar):
+        if b.kural not in GIDER_KURALLARI and b.faiz_aylik > 0:
+            yield b.isim, 'faiz_aylik', b.faiz_aylik, b.faiz_aylik * (1 - adim), b.faiz_aylik * (1 + adim), slot
+        elif b.kural in GIDER_KURALLARI and b.sabit_taksit > 0:
+            yield b.isim, 'sabit_taksit', b.sabit_taksit, b.sabit_taksit * (1 - adim), b.sabit_taksit * (1 + adim), slot
+    for i, g in enumerate(gelirler):
+        yield g.isim, 'tutar', g.tutar, g.tutar * (1 - adim), g.tutar * (1 + adim), i
+        if not g.tek_seferlik:
+            yield g.isim, 'artis_yuzdesi', g.artis_yuzdesi, max(-0.99, g.artis_yuzdesi - ARTIS_ADIMI), g.artis_yuzdesi + ARTIS_ADIMI, i
+
+
+def _duyarlilik_hesapla(borclar, gelirler, manuel_oncelikler, sim_params, adim):
+    takvim = gelir_takvimi(gelirler)
+    aylar = np.arange(1, AY_LIMITI + 1)
+    degisimler = list(_degisimler(borclar, gelirler, adim))
+
+    senaryolar, gelir_satirlari = [{}], [takvim.toplam]
+    for _, parametre, _, dusuk, yuksek, konum in degisimler:
+        for deger in (dusuk, yuksek):
+            if parametre in ('faiz_aylik', 'sabit_taksit'):
+                senaryolar.append({'borc_degerleri': {konum: {parametre: deger}}})
+                gelir_satirlari.append(takvim.toplam)
+            else:
+                yeni_satir = gelir_satiri(gelirler[konum].degistir(**{parametre: deger}), aylar)
+                senaryolar.append({})
+                gelir_satirlari.append(takvim.toplam + (yeni_satir - takvim.matris[konum]))
+
+    ozetler = _vektorel_simulasyon(borclar, gelirler, manuel_oncelikler, senaryolar, gelir_matrisi=np.vstack(gelir_satirlari), **sim_params)
+    temel = ozetler[0]
+    satirlar = []
+    for k, (isim, parametre, deger, dusuk, yuksek, _) in enumerate(degisimler):
+        alt, ust = ozetler[1 + 2 * k], ozetler[2 + 2 * k]
+        satirlar.append({
+            'kalem': isim, 'parametre': parametre, 'temel_deger': deger, 'dusuk_deger': dusuk, 'yuksek_deger': yuksek,
+            'ay_dusuk': alt['ay_sayisi'] - temel['ay_sayisi'], 'ay_yuksek': ust['ay_sayisi'] - temel['ay_sayisi'],
+            'faiz_dusuk': alt['toplam_faiz'] - temel['toplam_faiz'], 'faiz_yuksek': ust['toplam_faiz'] - temel['toplam_faiz'],
+            'limit_asimi': alt['limit_asimi'] or ust['limit_asimi'],
+        })
+    for satir in satirlar:
+        satir['etki'] = max(abs(satir['faiz_dusuk']), abs(satir['faiz_yuksek']))
+    satirlar.sort(key=lambda r: (-r['etki'], -max(abs(r['ay_dusuk']), abs(r['ay_yuksek']))))
+    for sira, satir in enumerate(satirlar, 1):
+        satir['sira'] = sira
+    return {'temel': temel, 'adim': adim, 'artis_adimi': ARTIS_ADIMI, 'satirlar': satirlar, 'senaryo_sayisi': len(senaryolar)}
+
+
+def duyarlilik_analizi(borclar, gelirler, manuel_oncelikler, sim_params, adim=DUYARLILIK_ADIMI):
+    """Tek bir kalem değeri değiştiğinde bitiş ayı ve toplam faizin nasıl değiştiğini ölçer.
+
+    'satirlar', her (kalem, parametre) için düşük / yüksek değerdeki ay ve faiz farklarını taşır ve
+    faiz etkisine göre büyükten küçüğe sıralıdır; 'temel' değişmemiş planın özetidir.
+    """
+    if not borclar or not gelirler:
+        return None
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    if sim_params.get('oncelik_stratejisi') != 'Kullanici':
+        manuel_oncelikler = {}
+    hesapla = lambda: _duyarlilik_hesapla(borclar, gelirler, manuel_oncelikler, sim_params, adim)
+    if sim_params.get('profilleme'):
+        return hesapla()
+    return _onbellekli('duyarlilik_analizi', (borclar, gelirler, manuel_oncelikler, sim_params, adim, ARTIS_ADIMI), hesapla)
@@ -0,0 +1,52 @@
+"""Aylık planın xlsx olarak dışa aktarımı (xlsxwriter yalnızca indirme istendiğinde yüklenir)."""
+
+import io
+
+import numpy as np
+
+
+EXCEL_DETAY_SAYFALARI = ['Ek Ödeme', 'Faiz', 'Anapara Min']
+
+def excel_raporu_olustur(sonuc, detay_ayri_sayfalar=False):
+    """Aylık planı xlsx olarak üretir (yalnızca indirme istendiğinde çağrılır).
+
+    Satırlar xlsxwriter'ın constant_memory kipinde, sonuç DataFrame'inin tamsayı sütunlarından
+    doğrudan ve sırayla yazılır; çalışma kitabı bellekte bütün olarak kurulmaz. detay_ayri_sayfalar
+    True ise borç başına Ek Ödeme / Faiz / Anapara Min sütunları kendi sayfalarına ayrılır.
+    """
+    import xlsxwriter
+
+    df = sonuc['df']
+    tamamlandi = sonuc['tamamlandi']
+    detay_sutunu = lambda col: any(col.endswith(f'({ad})') for ad in EXCEL_DETAY_SAYFALARI)
+
+    sayfalar = {'Aylık Finansal Akış': [col for col in df.columns if not (detay_ayri_sayfalar and detay_sutunu(col))]}
+    if detay_ayri_sayfalar:
+        for ad in EXCEL_DETAY_SAYFALARI:
+            sayfalar[ad] = ['Ay'] + [col for col in df.columns if col.endswith(f'({ad})')]
+
+    excel_data = io.BytesIO()
+    workbook = xlsxwriter.Workbook(excel_data, {'constant_memory': True})
+    baslik_formati = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    ay_adlari = df['Ay'].tolist()
+
+    for sayfa_adi, sutunlar in sayfalar.items():
+        worksheet = workbook.add_worksheet(sayfa_adi)
+        worksheet.write_row(0, 0, sutunlar, baslik_formati)
+
+        # 'Ay' dışındaki sütunlar tek bir tamsayı matrisi; biten kalemlerin kalanı "TAMAMLANDI" yazılır.
+        sayisal = sutunlar[1:]
+        degerler = df[sayisal].to_numpy(dtype=np.int64)
+        maske_sutunlari = [(k, col) for k, col in enumerate(sayisal) if col in tamamlandi.columns]
+        maske = tamamlandi[[col for _, col in maske_sutunlari]].to_numpy() if maske_sutunlari else np.zeros((len(df), 0), dtype=bool)
+        maske_konumlari = np.array([k for k, _ in maske_sutunlari], dtype=np.int64)
+
+        for i, ay_adi in enumerate(ay_adlari):
+            satir = degerler[i].tolist()
+            for k in maske_konumlari[maske[i]].tolist():
+                satir[k] = "TAMAMLANDI"
+            worksheet.write(i + 1, 0, ay_adi)
+            worksheet.write_row(i + 1, 1, satir)
+
+    workbook.close()
+    return excel_data.getvalue()
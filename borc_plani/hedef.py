@@ -0,0 +1,132 @@
+"""Hedef arama: bir hedefi tutturmak için gereken ek gelir, gider kesintisi veya aylık birikim."""
+
+import numpy as np
+
+from .kayitlar import borc_kayitlari, gelir_kayitlari
+from .onbellek import _onbellekli
+from .sabitler import GIDER_KURALLARI
+from .simulasyon import _vektorel_simulasyon
+from .takvim import gelir_takvimi
+
+
+# Hedef, kaldıraç değerinde monoton kabul edilir (ek gelir ve gider kesintisi arttıkça plan kısalır, faiz
+# azalır, birikim artar; aylık zorunlu birikim arttıkça tersi). Aralık, her geçişte ADAY_SAYISI adayın tek
+# vektörel çalışmada simüle edilmesiyle (çok noktalı ikiye bölme) daraltılır. Ay ve faiz hedeflerinde
+# hedefi kesin olarak kaçıran adaylar o ay kesilir; ek gelir adayları paylaşılan gelir takvimine eklenerek
+# kurulur.
+
+HEDEF_TURLERI = {"Borçlar Belirli Ayda Bitsin": 'ay', "Borçlar Bittiğinde Birikim En Az": 'birikim', "Toplam Faiz En Fazla": 'faiz'}
+KALDIRACLAR = {"Ek Aylık Gelir": 'ek_gelir', "Sabit Gider Kesintisi (%)": 'gider_kesintisi', "Aylık Zorunlu Birikim (En Fazla)": 'aylik_birikim'}
+
+ADAY_SAYISI = 16
+_TABAN_TUTAR = 500.0  # TL; tutar kaldıraçlarında ilk geçişin geometrik ızgarası bu tutardan başlar
+_TOLERANS = {'ek_gelir': 1.0, 'gider_kesintisi': 0.001, 'aylik_birikim': 1.0}
+
+
+def _saglar(hedef, hedef_degeri):
+    if hedef == 'ay':
+        return lambda ozet: not ozet['limit_asimi'] and not ozet.get('kesildi') and ozet['ay_sayisi'] <= hedef_degeri
+    if hedef == 'faiz':
+        return lambda ozet: not ozet['limit_asimi'] and not ozet.get('kesildi') and ozet['toplam_faiz'] <= hedef_degeri
+    return lambda ozet: not ozet['limit_asimi'] and ozet['toplam_birikim'] >= hedef_degeri
+
+
+def _hedef_ara_hesapla(borclar, gelirler, manuel_oncelikler, sim_params, hedef, hedef_degeri, kaldirac):
+    params = dict(sim_params)
+    if hedef == 'birikim':
+        params['birikim_tipi_str'] = 'Aylık Sabit Tutar'  # Plan borçlar kapandığı ay biter; birikim o ayın değeridir
+    sinir = {'ay': {'ay_siniri': hedef_degeri}, 'faiz': {'faiz_siniri': hedef_degeri + 0.5}}.get(hedef, {})
+    takvim = gelir_takvimi(gelirler)
+    gider_slotlari = [(slot, b.sabit_taksit) for slot, b in enumerate(borclar) if b.kural in GIDER_KURALLARI and b.sabit_taksit > 0]
+    if kaldirac == 'gider_kesintisi' and not gider_slotlari:
+        return None
+
+    degerlendirilen = 0
+
+    def degerlendir(degerler):
+        nonlocal degerlendirilen
+        degerlendirilen += len(degerler)
+        gelir_matrisi = None
+        if kaldirac == 'ek_gelir':
+            senaryolar = [{}] * len(degerler)
+            gelir_matrisi = takvim.toplam + np.asarray(degerler)[:, None]
+        elif kaldirac == 'gider_kesintisi':
+            senaryolar = [{'borc_degerleri': {slot: {'sabit_taksit': taksit * (1 - oran)} for slot, taksit in gider_slotlari}} for oran in degerler]
+        else:
+            senaryolar = [{'aylik_zorunlu_birikim': deger} for deger in degerler]
+        return _vektorel_simulasyon(borclar, gelirler, manuel_oncelikler, senaryolar, gelir_matrisi=gelir_matrisi, **sinir, **params)
+
+    saglar = _saglar(hedef, hedef_degeri)
+    en_kucuk = kaldirac != 'aylik_birikim'  # Ek gelir / kesinti: hedefi tutturan en küçük değer; birikim: en büyük değer
+
+    # --- İlk geçiş: sıfır ve geometrik ızgara (kesinti oranında eşit aralıklı) ile sınırın bulunduğu aralık ---
+    if kaldirac == 'gider_kesintisi':
+        adaylar = np.linspace(0.0, 1.0, ADAY_SAYISI)
+    else:
+        adaylar = np.concatenate(([0.0], _TABAN_TUTAR * 2.0 ** np.arange(ADAY_SAYISI - 1)))
+    ozetler = degerlendir(adaylar)
+    tamam = [saglar(ozet) for ozet in ozetler]
+    baslangic = ozetler[0]
+    gecis = 1
+
+    if en_kucuk:
+        if not any(tamam):
+            return {'ulasilabilir': False, 'deger': None, 'ozet': None, 'baslangic': baslangic, 'gecis': gecis, 'degerlendirilen': degerlendirilen}
+        i = tamam.index(True)
+        if i == 0:
+            return {'ulasilabilir': True, 'deger': 0.0, 'ozet': baslangic, 'baslangic': baslangic, 'gecis': gecis, 'degerlendirilen': degerlendirilen}
+        alt, ust, sonuc = adaylar[i - 1], adaylar[i], ozetler[i]
+    else:
+        if not tamam[0]:
+            return {'ulasilabilir': False, 'deger': None, 'ozet': None, 'baslangic': baslangic, 'gecis': gecis, 'degerlendirilen': degerlendirilen}
+        i = tamam.index(False) if False in tamam else len(tamam)
+        if i == len(tamam):  # Izgaranın tamamı hedefi tutturuyor: hedef bu kaldıraçla sınırlanmıyor
+            return {'ulasilabilir': True, 'sinirsiz': True, 'deger': float(adaylar[-1]), 'ozet': ozetler[-1], 'baslangic': baslangic, 'gecis': gecis, 'degerlendirilen': degerlendirilen}
+        alt, ust, sonuc = adaylar[i - 1], adaylar[i], ozetler[i - 1]
+
+    # --- Daraltma: her geçişte aralığın içinden ADAY_SAYISI aday ---
+    tolerans = _TOLERANS[kaldirac]
+    while ust - alt > tolerans:
+        adaylar = np.linspace(alt, ust, ADAY_SAYISI + 2)[1:-1]
+        if kaldirac != 'gider_kesintisi':
+            adaylar = np.unique(np.round(adaylar))
+            adaylar = adaylar[(adaylar > alt) & (adaylar < ust)]
+            if not adaylar.size:
+                break
+        ozetler = degerlendir(adaylar)
+        tamam = [saglar(ozet) for ozet in ozetler]
+        gecis += 1
+        if en_kucuk:
+            i = tamam.index(True) if True in tamam else len(tamam)
+            if i < len(tamam):
+                ust, sonuc = adaylar[i], ozetler[i]
+            if i > 0:
+                alt = adaylar[i - 1]
+        else:
+            i = tamam.index(False) if False in tamam else len(tamam)
+            if i > 0:
+                alt, sonuc = adaylar[i - 1], ozetler[i - 1]
+            if i < len(tamam):
+                ust = adaylar[i]
+
+    return {'ulasilabilir': True, 'deger': float(ust if en_kucuk else alt), 'ozet': sonuc, 'baslangic': baslangic, 'gecis': gecis, 'degerlendirilen': degerlendirilen}
+
+
+def hedef_ara(borclar, gelirler, manuel_oncelikler, sim_params, hedef, hedef_degeri, kaldirac):
+    """Hedefi tutturan en küçük ek aylık gelir / gider kesintisi oranını ya da en büyük aylık birikimi bulur.
+
+    hedef HEDEF_TURLERI, kaldirac KALDIRACLAR değerlerinden biridir; hedef_degeri ay sayısı ya da TL
+    tutarıdır. 'deger' (kesintide 0-1 oranı), o değerdeki plan özeti ('ozet'), kaldıraç sıfırken özet
+    ('baslangic'), geçiş ve değerlendirilen senaryo sayılarını döndürür. Hedef aralıkta tutturulamıyorsa
+    'ulasilabilir' False olur; aylık birikim hedefi hiç sınırlamıyorsa 'sinirsiz' True olur.
+    """
+    if not borclar or not gelirler:
+        return None
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    if sim_params.get('oncelik_stratejisi') != 'Kullanici':
+        manuel_oncelikler = {}
+    hesapla = lambda: _hedef_ara_hesapla(borclar, gelirler, manuel_oncelikler, sim_params, hedef, hedef_degeri, kaldirac)
+    if sim_params.get('profilleme'):
+        return hesapla()
+    sonuc = _onbellekli('hedef_ara', (borclar, gelirler, manuel_oncelikler, sim_params, hedef, hedef_degeri, kaldirac), lambda: hesapla() or {})
+    return sonuc or None
@@ -0,0 +1,104 @@
+"""Hesaplamaların arka planda (iş parçacığı havuzunda) aşama aşama çalıştırılması: ilerleme ve iptal."""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Bir iş, sırayla çalışan adlandırılmış aşamalardan oluşur; her aşamanın sonucu biter bitmez
+# is.sonuclar'a yazılır, arayüz sonuçları geldikçe gösterir. Aşama işlevleri önceki aşamaların
+# sonuçlarını (sonuclar sözlüğü) alır.
+#
+# Motorlar her simüle edilen ayda ay_bildirimi()(ay) çağırır. İş içinde bu çağrı işin ilerlemesini
+# günceller ve iş iptal edildiyse IsIptalEdildi yükseltir; iş dışında hiçbir şey yapmayan _ay_yok'tur.
+# Bildirim işlevi bağlam değişkeninde taşındığından sim_params ve önbellek anahtarları değişmez.
+#
+# Havuz süreç değil iş parçacığı havuzudur: ilerleme, iptal ve sonuç önbelleği süreç içinde paylaşılır.
+# Süreç havuzu isteyen aşamalar (Monte Carlo) kendi havuzlarını açar; o aşamada ay ilerlemesi görünmez.
+
+HESAP_ISCI_SAYISI = max(1, min(4, os.cpu_count() or 1))
+
+
+class IsIptalEdildi(Exception):
+    """İptal edilen bir işin motoru bir sonraki ay bildiriminde bu hatayla durdurulur."""
+
+
+def _ay_yok(ay):
+    pass
+
+
+_ay_bildirimi = contextvars.ContextVar('ay_bildirimi', default=_ay_yok)
+
+
+def ay_bildirimi():
+    """Çalışan işin ay bildirim işlevini (iş dışında _ay_yok) döndürür."""
+    return _ay_bildirimi.get()
+
+
+class HesapIsi:
+    """Arka planda çalışan bir hesaplama; durum alanları arayüz iş parçacığından kilitsiz okunur."""
+
+    def __init__(self, anahtar, asamalar):
+        self.anahtar = anahtar  # Girdilerin özeti: girdiler değişince iş iptal edilir
+        self.asamalar = [ad for ad, _ in asamalar]
+        self.sonuclar = {}
+        self.durum = 'bekliyor'  # bekliyor / calisiyor / bitti / iptal / hata
+        self.aktif_asama = None
+        self.ay = 0
+        self.hata = None
+        self._islevler = asamalar
+        self._iptal = threading.Event()
+        self._gelecek = None
+
+    @property
+    def bitti(self):
+        return self.durum in ('bitti', 'iptal', 'hata')
+
+    def _ay(self, ay):
+        self.ay = ay
+        if self._iptal.is_set():
+            raise IsIptalEdildi()
+
+    def _calistir(self):
+        jeton = _ay_bildirimi.set(self._ay)
+        try:
+            self.durum = 'calisiyor'
+            for ad, islev in self._islevler:
+                if self._iptal.is_set():
+                    raise IsIptalEdildi()
+                self.aktif_asama, self.ay = ad, 0
+                self.sonuclar[ad] = islev(self.sonuclar)
+            self.durum = 'bitti'
+        except IsIptalEdildi:
+            self.durum = 'iptal'
+        except Exception as hata:
+            self.hata, self.durum = hata, 'hata'
+        finally:
+            self.aktif_asama = None
+            _ay_bildirimi.reset(jeton)
+
+    def iptal(self):
+        """İşi durdurur: sıradaki iş hiç başlamaz, çalışan iş bir sonraki simüle edilen ayda durur."""
+        self._iptal.set()
+        if self._gelecek is not None and self._gelecek.cancel():
+            self.durum = 'iptal'
+
+
+_havuz = None
+_havuz_kilidi = threading.Lock()
+
+def hesap_havuzu():
+    """Süreç genelinde paylaşılan iş parçacığı havuzunu (ilk kullanımda) döndürür."""
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is None:
+            _havuz = ThreadPoolExecutor(max_workers=HESAP_ISCI_SAYISI, thread_name_prefix='hesap')
+        return _havuz
+
+
+def is_baslat(anahtar, asamalar):
+    """(ad, islev) aşamalarını havuzda sırayla çalıştıracak işi başlatır ve döndürür."""
+    hesap_isi = HesapIsi(anahtar, asamalar)
+    hesap_isi._gelecek = hesap_havuzu().submit(hesap_isi._calistir)
+    return hesap_isi
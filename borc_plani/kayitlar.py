@@ -0,0 +1,127 @@
+"""Borç/gider ve gelir kalemleri için sabit alanlı, değiştirilemez kayıt tipleri."""
+
+from .sabitler import FAIZ_EKLENEN_KURALLAR, KURAL_ADLARI, KURAL_KODLARI
+
+# Kalemler oturumda ve motorlarda __slots__ tabanlı kayıtlar olarak tutulur: sözlüğe göre küçüktür, alan
+# erişimi anahtar aramasız yapılır ve değiştirilemedikleri için simülasyonlar girdileri kopyalamadan paylaşır.
+# JSON yedekleri eski sözlük biçimindedir; sozlukten() / sozluk() bu biçimle birebir gidip gelir.
+
+
+class _Kayit:
+    __slots__ = ()
+
+    def __init__(self, *degerler, **alanlar):
+        for alan, deger in zip(self.__slots__, degerler):
+            object.__setattr__(self, alan, deger)
+        for alan in self.__slots__[len(degerler):]:
+            if alan in alanlar:
+                deger = alanlar.pop(alan)
+            elif alan in self._VARSAYILANLAR:
+                deger = self._VARSAYILANLAR[alan]
+            else:
+                raise TypeError(f"{type(self).__name__} için '{alan}' alanı zorunludur")
+            object.__setattr__(self, alan, deger)
+        if alanlar:
+            raise TypeError(f"{type(self).__name__} için bilinmeyen alanlar: {', '.join(alanlar)}")
+
+    def __setattr__(self, alan, deger):
+        raise AttributeError(f"{type(self).__name__} kayıtları değiştirilemez; yeni kayıt için degistir() kullanın")
+
+    def degerler(self):
+        return tuple(getattr(self, alan) for alan in self.__slots__)
+
+    def degistir(self, **alanlar):
+        """Verilen alanları değiştirilmiş yeni bir kayıt döndürür."""
+        return type(self)(**{**dict(zip(self.__slots__, self.degerler())), **alanlar})
+
+    def __eq__(self, diger):
+        return type(self) is type(diger) and self.degerler() == diger.degerler()
+
+    def __hash__(self):
+        return hash(self.degerler())
+
+    def __reduce__(self):
+        return (type(self), self.degerler())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{alan}={getattr(self, alan)!r}' for alan in self.__slots__)})"
+
+
+class Borc(_Kayit):
+    """Borç veya gider kalemi; `kural` min_kural'ın tamsayı kodudur (KURAL_KODLARI)."""
+
+    # Alan sırası sozluk() çıktısının (ve JSON yedeklerinin) anahtar sırasıdır.
+    __slots__ = ('isim', 'tutar', 'oncelik', 'faiz_aylik', 'kalan_ay', 'sabit_taksit', 'kk_asgari_yuzdesi',
+                 'zorunlu_anapara_yuzdesi', 'limit', 'devam_etme_yuzdesi', 'kural')
+    _VARSAYILANLAR = {'tutar': 0, 'oncelik': 9999, 'faiz_aylik': 0, 'kalan_ay': 99999, 'sabit_taksit': 0, 'kk_asgari_yuzdesi': 0,
+                      'zorunlu_anapara_yuzdesi': 0, 'limit': 0, 'devam_etme_yuzdesi': 0.0, 'kural': 0}
+
+    @property
+    def min_kural(self):
+        return KURAL_ADLARI.get(self.kural)
+
+    @property
+    def min_oran(self):
+        """Bakiyeye oranla ödenen min ödeme yüzdesi (sabit taksitli kalemlerde 0)."""
+        if self.kural == KURAL_KODLARI['ASGARI_FAIZ']:
+            return self.kk_asgari_yuzdesi
+        if self.kural in FAIZ_EKLENEN_KURALLAR:
+            return self.zorunlu_anapara_yuzdesi
+        return 0
+
+    @classmethod
+    def sozlukten(cls, sozluk):
+        alanlar = {alan: sozluk[alan] for alan in cls.__slots__ if alan in sozluk}
+        if sozluk.get('min_kural') not in KURAL_KODLARI:
+            raise ValueError(f"'{sozluk.get('isim')}' kaleminin min_kural değeri tanınmıyor: {sozluk.get('min_kural')!r}")
+        alanlar['kural'] = KURAL_KODLARI[sozluk['min_kural']]
+        return cls(**alanlar)
+
+    def sozluk(self):
+        sozluk = dict(zip(self.__slots__[:-1], self.degerler()[:-1]))
+        sozluk['min_kural'] = self.min_kural
+        return sozluk
+
+
+class Gelir(_Kayit):
+    """Gelir kalemi; artis_yuzdesi yıllık orandır (0.10 = %10).
+
+    bitis_ay verilirse gelir o aydan sonra kesilir. kademeler (ay, carpan) çiftleridir: gelir o aydan
+    itibaren carpan katına çıkar (1.15 = %15 zam, 0.5 = yarıya iner); birden çok kademe birikimli uygulanır.
+    """
+
+    __slots__ = ('isim', 'tutar', 'baslangic_ay', 'artis_yuzdesi', 'tek_seferlik', 'bitis_ay', 'kademeler')
+    _VARSAYILANLAR = {'tutar': 0, 'baslangic_ay': 1, 'artis_yuzdesi': 0.0, 'tek_seferlik': False, 'bitis_ay': None, 'kademeler': ()}
+    # Bu alanlar varsayılan değerdeyken JSON'a yazılmaz; eski yedekler birebir aynı kalır.
+    _ISTEGE_BAGLI = ('bitis_ay', 'kademeler')
+
+    @classmethod
+    def sozlukten(cls, sozluk):
+        alanlar = {alan: sozluk[alan] for alan in cls.__slots__ if alan in sozluk}
+        if 'kademeler' in alanlar:
+            alanlar['kademeler'] = tuple((int(ay), float(carpan)) for ay, carpan in alanlar['kademeler'])
+        return cls(**alanlar)
+
+    def sozluk(self):
+        sozluk = dict(zip(self.__slots__, self.degerler()))
+        for alan in self._ISTEGE_BAGLI:
+            if sozluk[alan] == self._VARSAYILANLAR[alan]:
+                del sozluk[alan]
+        if 'kademeler' in sozluk:
+            sozluk['kademeler'] = [list(kademe) for kademe in self.kademeler]
+        return sozluk
+
+
+def borc_kayitlari(borclar):
+    """Sözlük veya kayıt listesini Borc kayıtlarından oluşan bir demete çevirir (kayıtlar kopyalanmaz)."""
+    return tuple(b if type(b) is Borc else Borc.sozlukten(b) for b in borclar)
+
+
+def gelir_kayitlari(gelirler):
+    """Sözlük veya kayıt listesini Gelir kayıtlarından oluşan bir demete çevirir (kayıtlar kopyalanmaz)."""
+    return tuple(g if type(g) is Gelir else Gelir.sozlukten(g) for g in gelirler)
+
+
+def sozluklere(kayitlar):
+    """Kayıtları JSON / DataFrame için sözlük listesine çevirir."""
+    return [k.sozluk() for k in kayitlar]
@@ -0,0 +1,114 @@
+"""Gelir artışı, faiz ve tek seferlik gelir belirsizliği altında Monte Carlo simülasyonu."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .kayitlar import borc_kayitlari, gelir_kayitlari
+from .onbellek import _onbellekli
+from .simulasyon import _vektorel_simulasyon
+from .takvim import gelir_maskesi
+
+
+# Gelir artış oranları, faiz çarpanı ve tek seferlik gelir tutarları yol başına rastgele çekilir;
+# yollar vektörel çekirdekte senaryo olarak (parça parça) birlikte yürütülür. Çekilişler parçalamadan
+# önce tek üreteçle yapıldığı için sonuç, parça boyutundan ve parçaların kaç süreçte çalıştığından bağımsızdır.
+
+MONTE_CARLO_DAGILIMLARI = {"Normal": "normal", "Düzgün (Uniform)": "duzgun"}
+MONTE_CARLO_VARSAYILAN = {
+    'yol_sayisi': 10000,
+    'tohum': 42,
+    'dagilim': 'normal',
+    'gelir_artis_sapma': 0.05,     # Yıllık artış oranına eklenen sapma (0.05 = ±5 puan)
+    'faiz_carpani_sapma': 0.15,    # Faiz çarpanının göreli sapması
+    'tek_seferlik_sapma': 0.25,    # Tek seferlik gelir tutarının göreli sapması
+    'parca_boyutu': 2000,
+    'surec_sayisi': 1,
+}
+YUZDELIKLER = {'P10': 10, 'P50': 50, 'P90': 90}
+
+
+def _rastgele_cek(rng, dagilim, merkez, sapma, adet):
+    """Ortalaması merkez, standart sapması sapma olan normal ya da düzgün dağılımdan örnek çeker."""
+    if dagilim == 'duzgun':
+        yari_genislik = sapma * np.sqrt(3)
+        return rng.uniform(merkez - yari_genislik, merkez + yari_genislik, adet)
+    return rng.normal(merkez, sapma, adet)
+
+
+def _yol_cekilisleri(gelirler, sim_params, ayarlar):
+    """Tüm yolların rastgele değerlerini çeker; i. satır i. yolun gelir başına değerleri ve faiz çarpanıdır.
+
+    Tek seferlik gelirler için tutar çarpanı, diğer gelirler için yıllık artış oranı çekilir.
+    """
+    rng = np.random.default_rng(ayarlar['tohum'])
+    dagilim, yol_sayisi = ayarlar['dagilim'], ayarlar['yol_sayisi']
+    sutunlar = []
+    for gelir in gelirler:
+        if gelir.tek_seferlik:
+            sutunlar.append(np.maximum(0, _rastgele_cek(rng, dagilim, 1.0, ayarlar['tek_seferlik_sapma'], yol_sayisi)))
+        else:
+            sutunlar.append(np.maximum(-0.99, _rastgele_cek(rng, dagilim, gelir.artis_yuzdesi, ayarlar['gelir_artis_sapma'], yol_sayisi)))
+    sutunlar.append(sim_params.get('faiz_carpani', 1.0) * np.maximum(0, _rastgele_cek(rng, dagilim, 1.0, ayarlar['faiz_carpani_sapma'], yol_sayisi)))
+    return np.column_stack(sutunlar)
+
+
+def _monte_carlo_parca(borclar, gelirler, manuel_oncelikler, sim_params, cekilisler):
+    """Bir yol parçasını simüle eder; ay_sayisi, toplam_faiz, toplam_birikim ve limit_asimi dizilerini döndürür."""
+    aylar = np.arange(1, 361)
+
+    gelir_matrisi = np.zeros((len(cekilisler), 360))
+    for sutun, gelir in enumerate(gelirler):
+        maske = gelir_maskesi(gelir, aylar)  # Başlangıç, bitiş ve kademeler tüm yollarda ortaktır
+        if gelir.tek_seferlik:
+            gelir_matrisi += gelir.tutar * cekilisler[:, sutun, None] * maske
+        else:
+            us = np.maximum(aylar - gelir.baslangic_ay, 0) / 12
+            gelir_matrisi += gelir.tutar * (1 + cekilisler[:, sutun, None]) ** us * maske
+
+    faiz_carpanlari = cekilisler[:, -1]
+    ozetler = _vektorel_simulasyon(borclar, gelirler, manuel_oncelikler, [{'faiz_carpani': f} for f in faiz_carpanlari.tolist()], gelir_matrisi=gelir_matrisi, **sim_params)
+    return tuple(np.array([ozet[k] for ozet in ozetler]) for k in ['ay_sayisi', 'toplam_faiz', 'toplam_birikim', 'limit_asimi'])
+
+
+def _surec_baglami():
+    """Süreç havuzu için başlatma yöntemi; 'fork' varsa çalışanlar betiği yeniden içe aktarmaz."""
+    return multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+
+
+def _monte_carlo_hesapla(borclar, gelirler, manuel_oncelikler, sim_params, ayarlar):
+    """Yolları parçalara böler, (isteğe bağlı olarak süreç havuzunda) simüle eder ve yüzdelik bantlarını döndürür."""
+    cekilisler = _yol_cekilisleri(gelirler, sim_params, ayarlar)
+    parca_boyutu = ayarlar['parca_boyutu']
+    gorevler = [(borclar, gelirler, manuel_oncelikler, sim_params, cekilisler[i:i + parca_boyutu]) for i in range(0, len(cekilisler), parca_boyutu)]
+
+    if ayarlar['surec_sayisi'] > 1 and len(gorevler) > 1:
+        with ProcessPoolExecutor(max_workers=min(ayarlar['surec_sayisi'], len(gorevler)), mp_context=_surec_baglami()) as havuz:
+            parca_sonuclari = list(havuz.map(_monte_carlo_parca, *zip(*gorevler)))
+    else:
+        parca_sonuclari = [_monte_carlo_parca(*gorev) for gorev in gorevler]
+
+    ay_sayisi, toplam_faiz, toplam_birikim, limit_asimi = (np.concatenate(x) for x in zip(*parca_sonuclari))
+    return {
+        'yol_sayisi': len(ay_sayisi),
+        'yuzdelikler': {ad: {p: float(np.percentile(degerler, yuzde)) for p, yuzde in YUZDELIKLER.items()}
+                        for ad, degerler in [('ay_sayisi', ay_sayisi), ('toplam_faiz', toplam_faiz), ('toplam_birikim', toplam_birikim)]},
+        'limit_asimi_orani': float(limit_asimi.mean()),
+    }
+
+
+def simule_monte_carlo(borclar, gelirler, manuel_oncelikler, sim_params, ayarlar=None):
+    """Belirsiz gelir artışı, faiz ve tek seferlik gelirlerle binlerce yolu simüle eder.
+
+    ay_sayisi / toplam_faiz / toplam_birikim için P10/P50/P90 değerlerini ve 30 yılı aşan yolların
+    oranını döndürür. ayarlar, MONTE_CARLO_VARSAYILAN anahtarlarının bir kısmını ezebilir.
+    """
+    if not borclar or not gelirler:
+        return None
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    ayarlar = {**MONTE_CARLO_VARSAYILAN, **(ayarlar or {})}
+    # Parça boyutu ve süreç sayısı sonucu değiştirmez; önbellek anahtarına girmez.
+    anahtar_ayarlari = {k: v for k, v in ayarlar.items() if k not in ('parca_boyutu', 'surec_sayisi')}
+    return _onbellekli('simule_monte_carlo', (borclar, gelirler, manuel_oncelikler, sim_params, anahtar_ayarlari),
+                       lambda: _monte_carlo_hesapla(borclar, gelirler, manuel_oncelikler, sim_params, ayarlar))
@@ -0,0 +1,296 @@
+"""Simülasyon sonuçları, dışa aktarım tamponları ve kontrol noktaları için süreç genelinde paylaşılan önbellek."""
+
+import atexit
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from .kayitlar import _Kayit
+
+
+# Sonuçlar, normalize edilmiş girdilerin SHA-256 özetiyle adreslenir. Önbellek nesneleri modül
+# düzeyinde (süreç genelinde) tek olduğundan tüm Streamlit oturumları aynı sonuçları paylaşır;
+# oturumlar sonucun kendisini değil, bu anahtarı (tutamak) saklar.
+# Önbellekten dönen sonuçlar paylaşımlıdır; çağıranlar içlerindeki DataFrame'i değiştirmemelidir.
+#
+# Bellekte tutulan kayıtların toplam boyutu max_bayt ile sınırlanabilir. Sınır aşıldığında en eski
+# kayıtlar, diske_tasma açıksa sıkıştırılmış pickle dosyası olarak diske taşınır (yoksa atılır);
+# diskteki kayıt istendiğinde belleğe geri yüklenir. Disk de max_disk_bayt ile sınırlıdır. Taşma dizini
+# mkdtemp ile açılır ve çıkışta silinir; yalnızca bu sürecin yazdığı ve özeti tutulan dosyalar açılır.
+
+ONBELLEK_VARSAYILAN_BOYUT = 64
+SONUC_BELLEK_BUTCESI = 256 * 1024 ** 2  # Bayt
+SONUC_DISK_BUTCESI = 1024 ** 3  # Bayt
+
+
+def bellek_boyutu(deger):
+    """Önbellek kaydının yaklaşık bellek boyutu (bayt): DataFrame, NumPy dizisi, bayt ve iç içe kaplar."""
+    if isinstance(deger, dict):
+        return sys.getsizeof(deger) + sum(bellek_boyutu(v) for v in deger.values())
+    if isinstance(deger, (list, tuple)):
+        return sys.getsizeof(deger) + sum(bellek_boyutu(v) for v in deger)
+    if isinstance(deger, np.ndarray):
+        return deger.nbytes
+    if hasattr(deger, 'memory_usage'):  # pandas DataFrame / Series
+        return int(np.sum(deger.memory_usage(deep=True)))
+    return sys.getsizeof(deger)
+
+
+class SonucOnbellegi:
+    """Kayıt ve bayt sınırlı, LRU tahliyeli, isteğe bağlı diske taşan ve sayaçlı, iş parçacığı güvenli önbellek."""
+
+    def __init__(self, max_kayit=ONBELLEK_VARSAYILAN_BOYUT, max_bayt=None, diske_tasma=False, max_disk_bayt=SONUC_DISK_BUTCESI):
+        self.max_kayit = max_kayit
+        self.max_bayt = max_bayt
+        self.diske_tasma = diske_tasma
+        self.tasma_dizini = None  # İlk taşımada mkdtemp ile (yalnızca bu sürecin erişebileceği) açılır
+        self.max_disk_bayt = max_disk_bayt
+        self.isabet = 0
+        self.iskalama = 0
+        self.tahliye = 0
+        self.disk_isabet = 0
+        self.tasma = 0
+        self.bayt = 0
+        self.disk_bayt = 0
+        self._kayitlar = OrderedDict()
+        self._boyutlar = {}
+        self._diskte = OrderedDict()  # anahtar -> (dosya yolu, sıkıştırılmış boyut, SHA-256 özeti)
+        self._tasinan = {}  # anahtar -> diske yazılmakta olan değer (yazma bitene kadar buradan okunur)
+        self._kilit = threading.Lock()
+
+    # Kilit yalnızca sözlükler ve sayaçlar için tutulur. Serileştirme, sıkıştırma ve dosya işlemleri kilit
+    # dışında yapılır: kilitli yöntemler yapılacak disk işlerini döndürür, genel yöntemler onları kilidi
+    # bıraktıktan sonra yürütür.
+
+    def getir(self, anahtar):
+        with self._kilit:
+            if anahtar in self._kayitlar:
+                self._kayitlar.move_to_end(anahtar)
+                self.isabet += 1
+                return self._kayitlar[anahtar]
+            if anahtar in self._tasinan:
+                self.isabet += 1
+                return self._tasinan[anahtar]
+            disk = self._diskte.pop(anahtar, None)
+            if disk is None:
+                self.iskalama += 1
+                return None
+            self.disk_bayt -= disk[1]
+        deger = self._diskten_oku(*disk)
+        tasinacak = []
+        with self._kilit:
+            if deger is None:
+                self.iskalama += 1
+                return None
+            self.isabet += 1
+            self.disk_isabet += 1
+            if anahtar not in self._kayitlar:
+                tasinacak = self._ekle(anahtar, deger)
+        self._diske_tas(tasinacak)
+        return deger
+
+    def kaydet(self, anahtar, deger):
+        with self._kilit:
+            self._tasinan.pop(anahtar, None)
+            disk = self._diskte.pop(anahtar, None)
+            if disk is not None:
+                self.disk_bayt -= disk[1]
+            tasinacak = self._ekle(anahtar, deger)
+        if disk is not None:
+            _dosya_sil(disk[0])
+        self._diske_tas(tasinacak)
+
+    def getir_veya_hesapla(self, anahtar, hesapla):
+        """Kaydı döndürür; yoksa hesapla() ile üretip kaydeder."""
+        deger = self.getir(anahtar)
+        if deger is None:
+            deger = hesapla()
+            self.kaydet(anahtar, deger)
+        return deger
+
+    def boyut_ayarla(self, max_kayit=None, max_bayt=None):
+        with self._kilit:
+            if max_kayit is not None:
+                self.max_kayit = max_kayit
+            if max_bayt is not None:
+                self.max_bayt = max_bayt
+            tasinacak = self._sinira_indir()
+        self._diske_tas(tasinacak)
+
+    def temizle(self):
+        with self._kilit:
+            self._kayitlar.clear()
+            self._boyutlar.clear()
+            self._tasinan.clear()
+            silinecek = [yol for yol, _, _ in self._diskte.values()]
+            self._diskte.clear()
+            self.isabet = self.iskalama = self.tahliye = self.disk_isabet = self.tasma = self.bayt = self.disk_bayt = 0
+        for yol in silinecek:
+            _dosya_sil(yol)
+
+    def istatistikler(self):
+        with self._kilit:
+            toplam = self.isabet + self.iskalama
+            return {'kayit': len(self._kayitlar), 'max_kayit': self.max_kayit, 'isabet': self.isabet, 'iskalama': self.iskalama,
+                    'tahliye': self.tahliye, 'isabet_orani': self.isabet / toplam if toplam else 0.0,
+                    'bayt': self.bayt, 'max_bayt': self.max_bayt, 'disk_kayit': len(self._diskte), 'disk_bayt': self.disk_bayt,
+                    'disk_isabet': self.disk_isabet, 'tasma': self.tasma}
+
+    def _ekle(self, anahtar, deger):
+        self.bayt -= self._boyutlar.pop(anahtar, 0)
+        self._kayitlar[anahtar] = deger
+        self._kayitlar.move_to_end(anahtar)
+        if self.max_bayt is not None or self.diske_tasma:
+            self._boyutlar[anahtar] = bellek_boyutu(deger)
+            self.bayt += self._boyutlar[anahtar]
+        return self._sinira_indir()
+
+    def _sinira_indir(self):
+        """Sınırı aşan en eski kayıtları çıkarır; diske taşınacak (anahtar, değer) listesini döndürür."""
+        # Bayt sınırı en yeni kaydı da çıkarabilir (tek başına bütçeyi aşan kayıt); çağıran değeri zaten elinde tutar.
+        tasinacak = []
+        while len(self._kayitlar) > self.max_kayit or (self.max_bayt is not None and self.bayt > self.max_bayt and self._kayitlar):
+            anahtar, deger = self._kayitlar.popitem(last=False)
+            self.bayt -= self._boyutlar.pop(anahtar, 0)
+            if self.diske_tasma:
+                self._tasinan[anahtar] = deger
+                tasinacak.append((anahtar, deger))
+            else:
+                self.tahliye += 1
+        return tasinacak
+
+    def _dizin(self):
+        with self._kilit:
+            if self.tasma_dizini is None:
+                self.tasma_dizini = tempfile.mkdtemp(prefix='borc_plani_onbellek_')  # 0700, öngörülemeyen ad
+                atexit.register(shutil.rmtree, self.tasma_dizini, ignore_errors=True)
+            return self.tasma_dizini
+
+    def _diske_tas(self, tasinacak):
+        for anahtar, deger in tasinacak:
+            yol = None
+            try:
+                veri = zlib.compress(pickle.dumps(deger, protocol=pickle.HIGHEST_PROTOCOL), 1)
+                yol = os.path.join(self._dizin(), hashlib.sha256(str(anahtar).encode('utf-8')).hexdigest() + '.pkl.z')
+                fd, gecici = tempfile.mkstemp(dir=os.path.dirname(yol), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(veri)
+                os.replace(gecici, yol)
+            except (OSError, pickle.PicklingError, TypeError, AttributeError):
+                with self._kilit:
+                    if self._tasinan.get(anahtar) is deger:
+                        del self._tasinan[anahtar]
+                        self.tahliye += 1
+                continue
+            silinecek = []
+            with self._kilit:
+                if self._tasinan.get(anahtar) is not deger:
+                    silinecek.append(yol)  # Yazılırken yeniden kaydedildi ya da önbellek temizlendi
+                else:
+                    del self._tasinan[anahtar]
+                    self._diskte[anahtar] = (yol, len(veri), hashlib.sha256(veri).digest())
+                    self.disk_bayt += len(veri)
+                    self.tasma += 1
+                    while self.disk_bayt > self.max_disk_bayt and self._diskte:
+                        eski_yol, boyut, _ = self._diskte.popitem(last=False)[1]
+                        self.disk_bayt -= boyut
+                        self.tahliye += 1
+                        silinecek.append(eski_yol)
+            for eski_yol in silinecek:
+                _dosya_sil(eski_yol)
+
+    @staticmethod
+    def _diskten_oku(yol, boyut, ozet):
+        """Bu sürecin yazdığı taşma dosyasını okur ve siler; içerik yazılan özetle eşleşmezse açılmaz."""
+        try:
+            with open(yol, 'rb') as f:
+                veri = f.read()
+            deger = pickle.loads(zlib.decompress(veri)) if hashlib.sha256(veri).digest() == ozet else None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            deger = None
+        _dosya_sil(yol)
+        return deger
+
+
+def _dosya_sil(yol):
+    try:
+        os.remove(yol)
+    except OSError:
+        pass
+
+
+_simulasyon_onbellegi = SonucOnbellegi(max_bayt=SONUC_BELLEK_BUTCESI, diske_tasma=True)
+
+def simulasyon_onbellegi():
+    """Tüm oturumların paylaştığı süreç genelindeki sonuç önbelleğini döndürür."""
+    return _simulasyon_onbellegi
+
+KONTROL_NOKTASI_ONBELLEK_BOYUTU = 8  # Kayıtlar rapor tamponlarını da tuttuğu için küçük tutulur
+KONTROL_NOKTASI_BELLEK_BUTCESI = 128 * 1024 ** 2  # Bayt; bütçeyi tek başına aşan (çok kalemli) kayıt saklanmaz
+
+_kontrol_noktasi_onbellegi = SonucOnbellegi(KONTROL_NOKTASI_ONBELLEK_BOYUTU, max_bayt=KONTROL_NOKTASI_BELLEK_BUTCESI)
+
+def kontrol_noktasi_onbellegi():
+    """Vektörel motorun ay kontrol noktalarını (gelirler hariç girdi anahtarıyla) tutan önbelleği döndürür."""
+    return _kontrol_noktasi_onbellegi
+
+GELIR_TAKVIMI_ONBELLEK_BOYUTU = 32
+
+_gelir_takvimi_onbellegi = SonucOnbellegi(GELIR_TAKVIMI_ONBELLEK_BOYUTU)
+
+def gelir_takvimi_onbellegi():
+    """Derlenmiş gelir takvimlerini (Gelir kayıtları demetiyle) tutan önbelleği döndürür."""
+    return _gelir_takvimi_onbellegi
+
+
+def _normalize_girdi(deger):
+    """Girdiyi, aynı anlamdaki değerler için aynı JSON'u üretecek biçime getirir (int/float, NumPy, tarih, kayıt)."""
+    if isinstance(deger, _Kayit):
+        # Alan adları yerine sabit alan sırası: anahtar küçük kalır, sözlük anahtarları tek tek karşılaştırılmaz.
+        return [type(deger).__name__] + [_normalize_girdi(v) for v in deger.degerler()]
+    if isinstance(deger, dict):
+        return {str(k): _normalize_girdi(v) for k, v in deger.items()}
+    if isinstance(deger, (list, tuple)):
+        return [_normalize_girdi(v) for v in deger]
+    if isinstance(deger, np.generic):
+        deger = deger.item()
+    if deger is None or isinstance(deger, (bool, str)):
+        return deger
+    if isinstance(deger, (int, float)):
+        return float(deger)
+    if isinstance(deger, date):
+        return deger.isoformat()
+    return repr(deger)
+
+
+def onbellek_anahtari(islem, borclar, gelirler, manuel_oncelikler, sim_params, *ekler):
+    """Simülasyon girdilerinin kararlı (oturumdan ve sözlük sırasından bağımsız) özetini döndürür."""
+    # Motor ve profilleme seçimi sonucu değiştirmez; manuel öncelikler yalnızca 'Kullanici' stratejisinde etkilidir.
+    params = {k: v for k, v in sim_params.items() if k not in ('motor', 'profilleme')}
+    if params.get('oncelik_stratejisi') != 'Kullanici' and islem != 'simule_senaryo_izgarasi':
+        manuel_oncelikler = {}
+    girdi = _normalize_girdi([islem, borclar, gelirler, manuel_oncelikler, params, list(ekler)])
+    return hashlib.sha256(json.dumps(girdi, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _onbellekli(islem, anahtar_girdileri, hesapla):
+    """Sonucu önbellekte arar; yoksa hesaplayıp kaydeder. Dönen sözlük/liste çağırana ait bir kopyadır."""
+    onbellek = simulasyon_onbellegi()
+    anahtar = onbellek_anahtari(islem, *anahtar_girdileri)
+    sonuc = onbellek.getir(anahtar)
+    if sonuc is None:
+        sonuc = hesapla()
+        onbellek.kaydet(anahtar, sonuc)
+    if isinstance(sonuc, list):
+        return [dict(r) for r in sonuc]
+    return dict(sonuc)
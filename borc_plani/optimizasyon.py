@@ -0,0 +1,87 @@
+"""Manuel (Kullanıcı Tanımlı) strateji için ödeme sırası optimizasyonu."""
+
+from .kayitlar import borc_kayitlari, gelir_kayitlari
+from .sabitler import GIDER_KURALLARI, STRATEJILER
+from .simulasyon import _vektorel_simulasyon
+
+
+# Faizli borçların kapatma sırası (ve istenirse agresiflik) yerel aramayla iyileştirilir. Her turda
+# mevcut sıranın tüm "bir borcu başka bir konuma taşı" komşuları tek vektörel geçişte simüle edilir;
+# o ana kadarki en iyi sonucun faizini (ya da süresini) aşan komşular sınırla erken kesilir.
+# Permütasyonlar tek tek denenmediği için 15-20 faizli borç birkaç turda çözülür.
+
+OPTIMIZASYON_HEDEFLERI = {"En Düşük Toplam Faiz": "toplam_faiz", "En Kısa Süre": "ay_sayisi"}
+
+
+def _optimizasyon_puani(ozet, hedef):
+    """Küçük olan daha iyidir: önce 30 yılı aşmamak, sonra kesilmemiş olmak, sonra hedef, sonra diğer ölçüt."""
+    diger = 'ay_sayisi' if hedef == 'toplam_faiz' else 'toplam_faiz'
+    return (ozet['limit_asimi'], ozet.get('kesildi', False), ozet[hedef], ozet[diger])
+
+
+def optimize_odeme_sirasi(borclar, gelirler, sim_params, hedef='toplam_faiz', agresiflik_ara=False, mevcut_oncelikler=None, max_tur=100):
+    """'Kullanici' stratejisi için toplam faizi (ya da süreyi) en aza indiren borç sırasını arar.
+
+    manuel_oncelik_listesi biçiminde öncelikleri (1001, 1002, ...), seçilen agresifliği, en iyi ve
+    başlangıç özetlerini, tur ve değerlendirilen senaryo sayısını döndürür.
+    """
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    isimler = list(dict.fromkeys(b.isim for b in borclar if b.kural not in GIDER_KURALLARI))
+    if not isimler or not gelirler:
+        return None
+
+    params = {**sim_params, 'oncelik_stratejisi': 'Kullanici'}
+    mevcut_agresiflik = params.get('agresiflik_carpan', 1.0)
+    agresiflikler = sorted(set(STRATEJILER.values()) | {mevcut_agresiflik}) if agresiflik_ara else [mevcut_agresiflik]
+
+    def degerlendir(adaylar, en_iyi=None):
+        sinir = {}
+        if en_iyi is not None and not en_iyi['limit_asimi']:
+            sinir = {'faiz_siniri': en_iyi['toplam_faiz'] + 0.5} if hedef == 'toplam_faiz' else {'ay_siniri': en_iyi['ay_sayisi']}
+        senaryolar = [{'manuel_oncelikler': {isim: 1001 + k for k, isim in enumerate(sira)}, 'agresiflik_carpan': agresiflik} for sira, agresiflik in adaylar]
+        return _vektorel_simulasyon(borclar, gelirler, {}, senaryolar, **sinir, **params)
+
+    # --- Başlangıç adayları: mevcut sıra, Avalanche, Snowball ve kayıtlı öncelikler ---
+    ilk_kalemler = {}
+    for b in borclar:
+        ilk_kalemler.setdefault(b.isim, b)
+    mevcut_oncelikler = mevcut_oncelikler or {}
+    baslangic_siralari = [
+        sorted(isimler, key=lambda i: mevcut_oncelikler.get(i, ilk_kalemler[i].oncelik)),
+        sorted(isimler, key=lambda i: (-ilk_kalemler[i].faiz_aylik, -ilk_kalemler[i].tutar)),
+        sorted(isimler, key=lambda i: ilk_kalemler[i].tutar),
+        sorted(isimler, key=lambda i: ilk_kalemler[i].oncelik),
+    ]
+    adaylar = list(dict.fromkeys((tuple(sira), agresiflik) for sira in baslangic_siralari for agresiflik in agresiflikler))
+    ozetler = degerlendir(adaylar)
+    baslangic = ozetler[adaylar.index((tuple(baslangic_siralari[0]), mevcut_agresiflik))]
+    en_iyi_aday, en_iyi = min(zip(adaylar, ozetler), key=lambda x: _optimizasyon_puani(x[1], hedef))
+    degerlendirilen, tur = len(adaylar), 0
+
+    # --- Yerel arama: taşıma komşuları + agresiflik değişimleri, en iyi iyileşmeye geç ---
+    while tur < max_tur:
+        tur += 1
+        sira, agresiflik = en_iyi_aday
+        komsular = {}
+        for i in range(len(sira)):
+            kalan = sira[:i] + sira[i + 1:]
+            for j in range(len(sira)):
+                if j != i:
+                    komsular[(kalan[:j] + (sira[i],) + kalan[j:], agresiflik)] = None
+        for diger_agresiflik in agresiflikler:
+            if diger_agresiflik != agresiflik:
+                komsular[(sira, diger_agresiflik)] = None
+        komsular = list(komsular)
+        if not komsular:
+            break
+
+        ozetler = degerlendir(komsular, en_iyi)
+        degerlendirilen += len(komsular)
+        aday, ozet = min(zip(komsular, ozetler), key=lambda x: _optimizasyon_puani(x[1], hedef))
+        if _optimizasyon_puani(ozet, hedef) >= _optimizasyon_puani(en_iyi, hedef):
+            break
+        en_iyi_aday, en_iyi = aday, ozet
+
+    sira, agresiflik = en_iyi_aday
+    return {'manuel_oncelikler': {isim: 1001 + k for k, isim in enumerate(sira)}, 'agresiflik_carpan': agresiflik,
+            'ozet': en_iyi, 'baslangic': baslangic, 'tur': tur, 'degerlendirilen': degerlendirilen}
@@ -0,0 +1,62 @@
+"""Simülasyon ve rapor aşamaları için süre / çağrı / bellek profilleme."""
+
+import time
+import tracemalloc
+
+# Motorlar her aşamanın sonunda tur(ad) çağırır; önceki turdan bu yana geçen süre o aşamaya yazılır.
+# Profilleme kapalıyken tur, hiçbir şey yapmayan _tur_yok fonksiyonudur (aşama başına tek çağrı).
+
+PROFILLEME_KIPLERI = {"Kapalı": None, "Süre ve Çağrı Sayısı": "sure", "Süre + Bellek (tracemalloc)": "bellek"}
+
+def _tur_yok(ad):
+    pass
+
+class AsamaProfili:
+    """Aşama başına toplam süre, çağrı sayısı ve (bellek kipinde) tracemalloc ayırma istatistiklerini biriktirir."""
+
+    def __init__(self, kip='sure'):
+        self.bellek = kip == 'bellek'
+        self.asamalar = {}
+        self._tracemalloc_bizde = False
+        self._son_bellek = 0
+        self._son = None
+
+    @classmethod
+    def olustur(cls, sim_params):
+        """sim_params['profilleme'] açıksa başlatılmış bir profil, değilse None döndürür."""
+        kip = sim_params.get('profilleme')
+        return cls(kip).baslat() if kip else None
+
+    def baslat(self):
+        if self.bellek:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_bizde = True
+            tracemalloc.reset_peak()
+            self._son_bellek = tracemalloc.get_traced_memory()[0]
+        self._son = time.perf_counter()
+        return self
+
+    def tur(self, ad):
+        kayit = self.asamalar.setdefault(ad, {'sure': 0.0, 'cagri': 0, 'net_bellek': 0, 'tepe_bellek': 0})
+        kayit['sure'] += time.perf_counter() - self._son
+        kayit['cagri'] += 1
+        if self.bellek:
+            guncel, tepe = tracemalloc.get_traced_memory()
+            kayit['net_bellek'] += guncel - self._son_bellek
+            kayit['tepe_bellek'] = max(kayit['tepe_bellek'], tepe - self._son_bellek)
+            tracemalloc.reset_peak()
+            self._son_bellek = guncel
+        # Profilin kendi maliyeti bir sonraki aşamaya yazılmaz.
+        self._son = time.perf_counter()
+
+    def bitir(self):
+        """tracemalloc'u (bu profil başlattıysa) durdurur ve aşama tablosunu döndürür."""
+        if self._tracemalloc_bizde:
+            tracemalloc.stop()
+            self._tracemalloc_bizde = False
+        toplam = sum(k['sure'] for k in self.asamalar.values()) or 1.0
+        return [{'Aşama': ad, 'Süre (ms)': k['sure'] * 1000, 'Pay (%)': 100 * k['sure'] / toplam, 'Çağrı': k['cagri'],
+                 'Çağrı Başına (µs)': 1e6 * k['sure'] / k['cagri'],
+                 **({'Net Bellek (KB)': k['net_bellek'] / 1024, 'Tepe Bellek (KB)': k['tepe_bellek'] / 1024} if self.bellek else {})}
+                for ad, k in self.asamalar.items()]
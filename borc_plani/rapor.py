@@ -0,0 +1,67 @@
+"""Aylık rapor tamponları ve detay tablosu."""
+
+import numpy as np
+
+from .sabitler import GIDER_KURALLARI
+
+# Aylık rapor, her iki motorun da doldurduğu önceden ayrılmış tipli sütun tamponlarında tutulur
+# (satır = ay, sütun = başlangıç kalemi / slot). Kalemler isimle aranmaz, slot indeksine yazılır.
+
+def _rapor_tamponu(borclar_initial, ay_limiti=360):
+    """Aylık rapor için boş sütun tamponlarını oluşturur."""
+    n = len(borclar_initial)
+    tampon = {'ay_adlari': [], 'gelir': np.zeros(ay_limiti), 'guc': np.zeros(ay_limiti), 'birikim': np.zeros(ay_limiti),
+              'listede': np.zeros((ay_limiti, n), dtype=bool)}
+    for anahtar in ['kalan', 'kalan_ay', 'ek_odeme', 'faiz', 'anapara_min', 'taksit']:
+        tampon[anahtar] = np.zeros((ay_limiti, n))
+    return tampon
+
+def _rapor_etiketleri(borclar):
+    """Kalem isimlerinden sütun etiketleri üretir; tekrarlanan isimler '#2', '#3' ile ayrılır."""
+    sayac = {}
+    etiketler = []
+    for b in borclar:
+        sayac[b.isim] = sayac.get(b.isim, 0) + 1
+        etiketler.append(b.isim if sayac[b.isim] == 1 else f"{b.isim} #{sayac[b.isim]}")
+    return etiketler
+
+def _rapor_df(borclar_initial, rapor):
+    """Tamponlardan aylık detay DataFrame'ini ve '(Kalan)' sütunlarıyla aynı şekilli tamamlanma maskesini üretir."""
+    import pandas as pd  # Yalnızca aylık detay istendiğinde yüklenir
+
+    m = len(rapor['ay_adlari'])
+    faizli = np.array([b.kural not in GIDER_KURALLARI for b in borclar_initial], dtype=bool)
+
+    kalan = np.rint(rapor['kalan'][:m])
+    # Faizli borç: bakiye 1 TL'ye indiğinde; gider: kalan ayı bittiğinde; ikisi de: listeden çıktığında tamamlanır.
+    tamamlandi = ~rapor['listede'][:m] | np.where(faizli, kalan <= 1, rapor['kalan_ay'][:m] <= 0)
+    kalan = np.where(tamamlandi, 0, kalan).astype(np.int64)
+
+    # Detaylar, kalem ay sonunda listede olduğu aylarda yazılır; listeden çıktığı (kapanış) ayında ve sonrasında 0'dır.
+    # Giderin taksiti, ay sonunda kalan ayı bitmişse de 0 gösterilir.
+    listede = rapor['listede'][:m]
+    gider_suruyor = listede & (rapor['kalan_ay'][:m] > 0)
+
+    def tam_sayi(anahtar, slot, gorunur):
+        return np.where(gorunur[:, slot], np.rint(rapor[anahtar][:m, slot]), 0).astype(np.int64)
+
+    kolonlar = {
+        'Ay': rapor['ay_adlari'],
+        'Toplam Gelir': np.rint(rapor['gelir'][:m]).astype(np.int64),
+        'Ek Ödeme Gücü': np.rint(rapor['guc'][:m]).astype(np.int64),
+        'Toplam Birikim': np.rint(rapor['birikim'][:m]).astype(np.int64),
+    }
+    maske = {}
+
+    for slot, etiket in enumerate(_rapor_etiketleri(borclar_initial)):
+        kolonlar[f'{etiket} (Kalan)'] = kalan[:, slot]
+        maske[f'{etiket} (Kalan)'] = tamamlandi[:, slot]
+        # --- EXCEL İÇİN GEREKLİ DETAYLAR --- (Streamlit'te gizli)
+        if faizli[slot]:
+            kolonlar[f'{etiket} (Ek Ödeme)'] = tam_sayi('ek_odeme', slot, listede)
+            kolonlar[f'{etiket} (Faiz)'] = tam_sayi('faiz', slot, listede)
+            kolonlar[f'{etiket} (Anapara Min)'] = tam_sayi('anapara_min', slot, listede)
+        else:
+            kolonlar[f'{etiket} (Taksit/Gider)'] = tam_sayi('taksit', slot, gider_suruyor)
+
+    return pd.DataFrame(kolonlar), pd.DataFrame(maske, index=range(m), dtype=bool)
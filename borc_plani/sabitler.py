@@ -0,0 +1,41 @@
+"""Strateji, motor ve kural sabitleri."""
+
+STRATEJILER = {
+    "Minimum Çaba (Minimum Ek Ödeme)": 0.0,
+    "Temkinli (Yüzde 50)": 0.5,
+    "Maksimum Çaba (Tüm Ek Ödeme)": 1.0, 
+    "Aşırı Çaba (x1.5 Ek Ödeme)": 1.5,
+}
+
+ONCELIK_STRATEJILERI = {
+    "Borç Çığı (Avalanche - Önce Faiz)": "Avalanche",
+    "Borç Kartopu (Snowball - Önce Tutar)": "Snowball",
+    "Kullanıcı Tanımlı Sıra": "Kullanici"
+}
+
+SIMULASYON_MOTORLARI = {
+    "Standart (Python Döngüsü)": "dongu",
+    "Hızlı (NumPy Vektörel)": "numpy",
+    "Olay Güdümlü (Sessiz Ayları Atlar)": "olay",
+}
+
+# Senaryo ızgarasında (tüm strateji kombinasyonları) denenen faiz oranı çarpanları
+FAIZ_CARPANI_IZGARASI = [0.8, 1.0, 1.2]
+
+# min_kural değerlerinin tamsayı kodları; Borc kayıtları kuralı bu kodla taşır, JSON'da adı saklanır.
+KURAL_KODLARI = {
+    'SABIT_GIDER': 1,
+    'SABIT_TAKSIT_GIDER': 2,
+    'SABIT_TAKSIT_ANAPARA': 3,
+    'ASGARI_FAIZ': 4,
+    'FAIZ_ART_ANAPARA': 5,
+    'FAIZ': 6,
+}
+KURAL_ADLARI = {kod: ad for ad, kod in KURAL_KODLARI.items()}
+
+GIDER_KURALLARI = (1, 2)  # Faizsiz, ek ödeme almayan giderler
+SABIT_ODEMELI_KURALLAR = (1, 2, 3)  # Min ödemesi sabit taksit olanlar
+FAIZ_EKLENEN_KURALLAR = (5, 6)  # Faizi bakiyeye eklenenler (KMH / Diğer)
+
+# Türkiye için varsayılan yasal limitler ve oranlar (Yönetici Kuralları sekmesinde değiştirilebilir)
+VARSAYILAN_TR_PARAMS = {'kk_taksit_max_ay': 12, 'kk_asgari_odeme_yuzdesi_default': 20.0, 'kk_aylik_akdi_faiz': 3.66, 'kk_aylik_gecikme_faiz': 3.96, 'kmh_aylik_faiz': 5.0, 'kredi_taksit_max_ay': 36}
@@ -0,0 +1,743 @@
+"""Ödeme planı simülasyonu: döngü motoru, vektörel (NumPy) motor, olay güdümlü kip ve senaryo ızgarası."""
+
+import heapq
+from datetime import date
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from .isler import ay_bildirimi
+from .onbellek import _onbellekli, kontrol_noktasi_onbellegi, onbellek_anahtari
+from .profil import AsamaProfili, _tur_yok
+from .rapor import _rapor_df, _rapor_tamponu
+from .kayitlar import Borc, borc_kayitlari, gelir_kayitlari
+from .sabitler import FAIZ_CARPANI_IZGARASI, FAIZ_EKLENEN_KURALLAR, GIDER_KURALLARI, KURAL_KODLARI, ONCELIK_STRATEJILERI, SABIT_ODEMELI_KURALLAR, STRATEJILER
+from .takvim import gelir_takvimi
+from .yardimcilar import hesapla_min_odeme
+
+
+def simule_borc_planı(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params):
+    """Ödeme planını simüle eder; aynı girdilerle yapılmış bir çalıştırmanın sonucunu önbellekten döndürür.
+
+    sim_params['profilleme'] açıksa önbellek atlanır ve sonuç, aşama tablosunu 'profil' anahtarında taşır.
+    """
+    
+    if not borclar_initial or not gelirler_initial:
+        return None
+
+    borclar_initial, gelirler_initial = borc_kayitlari(borclar_initial), gelir_kayitlari(gelirler_initial)
+    if sim_params.get('profilleme'):
+        return _simule_borc_planı_hesapla(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params)
+
+    return _onbellekli('simule_borc_planı', (borclar_initial, gelirler_initial, manuel_oncelikler, sim_params),
+                       lambda: _simule_borc_planı_hesapla(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params))
+
+def _simule_borc_planı_hesapla(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params):
+    """sim_params['motor'] değerine göre döngü veya vektörel motoru (önbelleksiz) çalıştırır."""
+    borclar_initial, gelirler_initial = borc_kayitlari(borclar_initial), gelir_kayitlari(gelirler_initial)
+    if sim_params.get('motor') in ['numpy', 'olay']:
+        return _simule_borc_planı_numpy(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params)
+    return _simule_borc_planı_dongu(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params)
+
+class _BorcDurumu:
+    """Döngü motorunda bir kalemin ay ay değişen alanları; sabit alanlar paylaşılan Borc kaydından okunur."""
+
+    __slots__ = ('kayit', 'tutar', 'kalan_ay', 'oncelik', 'slot')
+
+    def __init__(self, kayit, slot=None):
+        self.kayit = kayit
+        self.tutar = kayit.tutar
+        self.kalan_ay = kayit.kalan_ay
+        self.oncelik = kayit.oncelik
+        self.slot = slot
+
+
+# Ek ödeme sırası: stratejinin anahtarı, eşitlikte kalemin başlangıç listesindeki yeri (slot). Yığın
+# elemanları (anahtar..., slot, durum) düz demetleridir; slot tekil olduğundan durum hiç karşılaştırılmaz.
+# Anahtarlar yalnızca faizli borçlar için hesaplanır; giderler ve kapanmış borçlar sıralamaya hiç girmez.
+_SALDIRI_YIGINLARI = {
+    'Avalanche': lambda borclar: [(-b.kayit.faiz_aylik, -b.tutar, b.slot, b) for b in borclar if b.tutar > 1],
+    'Snowball': lambda borclar: [(b.tutar, b.slot, b) for b in borclar if b.tutar > 1],
+    'Kullanici': lambda borclar: [(b.oncelik, b.slot, b) for b in borclar if b.tutar > 1],
+}
+
+
+def _simule_borc_planı_dongu(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params):
+
+    # Sim_params'tan zorunlu parametreleri çek
+    total_birikim_hedefi = sim_params.get('total_birikim_hedefi', 0.0)
+    birikim_tipi_str = sim_params.get('birikim_tipi_str', 'Aylık Sabit Tutar')
+    baslangic_tarihi = sim_params.get('baslangic_tarihi', date.today()) 
+
+    profil = AsamaProfili.olustur(sim_params)
+    tur = profil.tur if profil else _tur_yok
+    ay_bildir = ay_bildirimi()
+
+    # Girdi kayıtları kopyalanmaz: değişen bakiye, kalan ay ve öncelik her kalemin _BorcDurumu'nda tutulur.
+    # Raporlama, kalemin başlangıç listesindeki yerine (slot) yazılır; "Serbest Kalan" giderlerinin slotu yoktur.
+    mevcut_borclar = [_BorcDurumu(borc, slot) for slot, borc in enumerate(borclar_initial)]
+    faizli_borclar = [borc for borc in mevcut_borclar if borc.kayit.kural not in GIDER_KURALLARI]
+    saldiri_yigini = _SALDIRI_YIGINLARI.get(sim_params.get('oncelik_stratejisi'), _SALDIRI_YIGINLARI['Kullanici'])
+    
+    if sim_params.get('oncelik_stratejisi') == 'Kullanici':
+        for borc in mevcut_borclar:
+            if borc.kayit.kural not in GIDER_KURALLARI and borc.kayit.isim in manuel_oncelikler:
+                borc.oncelik = manuel_oncelikler[borc.kayit.isim]
+    
+    ay_sayisi = 0
+    mevcut_birikim = sim_params.get('baslangic_birikim', 0.0)
+    birikime_ayrilan = sim_params.get('aylik_zorunlu_birikim', 0.0)
+    faiz_carpani = sim_params.get('faiz_carpani', 1.0)
+    agresiflik_carpan = sim_params.get('agresiflik_carpan', 1.0)
+    birikim_artis_aylik = sim_params.get('birikim_artis_aylik', 0.0) / 12 / 100
+    
+    toplam_faiz_maliyeti = 0.0
+    baslangic_faizli_borc = sum(b.tutar for b in borclar_initial if b.kural not in GIDER_KURALLARI)
+    
+    rapor = _rapor_tamponu(borclar_initial)
+    
+    limit_asimi = False
+    gelir_vektoru = gelir_takvimi(gelirler_initial).toplam.tolist()
+    tur('hazirlik')
+    
+    while True:
+        ay_sayisi += 1
+        
+        # Gerçek Tarihi Hesapla
+        rapor_tarihi = baslangic_tarihi + relativedelta(months=ay_sayisi - 1)
+        ay_adi = rapor_tarihi.strftime("%b %Y") # Örn: Oct 2025
+        
+        # --- Bitiş Kontrolleri ---
+        borc_tamamlandi = not any(b.tutar > 1 for b in mevcut_borclar if b.kayit.kural not in GIDER_KURALLARI)
+        
+        if birikim_tipi_str == "Borç Bitimine Kadar Toplam Tutar":
+            birikim_hedefi_tamamlandi = mevcut_birikim >= total_birikim_hedefi
+        else:
+            birikim_hedefi_tamamlandi = True
+
+        if ay_sayisi > 1 and borc_tamamlandi and birikim_hedefi_tamamlandi:
+            break
+        
+        if ay_sayisi > 360:
+            limit_asimi = True
+            break
+
+        satir = ay_sayisi - 1
+        ay_bildir(ay_sayisi)
+        tur('ay_basi')
+        
+        # --- Gelir (profil başına bir kez derlenen takvimden) ---
+        toplam_gelir = gelir_vektoru[satir]
+        tur('gelir')
+
+        # --- Giderlerin Kapanması ve Yeniden Atanması ---
+        
+        zorunlu_gider_toplam = birikime_ayrilan
+        min_borc_odeme_toplam = 0.0
+        
+        aktif_borclar_sonraki_ay = []
+        serbest_kalan_nakit_bu_ay = 0.0
+        kapanan_giderler_listesi = []
+        aylik_kapanan_borclar = [] 
+
+        for borc in mevcut_borclar:
+            kayit = borc.kayit
+            min_odeme_miktar = hesapla_min_odeme(kayit, faiz_carpani, borc.tutar)
+            is_sureli_gider = kayit.kural in SABIT_ODEMELI_KURALLAR and borc.kalan_ay < 99999
+            
+            if kayit.kural in GIDER_KURALLARI:
+                zorunlu_gider_toplam += min_odeme_miktar
+                if borc.slot is not None:
+                    rapor['taksit'][satir, borc.slot] = min_odeme_miktar
+                
+            else: # Faizli Borçlar (KK, KMH, Kredi, Diğer)
+                min_borc_odeme_toplam += min_odeme_miktar
+                
+                etkilenen_faiz_orani = kayit.faiz_aylik * faiz_carpani
+                eklenen_faiz = borc.tutar * etkilenen_faiz_orani
+                
+                # KRİTİK FİNANSAL MANTIK: KMH/Diğer'de faiz borcun üzerine eklenir (KK'da eklenmez).
+                if kayit.kural in FAIZ_EKLENEN_KURALLAR:
+                    borc.tutar += eklenen_faiz 
+                
+                toplam_faiz_maliyeti += eklenen_faiz 
+                
+                # Min Ödeme Çıkarma
+                borc.tutar -= min_odeme_miktar
+                
+                rapor['faiz'][satir, borc.slot] = eklenen_faiz
+                # Anapara Min Ödeme: Ödenen Min Tutar - Faiz (KK/Kredi için)
+                rapor['anapara_min'][satir, borc.slot] = min_odeme_miktar - eklenen_faiz if (min_odeme_miktar - eklenen_faiz) > 0 else 0
+
+
+            # Giderlerin Kapanması ve Yeniden Atanması
+            if is_sureli_gider:
+                if borc.kalan_ay == 1:
+                    odenen_miktar = kayit.sabit_taksit
+                    devam_yuzdesi = kayit.devam_etme_yuzdesi
+                    serbest_kalan_nakit_bu_ay += odenen_miktar * (1 - devam_yuzdesi)
+                    devam_eden_miktar = odenen_miktar * devam_yuzdesi
+                    
+                    if devam_eden_miktar > 0:
+                        yeni_gider = Borc(isim=f"Serbest Kalan Harcama ({kayit.isim})", kural=KURAL_KODLARI['SABIT_GIDER'], oncelik=1, sabit_taksit=devam_eden_miktar, devam_etme_yuzdesi=1.0)
+                        aktif_borclar_sonraki_ay.append(_BorcDurumu(yeni_gider))
+                        
+                    kapanan_giderler_listesi.append(kayit.isim)
+                else:
+                    borc.kalan_ay -= 1
+                    aktif_borclar_sonraki_ay.append(borc)
+            else:
+                aktif_borclar_sonraki_ay.append(borc)
+                
+        mevcut_borclar = aktif_borclar_sonraki_ay
+        if kapanan_giderler_listesi:
+            faizli_borclar = [borc for borc in mevcut_borclar if borc.kayit.kural not in GIDER_KURALLARI]
+        tur('min_odeme_faiz')
+        
+        # --- Saldırı Gücü Hesaplama ---
+        if ay_sayisi == 1:
+            ilk_ay_toplam_gelir = toplam_gelir
+            # NOT: Toplam giderler kaldırıldığı için ilk_ay_toplam_gider'i zorunlu ödemelerden hesaplıyoruz
+            ilk_ay_toplam_gider = zorunlu_gider_toplam + min_borc_odeme_toplam
+
+        kalan_nakit = toplam_gelir - zorunlu_gider_toplam - min_borc_odeme_toplam
+        saldırı_gucu = max(0, kalan_nakit * agresiflik_carpan)
+        saldırı_gucu += serbest_kalan_nakit_bu_ay 
+
+        # --- Ek Ödeme / Borç Saldırısı ---
+        saldırı_kalan = saldırı_gucu
+        
+        # Önceliklendirme: bakiyesi 1 TL'yi aşan faizli borçların yığını. Min ödemeler her bakiyeyi değiştirdiği
+        # için yığın her ay O(f) ile yeniden kurulur; saldırı yalnızca tepedeki (kapanan borç kadar) kalemi çeker.
+        yigin = saldiri_yigini(faizli_borclar)
+        heapq.heapify(yigin)
+        tur('siralama')
+
+        while yigin and saldırı_kalan > 0:
+            borc = yigin[0][-1]
+            odecek_tutar = min(saldırı_kalan, borc.tutar)
+            borc.tutar -= odecek_tutar
+            saldırı_kalan -= odecek_tutar
+            rapor['ek_odeme'][satir, borc.slot] = odecek_tutar
+            
+            if borc.tutar <= 1:
+                aylik_kapanan_borclar.append(borc.kayit.isim)
+                borc.tutar = 0
+                heapq.heappop(yigin)
+
+        
+        # --- Birikim Güncelleme ---
+        mevcut_birikim += saldırı_kalan 
+        mevcut_birikim *= (1 + birikim_artis_aylik)
+        tur('ek_odeme')
+
+        
+        # --- DETAYLI RAPORLAMA (Her Kalem Ayrı Sütun, slot indeksli tamponlara) ---
+        rapor['ay_adlari'].append(ay_adi)
+        rapor['gelir'][satir] = toplam_gelir
+        rapor['guc'][satir] = saldırı_gucu
+        rapor['birikim'][satir] = mevcut_birikim
+
+        for borc in mevcut_borclar:
+            if borc.slot is not None:
+                rapor['listede'][satir, borc.slot] = True
+                rapor['kalan'][satir, borc.slot] = borc.tutar
+                rapor['kalan_ay'][satir, borc.slot] = borc.kalan_ay
+        tur('rapor')
+
+    df_detay, tamamlandi = _rapor_df(borclar_initial, rapor)
+    tur('df')
+    
+    sonuc = {"df": df_detay, "tamamlandi": tamamlandi, "ay_sayisi": ay_sayisi, "toplam_faiz": round(toplam_faiz_maliyeti), "toplam_birikim": round(mevcut_birikim), "baslangic_faizli_borc": round(baslangic_faizli_borc), "ilk_ay_gelir": ilk_ay_toplam_gelir if 'ilk_ay_toplam_gelir' in locals() else 0, "ilk_ay_gider": ilk_ay_toplam_gider if 'ilk_ay_toplam_gider' in locals() else 0, "limit_asimi": limit_asimi}
+    if profil:
+        sonuc['profil'] = profil.bitir()
+    return sonuc
+
+# --- Vektörel (NumPy) Simülasyon Motoru ---
+#
+# simule_borc_planı(..., motor='numpy') ile seçilir ve döngü motoruyla aynı df, toplam_faiz,
+# ay_sayisi ve toplam_birikim değerlerini üretir. Her kalem paralel dizilerde bir "slot"tur;
+# kapanan süreli giderin devam eden kısmı aynı slotta SABIT_GIDER'e dönüşür, böylece döngü
+# motorundaki liste (slot) sırası birebir korunur. Ek ödeme sırası her ay stratejinin anahtarı ve
+# eşitlikte slot numarasıyla kurulur. Toplamlar ve saldırı gücü şelalesi, aynı yuvarlama hatalarını
+# üretmek için sıralı birikimli (accumulate) işlemlerle alınır.
+#
+# Aynı çekirdek birden çok senaryoyu tek ay döngüsünde yürütür (senaryo x slot dizileri):
+# gelir takvimi, gider kapanışları ve kural dizileri paylaşılır; senaryoya özgü olanlar
+# bakiyeler, liste sırası, faiz toplamı ve birikimdir.
+#
+# Ölçüm (tek çekirdek, 360 ayın tamamı, Avalanche, yarısı faizli borç yarısı sabit gider):
+#   50 kalem:  döngü ~0.17 sn -> numpy ~0.08 sn
+#   200 kalem: döngü ~0.96 sn -> numpy ~0.10 sn
+#   500 kalem: döngü ~4.5 sn  -> numpy ~0.25 sn
+#
+# Olay güdümlü kip (motor='olay', tek senaryo) olaysız ayları kapalı biçimde atlar; 30 yıllık 2 kredili
+# konut profilinde özet ~0.07 sn -> ~0.005 sn. Bakiyeler 1e9'u aşıp kontrolsüz büyümedikçe aylık satırlar
+# numpy motoruyla birebir aynıdır; aşan profillerde toplamlar ~1e-14 göreli farkla yuvarlanabilir.
+
+STRATEJI_KODLARI = {'Avalanche': 0, 'Snowball': 1, 'Kullanici': 2}
+KONTROL_NOKTASI_ARALIGI = 12  # Ay
+
+
+def _satir_toplami(baslangic, degerler):
+    """Her satırı `toplam += x` döngüsüyle aynı sırada (ve aynı yuvarlamayla) toplar."""
+    return np.add.accumulate(np.concatenate((baslangic[:, None], degerler), axis=1), axis=1)[:, -1]
+
+
+def _dogrusal_yineleme(x0, carpan, ekler):
+    """x[k+1] = carpan * x[k] + ekler[k] yinelemesini kapalı biçimde çözer; x[0..L] dizisini döndürür."""
+    kuvvet = carpan ** np.arange(len(ekler) + 1)
+    return kuvvet * (x0 + np.concatenate(([0.0], np.cumsum(ekler / kuvvet[1:]))))
+
+
+def _sessiz_donem(ay_sayisi, ufuk, tutar, sira, kalan_ay, aktif, gider, sabit, faiz_ekle, faiz_orani, faiz_carpani, min_oran, taksit, oncelik,
+                  strateji, agresiflik, zorunlu_gider, birikim, birikim_artis, toplam_hedefli, birikim_hedefi, gelir_vektoru, gelir_olaylari):
+    """Tek senaryoda ay_sayisi'ndan başlayan olaysız ayları kapalı biçimde hesaplar.
+
+    Dönem; gelir başlangıcı, süreli gider bitişi, saldırı hedefinin kapanması, sıralama değişimi,
+    ödeme gücünün sıfıra inmesi veya simülasyonun bitmesiyle sona erer. Atlanacak ay yoksa None,
+    varsa ay başı bakiyeleri ve raporlama için aylık dizileri içeren sözlüğü döndürür.
+    """
+    sureli = aktif & sabit & (kalan_ay < 99999)
+    uzunluk = min(ufuk, 361 - ay_sayisi)
+    if sureli.any():
+        uzunluk = min(uzunluk, int(kalan_ay[sureli].min()) - 1)
+    sonraki_gelirler = [ay for ay in gelir_olaylari if ay >= ay_sayisi]
+    if sonraki_gelirler:
+        uzunluk = min(uzunluk, sonraki_gelirler[0] - ay_sayisi)
+    if uzunluk < 2:
+        return None
+
+    # Saldırı almayan her faizli kalem: T[k+1] = g * T[k] - c (faiz eklenir, min ödeme düşülür); diğer slotlar sabittir.
+    faizli = aktif & ~gider
+    k = np.arange(uzunluk + 1)[:, None]
+    g = np.where(faizli, 1 + np.where(faiz_ekle, faiz_orani * faiz_carpani, 0.0) - min_oran, 1.0)
+    c = np.where(faizli & sabit, taksit, 0.0)
+    kuvvet = g ** k
+    T = kuvvet * tutar - c * np.where(g == 1, k, (kuvvet - 1) / np.where(g == 1, 1.0, g - 1))
+    saldiri_oncesi = T[1:].copy()  # Min ödeme sonrası, sıralama ve saldırı anındaki bakiyeler
+
+    nakit = gelir_vektoru[ay_sayisi - 1:ay_sayisi - 1 + uzunluk] - zorunlu_gider
+    min_odeme = np.where(faizli, np.where(sabit, taksit, T[:-1] * min_oran), 0.0)
+    saldiri_var = (nakit[0] - min_odeme[0].sum()) * agresiflik > 0
+    adaylar = sira[faizli[sira] & (saldiri_oncesi[0, sira] > 1)]
+    hedef = int(adaylar[0]) if adaylar.size and saldiri_var else -1
+
+    if hedef >= 0:
+        # Hedefin kendi min ödemesi saldırı gücünü etkiler: T[k+1] = (g + a*oran) * T[k] - c - a * (nakit - diğer min ödemeler - c)
+        digerleri = faizli.copy()
+        digerleri[hedef] = False
+        diger_min = np.where(digerleri, np.where(sabit, taksit, T[:-1] * min_oran), 0.0).sum(axis=1)
+        T[:, hedef] = _dogrusal_yineleme(tutar[hedef], g[hedef] + agresiflik * min_oran[hedef], -(c[hedef] + agresiflik * (nakit - diger_min - c[hedef])))
+        saldiri_oncesi[:, hedef] = T[:-1, hedef] * g[hedef] - c[hedef]
+        min_odeme[:, hedef] = np.where(sabit[hedef], taksit[hedef], T[:-1, hedef] * min_oran[hedef])
+
+    kalan_nakit = nakit - min_odeme.sum(axis=1)
+    guc = np.maximum(0, kalan_nakit * agresiflik)
+
+    # --- Dönemin her ayında olay olmadığının kontrolü ---
+    if not saldiri_var:
+        # Ek ödeme gücü yok: bakiyeler yalnızca faiz ve min ödemeyle ilerler.
+        gecerli = guc == 0
+        artan = np.zeros(uzunluk)
+    elif hedef >= 0:
+        # Gücün tamamını ilk hedef emer; hedefin kapanması ve önündeki kalemlerin canlanması olaydır.
+        onceki = sira[:int(np.flatnonzero(sira == hedef)[0])]
+        onceki = onceki[faizli[onceki]]
+        gecerli = (guc > 0) & (saldiri_oncesi[:, hedef] > 1) & (guc < saldiri_oncesi[:, hedef]) & (saldiri_oncesi[:, onceki] <= 1).all(axis=1)
+        artan = np.zeros(uzunluk)
+    else:
+        # Saldırılacak borç yok: gücün tamamı birikime gider.
+        gecerli = ~(faizli & (saldiri_oncesi > 1)).any(axis=1)
+        artan = guc
+    birikimler = _dogrusal_yineleme(birikim, 1 + birikim_artis, artan * (1 + birikim_artis))
+    bitti = ~(faizli & (T > 1)).any(axis=1) & (~toplam_hedefli | (birikimler >= birikim_hedefi))
+    gecerli[1:] &= ~bitti[1:uzunluk]
+
+    # Sıra her ay (anahtar, slot) ile yeniden kurulur; ardışık her çift bu düzende kalmalıdır.
+    a, b = sira[:-1], sira[1:]
+    once_slot = a < b
+    if strateji == STRATEJI_KODLARI['Avalanche']:
+        ayni_bakiye = saldiri_oncesi[:, a] == saldiri_oncesi[:, b]
+        sirali = (faiz_orani[a] > faiz_orani[b]) | ((faiz_orani[a] == faiz_orani[b]) & ((saldiri_oncesi[:, a] > saldiri_oncesi[:, b]) | (ayni_bakiye & once_slot)))
+    elif strateji == STRATEJI_KODLARI['Snowball']:
+        anahtar = np.where(saldiri_oncesi > 1, saldiri_oncesi, np.inf)
+        sirali = (anahtar[:, a] < anahtar[:, b]) | ((anahtar[:, a] == anahtar[:, b]) & once_slot)
+    else:
+        sirali = np.broadcast_to((oncelik[a] < oncelik[b]) | ((oncelik[a] == oncelik[b]) & once_slot), (uzunluk, len(a)))
+    gecerli &= sirali.all(axis=1) & np.isfinite(T[1:]).all(axis=1) & np.isfinite(birikimler[1:])
+
+    atlanan = uzunluk if gecerli.all() else int(np.argmin(gecerli))
+    if atlanan == 0:
+        return None
+    return {'uzunluk': atlanan, 'istenen': uzunluk, 'tutar': T, 'hedef': hedef, 'min_odeme': min_odeme, 'guc': guc, 'birikim': birikimler,
+            'faiz': np.where(faizli, T[:-1] * (faiz_orani * faiz_carpani), 0.0)}
+
+
+def _vektorel_simulasyon(borclar_initial, gelirler_initial, manuel_oncelikler, senaryolar, rapor=None, kontrol_noktalari=None, gelir_matrisi=None,
+                         faiz_siniri=None, ay_siniri=None, profil=None, **sim_params):
+    """Aynı profili, sim_params üzerine yazılan her senaryo sözlüğüyle tek ay döngüsünde simüle eder.
+
+    Senaryo başına özet sözlüklerinin listesini döndürür. rapor sözlüğü verilirse (tek senaryo)
+    aylık kalem detayları bu sözlüğe yazılır. kontrol_noktalari (önceki_kayıt, yeni_kayıt) çifti
+    verilirse (tek senaryo) simülasyon önceki kaydın hâlâ geçerli en geç kontrol noktasından devam
+    eder ve bu çalışmanın noktaları yeni_kayıt sözlüğüne yazılır. gelir_matrisi (senaryo x 360)
+    verilirse her senaryo kendi aylık gelir takvimini kullanır. Senaryo sözlüğündeki
+    'manuel_oncelikler', o senaryo için genel manuel öncelikleri ezer; 'borc_degerleri'
+    ({slot: {'faiz_aylik' | 'sabit_taksit': değer}}) o senaryoda kalemlerin faiz oranını / taksitini ezer.
+
+    faiz_siniri / ay_siniri verilirse birikmiş faizi sınırı kesin olarak aşan ya da ay_siniri ayında
+    bitmemiş senaryolar erken kesilir; özetleri o ana kadarki değerlerdir ve 'kesildi' True olur.
+    profil (AsamaProfili) verilirse aşama süreleri ona yazılır.
+    """
+    if not senaryolar:
+        return []
+
+    tur = profil.tur if profil else _tur_yok
+    ay_bildir = ay_bildirimi()
+    borclar_initial, gelirler_initial = borc_kayitlari(borclar_initial), gelir_kayitlari(gelirler_initial)
+
+    params = [{**sim_params, **senaryo} for senaryo in senaryolar]
+
+    def senaryo_vektoru(anahtar, varsayilan):
+        return np.array([p.get(anahtar, varsayilan) for p in params], dtype=float)
+
+    agresiflik_carpan = senaryo_vektoru('agresiflik_carpan', 1.0)
+    faiz_carpani = senaryo_vektoru('faiz_carpani', 1.0)
+    birikime_ayrilan = senaryo_vektoru('aylik_zorunlu_birikim', 0.0)
+    mevcut_birikim = senaryo_vektoru('baslangic_birikim', 0.0)
+    birikim_artis_aylik = senaryo_vektoru('birikim_artis_aylik', 0.0) / 12 / 100
+    total_birikim_hedefi = senaryo_vektoru('total_birikim_hedefi', 0.0)
+    toplam_hedefli = np.array([p.get('birikim_tipi_str', 'Aylık Sabit Tutar') == "Borç Bitimine Kadar Toplam Tutar" for p in params])
+    strateji = np.array([STRATEJI_KODLARI.get(p['oncelik_stratejisi'], STRATEJI_KODLARI['Kullanici']) for p in params])
+    senaryo_no = np.arange(len(params))
+
+    # --- Slot Dizileri (tüm senaryolarca paylaşılan) ---
+    n = len(borclar_initial)
+    kural = np.array([b.kural for b in borclar_initial], dtype=int)
+    gider = np.isin(kural, GIDER_KURALLARI)
+    sabit = np.isin(kural, SABIT_ODEMELI_KURALLAR)
+    faiz_ekle = np.isin(kural, FAIZ_EKLENEN_KURALLAR)
+    faiz_orani = np.array([b.faiz_aylik for b in borclar_initial], dtype=float)
+    taksit = np.array([b.sabit_taksit for b in borclar_initial], dtype=float)
+    kalan_ay = np.array([b.kalan_ay for b in borclar_initial], dtype=float)
+    devam = np.array([b.devam_etme_yuzdesi for b in borclar_initial], dtype=float)
+    min_oran = np.array([b.min_oran for b in borclar_initial], dtype=float)
+
+    # Senaryoya özel kalem değerleri varsa faiz oranı ve taksit senaryo x slot matrisine açılır; yoksa
+    # tüm senaryolar tek diziyi paylaşır. Kalem güncellemeleri her iki biçimde de son eksende (slot) yapılır.
+    senaryo_kalemli = any('borc_degerleri' in p for p in params)
+    if senaryo_kalemli:
+        faiz_orani, taksit = np.tile(faiz_orani, (len(params), 1)), np.tile(taksit, (len(params), 1))
+        for s, p in enumerate(params):
+            for slot, degerler in p.get('borc_degerleri', {}).items():
+                faiz_orani[s, slot] = degerler.get('faiz_aylik', faiz_orani[s, slot])
+                taksit[s, slot] = degerler.get('sabit_taksit', taksit[s, slot])
+
+    # Manuel öncelikler yalnızca 'Kullanici' stratejili senaryoların sıralamasında kullanılır (senaryo x slot).
+    oncelik = np.tile(np.array([b.oncelik for b in borclar_initial], dtype=float), (len(params), 1))
+    faizli_isimler = [(i, b.isim) for i, b in enumerate(borclar_initial) if not gider[i]]
+    for s, p in enumerate(params):
+        senaryo_oncelikleri = p.get('manuel_oncelikler', manuel_oncelikler)
+        for i, isim in faizli_isimler:
+            if isim in senaryo_oncelikleri:
+                oncelik[s, i] = senaryo_oncelikleri[isim]
+
+    aktif = np.ones(n, dtype=bool)
+
+    # --- Senaryo x Slot Dizileri ---
+    tutar = np.tile(np.array([b.tutar for b in borclar_initial], dtype=float), (len(params), 1))
+    sira = np.tile(np.arange(n), (len(params), 1))  # Ek ödeme sırası (tüm slotlar; her ay anahtar ve slotla yeniden kurulur)
+    toplam_faiz_maliyeti = np.zeros(len(params))
+
+    orijinal = np.ones(n, dtype=bool)  # Slot hâlâ başlangıç kalemini mi taşıyor (dönüşmemiş)
+
+    baslangic_faizli_borc = sum(b.tutar for b in borclar_initial if b.kural not in GIDER_KURALLARI)
+    tur('hazirlik')
+    takvim = gelir_takvimi(gelirler_initial)
+    gelir_vektoru = takvim.toplam
+    tur('gelir')
+    sonuclar = [None] * len(params)
+    ay_sayisi = 0
+
+    # Olay güdümlü kip (tek senaryo): olaysız aylar _sessiz_donem ile toplu atlanır. Ufuk, atlama
+    # başarılı oldukça büyür, olay sıklaştıkça küçülür; böylece kontrol maliyeti de olay sayısıyla orantılı kalır.
+    olay_gudumlu = sim_params.get('motor') == 'olay' and len(params) == 1 and gelir_matrisi is None and not senaryo_kalemli
+    gelir_olaylari = takvim.olay_aylari
+    ufuk = 12
+
+    # --- Kontrol Noktaları ---
+    # k. ayın sonundaki durum, gelirler dışındaki girdiler (kayıt anahtarı) ve ilk k ayın gelir
+    # toplamlarıyla belirlenir; gelir takvimi k. aydan sonra değişen bir çalışma o noktadan devam edebilir.
+    def durum():
+        return (tutar, sira, kalan_ay, aktif, kural, gider, sabit, faiz_ekle, taksit, faiz_orani, min_oran, oncelik, devam, orijinal,
+                toplam_faiz_maliyeti, mevcut_birikim, ilk_ay_toplam_gelir, ilk_ay_toplam_gider)
+
+    son_nokta = 0
+    if kontrol_noktalari is not None:
+        onceki, kayit = kontrol_noktalari
+        kayit.update({'gelir': gelir_vektoru, 'noktalar': {}, 'rapor': rapor})
+        if onceki and (onceki['rapor'] is None) == (rapor is None):
+            farkli_aylar = np.flatnonzero(onceki['gelir'] != gelir_vektoru)
+            ortak_ay_sayisi = int(farkli_aylar[0]) if farkli_aylar.size else len(gelir_vektoru)
+            uygun = [ay for ay in onceki['noktalar'] if ay <= ortak_ay_sayisi]
+            if uygun:
+                son_nokta = ay_sayisi = max(uygun)
+                nokta = onceki['noktalar'][ay_sayisi]
+                (tutar, sira, kalan_ay, aktif, kural, gider, sabit, faiz_ekle, taksit, faiz_orani, min_oran, oncelik, devam, orijinal,
+                 toplam_faiz_maliyeti, mevcut_birikim, ilk_ay_toplam_gelir, ilk_ay_toplam_gider) = (x.copy() for x in nokta['durum'])
+                ufuk = nokta['ufuk']
+                kayit['noktalar'] = {ay: n for ay, n in onceki['noktalar'].items() if ay <= ay_sayisi}
+                if rapor is not None:
+                    rapor['ay_adlari'].extend(onceki['rapor']['ay_adlari'][:ay_sayisi])
+                    for anahtar, tampon in onceki['rapor'].items():
+                        if isinstance(tampon, np.ndarray):
+                            rapor[anahtar][:ay_sayisi] = tampon[:ay_sayisi]
+        tur('kontrol_noktasi')
+
+    while True:
+        ay_sayisi += 1
+
+        # --- Bitiş Kontrolleri (senaryo bazında) ---
+        borc_tamamlandi = ~np.any((aktif & ~gider) & (tutar > 1), axis=1)
+        birikim_hedefi_tamamlandi = ~toplam_hedefli | (mevcut_birikim >= total_birikim_hedefi)
+        limit_asimi = ay_sayisi > 360
+        dogal_biten = np.full(len(senaryo_no), limit_asimi) | ((ay_sayisi > 1) & borc_tamamlandi & birikim_hedefi_tamamlandi)
+        kesilen = np.zeros(len(senaryo_no), dtype=bool)
+        if faiz_siniri is not None:
+            # Birikmiş faiz yalnızca bakiyesi eksiye düşmüş ya da sabit taksitle düşebilecek (kredi) faizli kalem
+            # varken azalabilir; böyle kalemi kalmamış senaryo sınırı aştığında kesin olarak daha kötüdür.
+            eksi_faiz_olasi = np.any((aktif & ~gider) & (sabit | (tutar < 0)), axis=1)
+            kesilen |= (toplam_faiz_maliyeti > faiz_siniri) & ~eksi_faiz_olasi
+        if ay_siniri is not None and ay_sayisi > ay_siniri:
+            kesilen[:] = True
+        biten = dogal_biten | kesilen
+
+        if biten.any():
+            for i in np.flatnonzero(biten):
+                sonuclar[senaryo_no[i]] = {"ay_sayisi": ay_sayisi, "toplam_faiz": round(toplam_faiz_maliyeti[i]), "toplam_birikim": round(mevcut_birikim[i]), "baslangic_faizli_borc": round(baslangic_faizli_borc), "ilk_ay_gelir": float(ilk_ay_toplam_gelir[i]), "ilk_ay_gider": float(ilk_ay_toplam_gider[i]), "limit_asimi": limit_asimi}
+                if faiz_siniri is not None or ay_siniri is not None:
+                    sonuclar[senaryo_no[i]]['kesildi'] = bool(kesilen[i] and not dogal_biten[i])
+            devam_eden = ~biten
+            if not devam_eden.any():
+                break
+            (senaryo_no, tutar, sira, oncelik, toplam_faiz_maliyeti, mevcut_birikim, agresiflik_carpan, faiz_carpani, birikime_ayrilan, birikim_artis_aylik,
+             total_birikim_hedefi, toplam_hedefli, strateji, ilk_ay_toplam_gelir, ilk_ay_toplam_gider) = (
+                x[devam_eden] for x in (senaryo_no, tutar, sira, oncelik, toplam_faiz_maliyeti, mevcut_birikim, agresiflik_carpan, faiz_carpani, birikime_ayrilan, birikim_artis_aylik,
+                                        total_birikim_hedefi, toplam_hedefli, strateji, ilk_ay_toplam_gelir, ilk_ay_toplam_gider))
+            if gelir_matrisi is not None:
+                gelir_matrisi = gelir_matrisi[devam_eden]
+            if senaryo_kalemli:
+                faiz_orani, taksit = faiz_orani[devam_eden], taksit[devam_eden]
+        ay_bildir(ay_sayisi)
+        tur('ay_basi')
+
+        # Kontrol noktası: önceki ayların sonundaki durum (ay_sayisi - 1 ay işlendi)
+        if kontrol_noktalari is not None and ay_sayisi - 1 >= son_nokta + KONTROL_NOKTASI_ARALIGI:
+            son_nokta = ay_sayisi - 1
+            kayit['noktalar'][son_nokta] = {'durum': tuple(x.copy() for x in durum()), 'ufuk': ufuk}
+            tur('kontrol_noktasi')
+
+        # --- Olaysız Dönemi Atlama (olay güdümlü kip) ---
+        if olay_gudumlu and ay_sayisi > 1:
+            zorunlu_gider = birikime_ayrilan[0] + taksit[aktif & gider].sum()
+            donem = _sessiz_donem(ay_sayisi, ufuk, tutar[0], sira[0], kalan_ay, aktif, gider, sabit, faiz_ekle, faiz_orani, faiz_carpani[0], min_oran, taksit, oncelik[0],
+                                  strateji[0], agresiflik_carpan[0], zorunlu_gider, mevcut_birikim[0], birikim_artis_aylik[0], toplam_hedefli[0], total_birikim_hedefi[0],
+                                  gelir_vektoru, gelir_olaylari)
+            tur('olay_atlama')
+            if donem is None:
+                ufuk = max(2, ufuk // 2)
+            else:
+                L = donem['uzunluk']
+                ufuk = ufuk * 2 if L == donem['istenen'] else max(2, L)
+                # Sınırlı çalışmada atlama, kesme kontrolünün tetikleneceği ayın başında durur; kontrolü döngü yapar.
+                if ay_siniri is not None:
+                    L = min(L, ay_siniri - ay_sayisi + 1)
+                if faiz_siniri is not None:
+                    birikmis_faiz = toplam_faiz_maliyeti[0] + np.cumsum(donem['faiz'][:L].sum(axis=1))
+                    kesilir = (birikmis_faiz > faiz_siniri) & ~np.any((aktif & ~gider) & (sabit | (donem['tutar'][1:L + 1] < 0)), axis=1)
+                    if kesilir.any():
+                        L = int(np.argmax(kesilir)) + 1
+                sureli = aktif & sabit & (kalan_ay < 99999)
+                if rapor is not None:
+                    satirlar = slice(ay_sayisi - 1, ay_sayisi - 1 + L)
+                    for satir in range(ay_sayisi - 1, ay_sayisi - 1 + L):
+                        rapor['ay_adlari'].append((rapor['baslangic_tarihi'] + relativedelta(months=satir)).strftime("%b %Y"))
+                    rapor['gelir'][satirlar] = gelir_vektoru[satirlar]
+                    rapor['guc'][satirlar] = donem['guc'][:L]
+                    rapor['birikim'][satirlar] = donem['birikim'][1:L + 1]
+                    rapor['listede'][satirlar] = aktif & orijinal
+                    rapor['kalan'][satirlar] = donem['tutar'][1:L + 1]
+                    rapor['kalan_ay'][satirlar] = np.where(sureli, kalan_ay - np.arange(1, L + 1)[:, None], kalan_ay)
+                    rapor['faiz'][satirlar] = donem['faiz'][:L]
+                    rapor['anapara_min'][satirlar] = np.where(aktif & ~gider, np.maximum(donem['min_odeme'][:L] - donem['faiz'][:L], 0), 0.0)
+                    rapor['taksit'][satirlar] = np.where(aktif & gider & orijinal, taksit, 0.0)
+                    if donem['hedef'] >= 0:
+                        rapor['ek_odeme'][satirlar, donem['hedef']] = donem['guc'][:L]
+                tutar[0] = donem['tutar'][L]
+                toplam_faiz_maliyeti[0] += donem['faiz'][:L].sum()
+                mevcut_birikim[0] = donem['birikim'][L]
+                kalan_ay[sureli] -= L
+                ay_sayisi += L - 1
+                tur('rapor')
+                continue
+
+        toplam_gelir = gelir_vektoru[ay_sayisi - 1] if gelir_matrisi is None else gelir_matrisi[:, ay_sayisi - 1]
+
+        # --- Min Ödemeler ve Faiz (slot sırasıyla, döngü motorundaki liste sırası) ---
+        faizli = aktif & ~gider
+        min_odeme = np.where(sabit, taksit, tutar * min_oran)
+        zorunlu_gider_toplam = _satir_toplami(birikime_ayrilan, np.where(aktif & gider, min_odeme, 0.0))
+        min_borc_odeme_toplam = _satir_toplami(np.zeros(len(senaryo_no)), np.where(faizli, min_odeme, 0.0))
+
+        eklenen_faiz = np.where(faizli, tutar * (faiz_orani * faiz_carpani[:, None]), 0.0)
+        toplam_faiz_maliyeti = _satir_toplami(toplam_faiz_maliyeti, eklenen_faiz)
+        tutar = np.where(faizli & faiz_ekle, tutar + eklenen_faiz, tutar)
+        tutar = np.where(faizli, tutar - min_odeme, tutar)
+
+        if rapor is not None:
+            satir = ay_sayisi - 1
+            rapor['faiz'][satir] = eklenen_faiz[0]
+            rapor['anapara_min'][satir] = np.where(faizli, np.maximum(min_odeme[0] - eklenen_faiz[0], 0), 0.0)
+            rapor['taksit'][satir] = np.where(aktif & gider & orijinal, min_odeme[0], 0.0)
+        tur('min_odeme_faiz')
+
+        # --- Giderlerin Kapanması ve Yeniden Atanması ---
+        sureli = aktif & sabit & (kalan_ay < 99999)
+        kapanan = sureli & (kalan_ay == 1)
+        kalan_ay[sureli & ~kapanan] -= 1
+        serbest_kalan_nakit_bu_ay = np.zeros(len(senaryo_no))
+
+        if kapanan.any():
+            serbest_kalan_nakit_bu_ay = _satir_toplami(serbest_kalan_nakit_bu_ay, np.broadcast_to(np.where(kapanan, taksit * (1 - devam), 0.0), tutar.shape))
+
+            # Devam eden kısım, aynı slotta "Serbest Kalan Harcama" gideri olur.
+            devam_eden_miktar = taksit * devam
+            donusen = kapanan & np.atleast_2d(devam_eden_miktar > 0).any(axis=0)
+            orijinal[donusen] = False
+            kural[donusen] = KURAL_KODLARI['SABIT_GIDER']
+            gider[donusen] = True
+            sabit[donusen] = True
+            faiz_ekle[donusen] = False
+            taksit[..., donusen] = devam_eden_miktar[..., donusen]
+            kalan_ay[donusen] = 99999
+            tutar[:, donusen] = 0
+            faiz_orani[..., donusen] = 0
+            min_oran[donusen] = 0
+            oncelik[:, donusen] = 1
+            devam[donusen] = 1.0
+
+            aktif[kapanan & ~donusen] = False
+        tur('gider_kapanis')
+
+        # --- Saldırı Gücü Hesaplama ---
+        if ay_sayisi == 1:
+            ilk_ay_toplam_gelir = np.full(len(senaryo_no), toplam_gelir)
+            ilk_ay_toplam_gider = zorunlu_gider_toplam + min_borc_odeme_toplam
+
+        kalan_nakit = toplam_gelir - zorunlu_gider_toplam - min_borc_odeme_toplam
+        saldırı_gucu = np.maximum(0, kalan_nakit * agresiflik_carpan) + serbest_kalan_nakit_bu_ay
+
+        # --- Önceliklendirme (döngü motorundaki yığınla aynı anahtarlar; eşitlikte slot sırası) ---
+        for kod in np.unique(strateji):
+            satirlar = np.flatnonzero(strateji == kod)
+            if kod == STRATEJI_KODLARI['Avalanche']:
+                sira[satirlar] = np.lexsort((-tutar[satirlar], np.broadcast_to(-faiz_orani, tutar.shape)[satirlar]), axis=1)
+            elif kod == STRATEJI_KODLARI['Snowball']:
+                sira[satirlar] = np.argsort(np.where(tutar[satirlar] > 1, tutar[satirlar], np.inf), axis=1, kind='stable')
+            else:
+                sira[satirlar] = np.argsort(oncelik[satirlar], axis=1, kind='stable')
+        tur('siralama')
+
+        # --- Ek Ödeme / Borç Saldırısı (birikimli şelale) ---
+        sirali_tutar = np.take_along_axis(tutar, sira, axis=1)
+        hedef = (aktif & ~gider)[sira] & (sirali_tutar > 1)
+        hedef_tutar = np.where(hedef, sirali_tutar, 0.0)
+        kalanlar = np.subtract.accumulate(np.concatenate((saldırı_gucu[:, None], hedef_tutar), axis=1), axis=1)
+        odecek_tutar = np.where(hedef & (kalanlar[:, :-1] > 0), np.minimum(kalanlar[:, :-1], hedef_tutar), 0.0)
+        odenen = odecek_tutar > 0
+        sirali_tutar = sirali_tutar - odecek_tutar
+        sirali_tutar[odenen & (sirali_tutar <= 1)] = 0
+        np.put_along_axis(tutar, sira, sirali_tutar, axis=1)
+        saldırı_kalan = np.maximum(kalanlar[:, -1], 0.0)
+
+        # --- Birikim Güncelleme ---
+        mevcut_birikim = mevcut_birikim + saldırı_kalan
+        mevcut_birikim = mevcut_birikim * (1 + birikim_artis_aylik)
+        tur('ek_odeme')
+
+        # --- Raporlama (tek senaryo, slot indeksli tamponlara) ---
+        if rapor is not None:
+            rapor['ay_adlari'].append((rapor['baslangic_tarihi'] + relativedelta(months=satir)).strftime("%b %Y"))
+            rapor['gelir'][satir] = toplam_gelir
+            rapor['guc'][satir] = saldırı_gucu[0]
+            rapor['birikim'][satir] = mevcut_birikim[0]
+            rapor['ek_odeme'][satir, sira[0][odenen[0]]] = odecek_tutar[0][odenen[0]]
+            rapor['listede'][satir] = aktif & orijinal
+            rapor['kalan'][satir] = tutar[0]
+            rapor['kalan_ay'][satir] = kalan_ay
+            tur('rapor')
+
+    if kontrol_noktalari is not None and rapor is not None:
+        # Devam eden çalışma yalnızca son kontrol noktasına kadarki satırları kopyalar; kayıt tam tamponları tutmaz.
+        son = max(kayit['noktalar'], default=0)
+        kayit['rapor'] = {anahtar: tampon[:son].copy() if isinstance(tampon, np.ndarray) else tampon for anahtar, tampon in rapor.items()}
+        kayit['rapor']['ay_adlari'] = rapor['ay_adlari'][:son]
+
+    return sonuclar
+
+
+def _simule_borc_planı_numpy(borclar_initial, gelirler_initial, manuel_oncelikler, **sim_params):
+    """simule_borc_planı'nın borçları paralel NumPy dizileri olarak tutan vektörel sürümü."""
+
+    if sim_params.get('oncelik_stratejisi') != 'Kullanici':
+        manuel_oncelikler = {}
+
+    profil = AsamaProfili.olustur(sim_params)
+    rapor = _rapor_tamponu(borclar_initial)
+    rapor['baslangic_tarihi'] = sim_params.get('baslangic_tarihi', date.today())
+
+    # Gelirler dışındaki girdilerle anahtarlanan kontrol noktaları: yalnızca gelir takvimi değiştiyse baştan hesaplanmaz.
+    noktalar = kontrol_noktasi_onbellegi()
+    anahtar = onbellek_anahtari('kontrol_noktalari', borclar_initial, [], manuel_oncelikler, sim_params)
+    kayit = {}
+    sonuc = _vektorel_simulasyon(borclar_initial, gelirler_initial, manuel_oncelikler, [{}], rapor=rapor, kontrol_noktalari=(noktalar.getir(anahtar), kayit), profil=profil, **sim_params)[0]
+    noktalar.kaydet(anahtar, kayit)
+    sonuc['df'], sonuc['tamamlandi'] = _rapor_df(borclar_initial, rapor)
+    if profil:
+        profil.tur('df')
+        sonuc['profil'] = profil.bitir()
+
+    return sonuc
+
+
+def simule_senaryo_izgarasi(borclar, gelirler, manuel_oncelikler, current_params, faiz_carpanlari=None):
+    """STRATEJILER x ONCELIK_STRATEJILERI x faiz_carpanlari kombinasyonlarının hepsini tek geçişte simüle eder.
+
+    Her kombinasyon için isim, parametreler ve ay_sayisi / toplam_faiz / toplam_birikim özetini döndürür.
+    """
+    if not borclar or not gelirler:
+        return []
+
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    if faiz_carpanlari is None:
+        faiz_carpanlari = FAIZ_CARPANI_IZGARASI
+    faiz_carpanlari = sorted(set(faiz_carpanlari) | {current_params.get('faiz_carpani', 1.0)})
+
+    kombinasyonlar = [(oncelik_adi, agresiflik_adi, faiz_carpani) for faiz_carpani in faiz_carpanlari for oncelik_adi in ONCELIK_STRATEJILERI for agresiflik_adi in STRATEJILER]
+    senaryolar = [{'oncelik_stratejisi': ONCELIK_STRATEJILERI[o], 'agresiflik_carpan': STRATEJILER[a], 'faiz_carpani': f} for o, a, f in kombinasyonlar]
+
+    hesapla = lambda: _vektorel_simulasyon(borclar, gelirler, manuel_oncelikler, senaryolar, **current_params)
+    # Profilleme açıkken ölçümler gerçek hesaplamayı yansıtsın diye önbellek atlanır.
+    ozetler = hesapla() if current_params.get('profilleme') else _onbellekli('simule_senaryo_izgarasi', (borclar, gelirler, manuel_oncelikler, current_params, senaryolar), hesapla)
+
+    return [{
+        'isim': f"{oncelik_adi} ({agresiflik_adi})",
+        'oncelik': oncelik_adi,
+        'agresiflik': agresiflik_adi,
+        'faiz_carpani': faiz_carpani,
+        'ay_sayisi': ozet['ay_sayisi'],
+        'toplam_faiz': ozet['toplam_faiz'],
+        'toplam_birikim': ozet['toplam_birikim'],
+        'limit_asimi': ozet['limit_asimi'],
+    } for (oncelik_adi, agresiflik_adi, faiz_carpani), ozet in zip(kombinasyonlar, ozetler)]
@@ -0,0 +1,87 @@
+"""Gelir kalemlerinin aylık nakit akışı takvimi (profil başına bir kez derlenir)."""
+
+from itertools import repeat
+
+import numpy as np
+
+from .kayitlar import gelir_kayitlari
+from .onbellek import gelir_takvimi_onbellegi
+
+
+# Gelirler strateji, agresiflik veya faiz çarpanına bağlı değildir: aynı gelir listesiyle yapılan tüm
+# çalışmalar (alternatifler, senaryo ızgarası, optimizasyon, toplu çalıştırma) aynı derlenmiş takvimi
+# paylaşır. Takvim, değiştirilemez Gelir kayıtlarının demetiyle süreç genelindeki önbellekte tutulur;
+# dizileri salt okunurdur.
+
+AY_LIMITI = 360
+
+
+class GelirTakvimi:
+    """Derlenmiş gelir takvimi: `matris` (gelir x ay) kalem bazında, `toplam` aylık toplam gelir.
+
+    `olay_aylari`, takvimin kırıldığı (bir gelirin başladığı, kesildiği veya kademe değiştirdiği) aylardır.
+    """
+
+    __slots__ = ('gelirler', 'matris', 'toplam', 'olay_aylari')
+
+    def __init__(self, gelirler, matris, toplam, olay_aylari):
+        self.gelirler = gelirler
+        self.matris = matris
+        self.toplam = toplam
+        self.olay_aylari = olay_aylari
+
+
+def gelir_maskesi(gelir, aylar):
+    """Gelirin her aydaki kapsam ve kademe çarpanı: aktif olmadığı aylarda 0, diğerlerinde kademelerin çarpımı."""
+    if gelir.tek_seferlik:
+        maske = np.where(aylar == gelir.baslangic_ay, 1.0, 0.0)
+    else:
+        maske = np.where(aylar >= gelir.baslangic_ay, 1.0, 0.0)
+        if gelir.bitis_ay is not None:
+            maske = np.where(aylar <= gelir.bitis_ay, maske, 0.0)
+    for ay, carpan in gelir.kademeler:
+        maske = np.where(aylar >= ay, maske * carpan, maske)
+    return maske
+
+
+def _artis_carpani(gelir, aylar):
+    """(1 + artış) ** ((ay - başlangıç) / 12) dizisi; başlangıçtan önceki aylarda 1."""
+    # Üs alma Python'un pow'uyla (C düzeyinde map) yapılır; np.power son basamakta farklı yuvarlayabiliyor.
+    usler = (np.maximum(aylar - gelir.baslangic_ay, 0) / 12).tolist()
+    return np.fromiter(map(pow, repeat(1 + gelir.artis_yuzdesi), usler), dtype=float, count=len(usler))
+
+
+def gelir_satiri(gelir, aylar):
+    """Gelirin verilen aylardaki tutarları (artış, kapsam ve kademeler uygulanmış)."""
+    if gelir.tek_seferlik:
+        return gelir.tutar * gelir_maskesi(gelir, aylar)
+    return gelir.tutar * _artis_carpani(gelir, aylar) * gelir_maskesi(gelir, aylar)
+
+
+def _derle(gelirler, ay_limiti):
+    aylar = np.arange(1, ay_limiti + 1)
+    matris = np.zeros((len(gelirler), ay_limiti))
+    toplam = np.zeros(ay_limiti)
+    olay_aylari = set()
+    for i, gelir in enumerate(gelirler):
+        matris[i] = gelir_satiri(gelir, aylar)
+        if not gelir.tek_seferlik and gelir.bitis_ay is not None:
+            olay_aylari.add(gelir.bitis_ay + 1)
+        olay_aylari.add(gelir.baslangic_ay)
+        olay_aylari.update(ay for ay, _ in gelir.kademeler)
+        toplam += matris[i]  # Gelir sırasıyla; döngü motorundaki `toplam_gelir +=` ile aynı yuvarlama
+    matris.setflags(write=False)
+    toplam.setflags(write=False)
+    return GelirTakvimi(gelirler, matris, toplam, sorted(olay_aylari))
+
+
+def gelir_takvimi(gelirler, ay_limiti=AY_LIMITI):
+    """Gelir listesinin 1..ay_limiti aylık takvimini döndürür; aynı liste için derleme bir kez yapılır."""
+    gelirler = gelir_kayitlari(gelirler)
+    onbellek = gelir_takvimi_onbellegi()
+    anahtar = (gelirler, ay_limiti)
+    takvim = onbellek.getir(anahtar)
+    if takvim is None:
+        takvim = _derle(gelirler, ay_limiti)
+        onbellek.kaydet(anahtar, takvim)
+    return takvim
@@ -0,0 +1,135 @@
+"""Alternatif senaryolar, strateji sıralaması ve kişiselleştirilmiş tavsiyeler."""
+
+from .kayitlar import borc_kayitlari, gelir_kayitlari
+from .onbellek import _onbellekli
+from .profil import AsamaProfili, _tur_yok
+from .sabitler import ONCELIK_STRATEJILERI, STRATEJILER
+from .simulasyon import _vektorel_simulasyon, simule_senaryo_izgarasi
+from .yardimcilar import format_tl
+
+
+def run_alternative_scenario(borclar, gelirler, current_params, new_strategy_name, new_agresiflik_name, sinir=None):
+    """Farklı bir stratejiyle ödeme planını yalnızca özet olarak (aylık tablo kurmadan) çalıştırır.
+
+    sinir, karşılaştırılan en iyi senaryonun {'toplam_faiz': ...} ve/veya {'ay_sayisi': ...} değeridir:
+    senaryonun bu değeri kesin olarak aşacağı anlaşıldığı ay simülasyon kesilir; özet o ana kadarki
+    değerleri taşır ve 'kesildi' True olur.
+    """
+    
+    agresiflik_carpan = STRATEJILER[new_agresiflik_name]
+    oncelik_stratejisi = ONCELIK_STRATEJILERI.get(new_strategy_name, current_params['oncelik_stratejisi'])
+    
+    # Parametre değerleri değişmez (sayı, metin, tarih); yüzeysel kopya yeterlidir.
+    sim_params = {**current_params, 'agresiflik_carpan': agresiflik_carpan, 'oncelik_stratejisi': oncelik_stratejisi}
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+
+    # Faiz sınırı yuvarlanmış toplam üzerinden: en iyi değere eşit kalan senaryo kesilmez.
+    kesme = {}
+    if sinir and 'toplam_faiz' in sinir:
+        kesme['faiz_siniri'] = sinir['toplam_faiz'] + 0.5
+    if sinir and 'ay_sayisi' in sinir:
+        kesme['ay_siniri'] = sinir['ay_sayisi']
+
+    def hesapla():
+        # Alternatifler yalnızca özet için çalıştırılır; aylık satırlar ve DataFrame hiç kurulmaz.
+        ozet = _vektorel_simulasyon(borclar, gelirler, {}, [{}], **kesme, **sim_params)[0]
+        sonuc = {
+            'isim': f"{new_strategy_name} ({new_agresiflik_name})",
+            'ay_sayisi': ozet['ay_sayisi'],
+            'toplam_faiz': ozet['toplam_faiz'],
+            'toplam_birikim': ozet['toplam_birikim']
+        }
+        if kesme:
+            sonuc['kesildi'] = ozet['kesildi']
+        return sonuc
+
+    return _onbellekli('run_alternative_scenario', (borclar, gelirler, {}, sim_params, new_strategy_name, new_agresiflik_name, kesme), hesapla)
+
+def _izgara_siralamasi(izgara):
+    """Izgara sonuçlarını her faiz çarpanı içinde faiz maliyeti, süre ve birikime göre sıralar."""
+    siralama = sorted(izgara, key=lambda r: (r['faiz_carpani'], r['limit_asimi'], r['toplam_faiz'], r['ay_sayisi'], -r['toplam_birikim']))
+    for i, r in enumerate(siralama):
+        r['sira'] = 1 if i == 0 or siralama[i - 1]['faiz_carpani'] != r['faiz_carpani'] else siralama[i - 1]['sira'] + 1
+    return siralama
+
+def generate_report_and_recommendations(borclar, gelirler, sonuc, current_params, manuel_oncelikler=None):
+    
+    profil = AsamaProfili.olustur(current_params)
+    tur = profil.tur if profil else _tur_yok
+
+    # 1. Alternatif Senaryoların Çalıştırılması (tüm strateji ızgarası tek geçişte)
+    # Izgara sınırsız çalışır: sıralama tablosu her kombinasyonun tam süre ve faizini gösterir. Erken kesme,
+    # en iyiyi kesin olarak aşan senaryoların yalnızca elendiği aramalarda (sıra optimizasyonu, hedef arama) kullanılır.
+    alternatifler = []
+    izgara = simule_senaryo_izgarasi(borclar, gelirler, manuel_oncelikler or {}, current_params)
+    tur('izgara')
+    mevcut_faiz_carpani = current_params.get('faiz_carpani', 1.0)
+    for r in izgara:
+        r['mevcut'] = ONCELIK_STRATEJILERI[r['oncelik']] == current_params['oncelik_stratejisi'] and STRATEJILER[r['agresiflik']] == current_params['agresiflik_carpan'] and r['faiz_carpani'] == mevcut_faiz_carpani
+    strateji_siralamasi = _izgara_siralamasi(izgara)
+    tur('siralama')
+
+    def izgara_sonucu(oncelik_adi, agresiflik_adi):
+        r = next(r for r in izgara if r['oncelik'] == oncelik_adi and r['agresiflik'] == agresiflik_adi and r['faiz_carpani'] == mevcut_faiz_carpani)
+        return {'isim': r['isim'], 'ay_sayisi': r['ay_sayisi'], 'toplam_faiz': r['toplam_faiz'], 'toplam_birikim': r['toplam_birikim']}
+    
+    current_strat_list = [k for k, v in ONCELIK_STRATEJILERI.items() if v == current_params['oncelik_stratejisi']]
+    current_strat = current_strat_list[0] if current_strat_list else "Kullanıcı Tanımlı Sıra"
+    is_avalanche = current_strat.startswith("Borç Çığı")
+    
+    current_agresiflik_val = current_params['agresiflik_carpan']
+    current_agresiflik_name_list = [k for k, v in STRATEJILER.items() if v == current_agresiflik_val]
+    current_agresiflik_name = current_agresiflik_name_list[0] if current_agresiflik_name_list else "Maksimum Çaba (Tüm Ek Ödeme)"
+
+    # a) Öncelik Tersine Çevirme (Avalanche vs Snowball)
+    if current_strat == "Kullanıcı Tanımlı Sıra":
+        alt_strat_name = "Borç Çığı (Avalanche - Önce Faiz)" 
+    elif is_avalanche:
+        alt_strat_name = "Borç Kartopu (Snowball - Önce Tutar)"
+    else:
+        alt_strat_name = "Borç Çığı (Avalanche - Önce Faiz)"
+        
+    if current_strat != alt_strat_name: 
+        alternatifler.append(izgara_sonucu(alt_strat_name, current_agresiflik_name))
+        
+    # b) Agresiflik Değiştirme (Maksimum Çaba vs. Temkinli/Aşırı Çaba)
+    alt_agresiflik_name = ""
+    
+    if current_agresiflik_val == STRATEJILER["Maksimum Çaba (Tüm Ek Ödeme)"]:
+        alt_agresiflik_name = "Temkinli (Yüzde 50)"
+    elif current_agresiflik_val <= STRATEJILER["Temkinli (Yüzde 50)"]:
+        alt_agresiflik_name = "Maksimum Çaba (Tüm Ek Ödeme)"
+        
+    if alt_agresiflik_name and alt_agresiflik_name != current_agresiflik_name:
+        alternatifler.append(izgara_sonucu(current_strat, alt_agresiflik_name))
+    tur('alternatifler')
+    
+    # 2. Tavsiye Oluşturma
+    tavsiyeler = []
+    
+    if sonuc['limit_asimi']:
+        tavsiyeler.append("🚨 **ACİL DURUM:** Ödeme planı süresi 30 yılı aştı! Mevcut gelir ve gider yapınızla borçlarınızı kapatmanız mümkün görünmüyor. **Gelir artışı veya sabit giderlerde ciddi kesintiler** yapmayı düşünün.")
+    elif sonuc['ay_sayisi'] <= 12:
+        tavsiyeler.append("✅ **TEBRİKLER!** Borçlarınızı bir yıldan kısa sürede kapatıyorsunuz. Finansal olarak çok iyi bir yoldasınız.")
+    
+    
+    # Senaryo Karşılaştırma Tavsiyeleri
+    for alt in alternatifler:
+        faiz_farki = sonuc['toplam_faiz'] - alt['toplam_faiz']
+        süre_farki = sonuc['ay_sayisi'] - alt['ay_sayisi']
+        
+        if faiz_farki > 0 and süre_farki >= 0:
+            tavsiyeler.append(f"💰 **DAHA UCUZ/HIZLI FIRSAT:** '{alt['isim'].split('(')[0].strip()}' stratejisini uygularsanız, borç sürenizi **{süre_farki} ay** kısaltabilir ve **{format_tl(faiz_farki)}** ek faiz tasarrufu sağlayabilirsiniz.")
+        elif süre_farki > 0 and faiz_farki > -(sonuc['toplam_faiz'] * 0.05):
+             tavsiyeler.append(f"⏱️ **MOTİVASYON KAZANCI:** '{alt['isim'].split('(')[0].strip()}' stratejisi ile borçlarınızı **{süre_farki} ay** daha erken kapatabilirsiniz. Bu, motivasyonunuzu artırabilir!")
+
+    # En iyi kombinasyon (mevcut faiz çarpanında)
+    en_iyi = next((r for r in strateji_siralamasi if r['faiz_carpani'] == mevcut_faiz_carpani and not r['limit_asimi']), None)
+    if en_iyi and en_iyi['toplam_faiz'] < sonuc['toplam_faiz'] and en_iyi['ay_sayisi'] <= sonuc['ay_sayisi']:
+        tavsiyeler.append(f"🏅 **EN İYİ KOMBİNASYON:** Denenen {len(izgara)} senaryo içinde en düşük faiz maliyeti **'{en_iyi['isim']}'** ile elde ediliyor: **{format_tl(sonuc['toplam_faiz'] - en_iyi['toplam_faiz'])}** daha az faiz, **{sonuc['ay_sayisi'] - en_iyi['ay_sayisi']} ay** daha kısa süre.")
+    tur('tavsiyeler')
+
+    rapor_sonuclari = {"alternatifler": alternatifler, "strateji_siralamasi": strateji_siralamasi, "tavsiyeler": tavsiyeler}
+    if profil:
+        rapor_sonuclari['profil'] = profil.bitir()
+    return rapor_sonuclari
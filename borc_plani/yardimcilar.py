@@ -0,0 +1,100 @@
+"""Kalem oluşturma, minimum ödeme ve biçimlendirme yardımcıları."""
+
+from .kayitlar import Borc, Gelir
+from .sabitler import KURAL_KODLARI, SABIT_ODEMELI_KURALLAR, VARSAYILAN_TR_PARAMS
+
+
+# Para formatlama fonksiyonu
+def format_tl(tutar):
+    if tutar is None or tutar != tutar:  # None veya NaN
+        return "0 TL"
+    return f"{int(tutar):,} TL"
+
+
+def hesapla_min_odeme(borc, faiz_carpani=1.0, tutar=None):
+    """Borc kaydının aylık min ödemesi; `tutar` verilirse kaydın başlangıç bakiyesi yerine o kullanılır."""
+    if borc.kural in SABIT_ODEMELI_KURALLAR:
+        return borc.sabit_taksit
+    return (borc.tutar if tutar is None else tutar) * borc.min_oran
+
+
+def borc_olustur(isim, faizli_anapara, oncelik_str, borc_tipi, sabit_taksit, kalan_ay, faiz_aylik, kk_asgari_yuzdesi, zorunlu_anapara_yuzdesi, kk_limit=0.0, devam_etme_yuzdesi=0.0, tr_params=None):
+    """Form girdilerinden Borc kayıtlarını oluşturur; eklenecek kalem yoksa boş liste döndürür."""
+    if tr_params is None:
+        tr_params = VARSAYILAN_TR_PARAMS
+    
+    borc_listesi = []
+    final_priority = 9999 
+
+    if oncelik_str:
+        try:
+            priority_val = int(oncelik_str.split('.')[0].split(' ')[-1])
+            final_priority = priority_val + 1000 
+        except:
+            if "1. En Yüksek Öncelik" in oncelik_str:
+                final_priority = 1001
+            else:
+                final_priority = 9999
+    
+    # Borç objesini oluştur
+    yeni_borc = {
+        "isim": isim,
+        "tutar": faizli_anapara,
+        "oncelik": final_priority,
+        "faiz_aylik": faiz_aylik,
+        "kalan_ay": kalan_ay if kalan_ay > 0 else 99999,
+        "sabit_taksit": sabit_taksit,
+        "kk_asgari_yuzdesi": kk_asgari_yuzdesi,
+        "zorunlu_anapara_yuzdesi": zorunlu_anapara_yuzdesi,
+        "limit": kk_limit,
+        "devam_etme_yuzdesi": devam_etme_yuzdesi
+    }
+
+    if borc_tipi == "Kredi Kartı Dönem Borcu (Faizli)":
+        if faizli_anapara > 0:
+            yeni_borc["isim"] = f"{isim} (Dönem Borcu)"
+            yeni_borc["min_kural"] = "ASGARI_FAIZ"
+            yeni_borc["faiz_aylik"] = tr_params['kk_aylik_akdi_faiz'] / 100.0
+            yeni_borc["kk_asgari_yuzdesi"] = tr_params['kk_asgari_odeme_yuzdesi_default'] / 100.0
+            borc_listesi.append(yeni_borc)
+
+    elif borc_tipi == "Ek Hesap (KMH)":
+        yeni_borc["min_kural"] = "FAIZ_ART_ANAPARA"
+        borc_listesi.append(yeni_borc)
+
+    elif borc_tipi == "Kredi (Sabit Taksit/Anapara)":
+        yeni_borc["min_kural"] = "SABIT_TAKSIT_ANAPARA"
+        borc_listesi.append(yeni_borc)
+
+    elif borc_tipi == "Diğer Faizli Borç":
+        yeni_borc["min_kural"] = "FAIZ"
+        borc_listesi.append(yeni_borc)
+        
+    elif borc_tipi in ["Zorunlu Sabit Gider (Kira, Aidat vb.)", "Ev Kredisi Taksiti", "Sabit Taksit Gideri (KK Taksiti, Aidat vb.)", "Aylık Harcama Sepeti (Kütüphaneden)"]:
+        yeni_borc["min_kural"] = "SABIT_GIDER"
+        yeni_borc["oncelik"] = 1
+        yeni_borc["tutar"] = 0 
+        yeni_borc["faiz_aylik"] = 0
+        
+        # Kalan ay ayarları
+        if borc_tipi == "Aylık Harcama Sepeti (Kütüphaneden)":
+            yeni_borc["kalan_ay"] = 99999
+        elif borc_tipi == "Ev Kredisi Taksiti" or borc_tipi == "Sabit Taksit Gideri (KK Taksiti, Aidat vb.)":
+             yeni_borc["kalan_ay"] = kalan_ay if kalan_ay > 0 else 99999
+        else: # Kira, Aidat vb.
+            yeni_borc["kalan_ay"] = kalan_ay if kalan_ay < 99999 and kalan_ay > 0 else 99999
+             
+        yeni_borc["sabit_taksit"] = sabit_taksit
+        borc_listesi.append(yeni_borc)
+
+    return [Borc(kural=KURAL_KODLARI[borc.pop('min_kural')], **borc) for borc in borc_listesi]
+
+
+def gelir_olustur(isim, tutar, baslangic_ay, artis_yuzdesi, tek_seferlik, bitis_ay=0, kademe_ay=0, kademe_yuzdesi=0.0):
+    """Form girdilerinden Gelir kaydını oluşturur (yüzdeler oran olarak saklanır).
+
+    bitis_ay 0 ise gelir süresizdir; kademe_ay 0 değilse gelir o aydan itibaren kademe_yuzdesi kadar değişir.
+    """
+    kademeler = ((kademe_ay, 1 + kademe_yuzdesi / 100.0),) if kademe_ay > 0 and kademe_yuzdesi else ()
+    return Gelir(isim=isim, tutar=tutar, baslangic_ay=baslangic_ay, artis_yuzdesi=artis_yuzdesi / 100.0, tek_seferlik=tek_seferlik,
+                 bitis_ay=bitis_ay if bitis_ay > 0 else None, kademeler=kademeler)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Testler depo kökünden paketlenmeden çalışır: borc_plani ve benchmark kökten içe aktarılır.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
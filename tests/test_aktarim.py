@@ -0,0 +1,72 @@
+"""CSV / XLSX içe aktarımı: doğrulama, hata raporu ve parça parça okuma."""
+
+import io
+
+import pandas as pd
+
+from borc_plani import KURAL_KODLARI, ice_aktar
+from borc_plani.aktarim import tablo_parcalari
+
+
+def _csv(metin):
+    return io.BytesIO(metin.encode('utf-8'))
+
+
+def _xlsx(df):
+    tampon = io.BytesIO()
+    df.to_excel(tampon, index=False)
+    return io.BytesIO(tampon.getvalue())
+
+
+def test_borclar_dogrulanir_ve_hatalar_satir_numarasiyla_raporlanir():
+    dosya = _csv("isim,tip,tutar,taksit,kalan ay,faiz\n"
+                 "Kart,KK,25000,,,\n"
+                 "Araba,Kredi,120000,6500,24,3.2\n"
+                 ",Kira,,15000,,\n"
+                 "Bilinmeyen,Hisse,1000,,,\n"
+                 "Kredi2,Kredi,50000,,12,2\n")
+    kayitlar, rapor = ice_aktar(dosya, 'borclar.csv', 'borc')
+
+    assert [b.isim for b in kayitlar] == ["Kart (Dönem Borcu)", "Araba"]
+    assert kayitlar[0].kural == KURAL_KODLARI['ASGARI_FAIZ']
+    assert kayitlar[1].kural == KURAL_KODLARI['SABIT_TAKSIT_ANAPARA']
+    assert kayitlar[1].faiz_aylik == 0.032 and kayitlar[1].kalan_ay == 24
+    assert rapor['Satır'].tolist() == [4, 5, 6]
+    assert "İsim boş" in rapor['Hata'].iloc[0]
+    assert "Tanınmayan kalem tipi" in rapor['Hata'].iloc[1]
+    assert "Aylık taksit/gider tutarı gerekli" in rapor['Hata'].iloc[2]
+
+
+def test_noktali_virgul_ayiricida_ondalik_virgul():
+    kayitlar, rapor = ice_aktar(_csv("isim;tutar;artış\nMaaş;45.000,50 TL;%12,5\n"), 'gelirler.csv', 'gelir')
+    assert rapor.empty
+    assert kayitlar[0].tutar == 45000.5 and kayitlar[0].artis_yuzdesi == 0.125
+
+
+def test_negatif_sayilar_reddedilir():
+    kayitlar, rapor = ice_aktar(_csv("isim,tutar,artış\nMaaş,40000,-5\n"), 'gelirler.csv', 'gelir')
+    assert kayitlar == []
+    assert "'Artış Yüzdesi' negatif olamaz" in rapor['Hata'].iloc[0]
+
+
+def test_kademe_degisimi_negatif_olabilir():
+    """Maaş kesintisi gibi azalan kademeler -100'e kadar kabul edilir (formdaki sınır)."""
+    dosya = _csv("isim,tutar,zam ayı,zam\nMaaş,40000,12,-20\nPrim,5000,6,-100\nYan Gelir,3000,6,-150\n")
+    kayitlar, rapor = ice_aktar(dosya, 'gelirler.csv', 'gelir')
+
+    assert [(g.isim, g.kademeler) for g in kayitlar] == [("Maaş", ((12, 0.8),)), ("Prim", ((6, 0.0),))]
+    assert rapor['Satır'].tolist() == [4]
+    assert "'Kademe Değişimi (%)' -100'den küçük olamaz" in rapor['Hata'].iloc[0]
+
+
+def test_xlsx_parca_parca_okunur_ve_csv_ile_ayni():
+    df = pd.DataFrame({'Gelir Adı': [f"Gelir {i}" for i in range(7)] + [None], 'Aylık Tutar': [1000 * (i + 1) for i in range(7)] + [500],
+                       'Başlangıç Ayı': [1, 2, None, 4, 5, 6, 7, 8], 'Tek Seferlik Mi?': ['Hayır'] * 7 + ['Evet']})
+    parcalar = [parca for parca, _ in tablo_parcalari(_xlsx(df), 'gelirler.xlsx', parca_boyutu=3)]
+    assert [len(parca) for parca in parcalar] == [3, 3, 2]
+    assert parcalar[0].iloc[0].tolist() == ["Gelir 0", "1000", "1", "Hayır"]
+
+    kayitlar, rapor = ice_aktar(_xlsx(df), 'gelirler.xlsx', 'gelir')
+    csv_kayitlari, csv_raporu = ice_aktar(_csv(df.to_csv(index=False)), 'gelirler.csv', 'gelir')
+    assert kayitlar == csv_kayitlari and len(kayitlar) == 7
+    assert rapor['Satır'].tolist() == csv_raporu['Satır'].tolist() == [9]
@@ -0,0 +1,102 @@
+"""İkili profil dosyası: gidiş-dönüş, şema göçü ve güvenli okuma."""
+
+import pickle
+from datetime import date
+
+import pytest
+
+from borc_plani import Borc, Gelir, KURAL_KODLARI, ProfilDeposu, profil_coz, profil_kodla
+from borc_plani import depo
+
+
+def _profil():
+    return {
+        'borclar': [
+            Borc(isim="Kredi Kartı (Dönem Borcu)", tutar=25000.0, oncelik=1001, faiz_aylik=0.0366, kk_asgari_yuzdesi=0.2, limit=40000.0, kural=KURAL_KODLARI['ASGARI_FAIZ']),
+            Borc(isim="Kira", oncelik=1, sabit_taksit=15000.0, devam_etme_yuzdesi=1.0, kural=KURAL_KODLARI['SABIT_GIDER']),
+        ],
+        'gelirler': [Gelir(isim="Maaş", tutar=60000.0, artis_yuzdesi=0.25, kademeler=((7, 1.1),))],
+        'harcama_kalemleri': {'Kalem Adı': ['Market'], 'Aylık Bütçe (TL)': [8000.0]},
+        'tr_params': {'kk_aylik_akdi_faiz': 3.66},
+        'manuel_oncelik_listesi': {"Kredi Kartı (Dönem Borcu)": 1001},
+        'baslangic_tarihi': date(2025, 3, 1),
+    }
+
+
+def _dosya(surum, govde):
+    return depo._BASLIK.pack(depo.PROFIL_IMZASI, surum) + pickle.dumps(govde)
+
+
+def test_gidis_donus():
+    profil = _profil()
+    assert profil_coz(profil_kodla(profil)) == profil
+
+
+def test_eksik_sutunlar_varsayilanla_doldurulur():
+    govde = pickle.loads(profil_kodla(_profil())[depo._BASLIK.size:])
+    sutunlar = govde['borclar']
+    i = sutunlar['alanlar'].index('devam_etme_yuzdesi')
+    del sutunlar['alanlar'][i], sutunlar['degerler'][i]
+
+    borclar = profil_coz(_dosya(depo.SEMA_SURUMU, govde))['borclar']
+    assert [b.devam_etme_yuzdesi for b in borclar] == [0.0, 0.0]
+    assert [b.isim for b in borclar] == [b.isim for b in _profil()['borclar']]
+
+
+def test_eski_surum_goclerle_yukseltilir(monkeypatch):
+    eski = profil_kodla({**_profil(), 'tr_params': {}})
+
+    def goc(govde):
+        return {**govde, 'tr_params': {'kk_aylik_akdi_faiz': 4.25}}
+
+    monkeypatch.setattr(depo, 'SEMA_SURUMU', depo.SEMA_SURUMU + 1)
+    monkeypatch.setitem(depo._GOCLER, depo.SEMA_SURUMU - 1, goc)
+    profil = profil_coz(eski)
+    assert profil['tr_params'] == {'kk_aylik_akdi_faiz': 4.25}
+    assert profil['borclar'] == _profil()['borclar']
+
+
+def test_yeni_surum_ve_bozuk_dosya_reddedilir():
+    with pytest.raises(ValueError):
+        profil_coz(_dosya(depo.SEMA_SURUMU + 1, {}))
+    with pytest.raises(ValueError):
+        profil_coz(b'BPPROF')
+    with pytest.raises(ValueError):
+        profil_coz(b'JSONDOSY' + profil_kodla(_profil())[8:])
+
+
+class _Tuzak:
+    calisti = False
+
+    def __reduce__(self):
+        return (_tuzagi_kur, ())
+
+
+def _tuzagi_kur():
+    _Tuzak.calisti = True
+
+
+def test_dosyaya_yerlestirilmis_sinif_reddedilir():
+    govde = pickle.loads(profil_kodla(_profil())[depo._BASLIK.size:])
+    govde['tr_params'] = _Tuzak()
+
+    with pytest.raises(pickle.UnpicklingError):
+        profil_coz(_dosya(depo.SEMA_SURUMU, govde))
+    assert not _Tuzak.calisti
+
+
+def test_depo_kaydet_yukle_ve_gecikmeli_kayit(tmp_path):
+    depo_ = ProfilDeposu(str(tmp_path), gecikme=60)
+    profil = _profil()
+    depo_.kaydet('ev', profil)
+    assert depo_.listele() == ['ev']
+    assert depo_.yukle('ev') == profil
+
+    degisen = {**profil, 'manuel_oncelik_listesi': {}}
+    assert depo_.gecikmeli_kaydet('ev', degisen)
+    assert not depo_.gecikmeli_kaydet('ev', degisen)  # Değişmeyen profil yeniden bekletilmez
+    assert depo_.yukle('ev') == degisen  # Yükleme bekleyen kaydı önce yazar
+    assert depo_.yazma == 2
+
+    with pytest.raises(ValueError):
+        depo_.kaydet('../dışarı', profil)
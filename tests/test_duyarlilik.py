@@ -0,0 +1,40 @@
+"""Duyarlılık analizi: her düşük/yüksek satır, yalnızca o değeri değişmiş tek başına bir çalıştırmaya eşittir."""
+
+import pytest
+
+import benchmark
+from borc_plani import borc_kayitlari, gelir_kayitlari
+from borc_plani.duyarlilik import DUYARLILIK_PARAMETRELERI, _degisimler, _duyarlilik_hesapla
+from borc_plani.simulasyon import _simule_borc_planı_dongu
+
+
+def _tek_basina(borclar, gelirler, parametre, konum, deger):
+    if parametre in ('faiz_aylik', 'sabit_taksit'):
+        borclar = borclar[:konum] + (borclar[konum].degistir(**{parametre: deger}),) + borclar[konum + 1:]
+    else:
+        gelirler = gelirler[:konum] + (gelirler[konum].degistir(**{parametre: deger}),) + gelirler[konum + 1:]
+    return _simule_borc_planı_dongu(borclar, gelirler, {}, **benchmark.SIM_PARAMS)
+
+
+@pytest.mark.parametrize('kalem_sayisi, ufuk, tohum', [(10, 'orta', 0), (10, 'orta', 1), (12, 'kisa', 3), (8, 'uzun', 2)])
+def test_satirlar_tek_basina_calistirmalara_esit(kalem_sayisi, ufuk, tohum):
+    borclar, gelirler = benchmark.sentetik_profil(kalem_sayisi, ufuk, tohum)
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    adim = 0.10
+    sonuc = _duyarlilik_hesapla(borclar, gelirler, {}, benchmark.SIM_PARAMS, adim)
+    satirlar = {(r['kalem'], r['parametre']): r for r in sonuc['satirlar']}
+    degisimler = list(_degisimler(borclar, gelirler, adim))
+    assert len(satirlar) == len(degisimler) == len(sonuc['satirlar'])
+
+    temel = _simule_borc_planı_dongu(borclar, gelirler, {}, **benchmark.SIM_PARAMS)
+    assert (sonuc['temel']['ay_sayisi'], sonuc['temel']['toplam_faiz']) == (temel['ay_sayisi'], temel['toplam_faiz'])
+
+    # Hem borc_degerleri (faiz/gider) hem gelir_matrisi (tutar/artış) yolundan satırlar denetlenir.
+    assert {d[1] for d in degisimler} == set(DUYARLILIK_PARAMETRELERI)
+    for isim, parametre, _, dusuk, yuksek, konum in degisimler:
+        satir = satirlar[(isim, parametre)]
+        for uc, deger in (('dusuk', dusuk), ('yuksek', yuksek)):
+            tekil = _tek_basina(borclar, gelirler, parametre, konum, deger)
+            assert satir[f'ay_{uc}'] == tekil['ay_sayisi'] - temel['ay_sayisi'], (isim, parametre, uc)
+            assert satir[f'faiz_{uc}'] == tekil['toplam_faiz'] - temel['toplam_faiz'], (isim, parametre, uc)
+
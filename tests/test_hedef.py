@@ -0,0 +1,43 @@
+"""Hedef arama: bulunan kaldıraç değeri hedefi tutturur ve (tolerans içinde) en iyisidir."""
+
+import pytest
+
+import benchmark
+from borc_plani import GIDER_KURALLARI, Gelir, borc_kayitlari, gelir_kayitlari, hedef_ara
+from borc_plani.hedef import _TOLERANS, _saglar
+from borc_plani.simulasyon import _simule_borc_planı_dongu
+
+
+def _uygula(borclar, gelirler, params, kaldirac, deger):
+    """Kaldıraç değerini girdilere uygulayıp planı döngü motoruyla hesaplar."""
+    if kaldirac == 'ek_gelir':
+        gelirler = gelirler + (Gelir(isim="Ek Gelir", tutar=deger),)
+    elif kaldirac == 'gider_kesintisi':
+        borclar = tuple(b.degistir(sabit_taksit=b.sabit_taksit * (1 - deger)) if b.kural in GIDER_KURALLARI else b for b in borclar)
+    else:
+        params = {**params, 'aylik_zorunlu_birikim': deger}
+    return _simule_borc_planı_dongu(borclar, gelirler, {}, **params)
+
+
+@pytest.mark.parametrize('hedef, kaldirac', [('ay', 'ek_gelir'), ('faiz', 'gider_kesintisi'), ('ay', 'aylik_birikim'), ('birikim', 'ek_gelir')])
+@pytest.mark.parametrize('tohum', [0, 1])
+def test_bulunan_deger_hedefi_tutturur(hedef, kaldirac, tohum):
+    borclar, gelirler = benchmark.sentetik_profil(10, 'orta', tohum)
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    params = dict(benchmark.SIM_PARAMS)
+    baslangic = _simule_borc_planı_dongu(borclar, gelirler, {}, **params)
+    # Ay ve faiz hedefleri mevcut planı biraz iyileştirmeyi, aylık birikim hedefi mevcut süreyi korumayı ister.
+    hedef_degeri = {'ay': baslangic['ay_sayisi'] - 3 if kaldirac != 'aylik_birikim' else baslangic['ay_sayisi'],
+                    'faiz': baslangic['toplam_faiz'] * 0.8, 'birikim': baslangic['toplam_birikim'] + 100000}[hedef]
+
+    sonuc = hedef_ara(borclar, gelirler, {}, params, hedef, hedef_degeri, kaldirac)
+    assert sonuc['ulasilabilir'] and not sonuc.get('sinirsiz')
+
+    if hedef == 'birikim':
+        params['birikim_tipi_str'] = 'Aylık Sabit Tutar'
+    saglar = _saglar(hedef, hedef_degeri)
+    assert saglar(_uygula(borclar, gelirler, params, kaldirac, sonuc['deger']))
+    # Toleransın ötesindeki daha iyi değer (daha az ek gelir / kesinti, daha fazla birikim) hedefi tutturmaz.
+    komsu = sonuc['deger'] + _TOLERANS[kaldirac] if kaldirac == 'aylik_birikim' else sonuc['deger'] - _TOLERANS[kaldirac]
+    if komsu >= 0:
+        assert not saglar(_uygula(borclar, gelirler, params, kaldirac, komsu))
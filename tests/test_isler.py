@@ -0,0 +1,84 @@
+"""Arka plan hesap işleri: ay ilerlemesi, iptal ve aşama hatalarının işe taşınması."""
+
+import threading
+
+import pytest
+
+import benchmark
+from borc_plani import borc_kayitlari, gelir_kayitlari, is_baslat
+from borc_plani.isler import _ay_yok, ay_bildirimi
+from borc_plani.simulasyon import _simule_borc_planı_hesapla
+
+ZAMAN_ASIMI = 30
+
+
+def _bekle(hesap_isi):
+    hesap_isi._gelecek.result(timeout=ZAMAN_ASIMI)
+    assert hesap_isi.bitti
+
+
+def _plan(motor, ufuk='uzun'):
+    borclar, gelirler = benchmark.sentetik_profil(12, ufuk, 0)
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    return lambda sonuclar: _simule_borc_planı_hesapla(borclar, gelirler, {}, **{**benchmark.SIM_PARAMS, 'motor': motor})
+
+
+@pytest.mark.parametrize('motor', ['dongu', 'numpy', 'olay'])
+def test_ay_bildirimi_ilerlemeyi_gunceller(motor):
+    durdu, devam = threading.Event(), threading.Event()
+
+    def asama(sonuclar):
+        ay_bildirimi()(7)
+        durdu.set()
+        assert devam.wait(ZAMAN_ASIMI)
+        return 'tamam'
+
+    hesap_isi = is_baslat(f'ilerleme-{motor}', [('ilk', asama), ('plan', _plan(motor, 'orta'))])
+    assert durdu.wait(ZAMAN_ASIMI)
+    assert (hesap_isi.durum, hesap_isi.aktif_asama, hesap_isi.ay) == ('calisiyor', 'ilk', 7)
+    devam.set()
+    _bekle(hesap_isi)
+
+    assert hesap_isi.durum == 'bitti' and hesap_isi.aktif_asama is None and hesap_isi.hata is None
+    assert hesap_isi.sonuclar['ilk'] == 'tamam'
+    # Motor simüle ettiği ayları bildirir; özetteki ay_sayisi, bitişin görüldüğü (simüle edilmeyen) aydır.
+    assert hesap_isi.ay == hesap_isi.sonuclar['plan']['ay_sayisi'] - 1 > 1
+    assert ay_bildirimi() is _ay_yok  # İş dışında bildirim hiçbir şey yapmaz
+
+
+def test_iptal_calisan_motoru_sonraki_ayda_durdurur():
+    for motor in ('dongu', 'numpy'):
+        basladi, kapi = threading.Event(), threading.Event()
+        plan = _plan(motor)
+
+        def asama(sonuclar):
+            basladi.set()
+            assert kapi.wait(ZAMAN_ASIMI)
+            return plan(sonuclar)
+
+        sonraki = []
+        hesap_isi = is_baslat(f'iptal-{motor}', [('plan', asama), ('sonraki', lambda sonuclar: sonraki.append(1))])
+        assert basladi.wait(ZAMAN_ASIMI)
+        hesap_isi.iptal()
+        kapi.set()
+        _bekle(hesap_isi)
+
+        assert hesap_isi.durum == 'iptal' and hesap_isi.hata is None
+        assert hesap_isi.ay == 1  # Motor ilk ay bildiriminde durdu
+        assert hesap_isi.sonuclar == {} and sonraki == []
+
+
+def test_asama_hatasi_ise_tasinir_ve_sonraki_asamalar_calismaz():
+    sonraki = []
+
+    def hatali(sonuclar):
+        ay_bildirimi()(3)
+        raise ValueError("bozuk girdi")
+
+    hesap_isi = is_baslat('hata', [('ilk', lambda sonuclar: 1), ('hatali', hatali), ('sonraki', lambda sonuclar: sonraki.append(1))])
+    _bekle(hesap_isi)
+
+    assert hesap_isi.durum == 'hata'
+    assert isinstance(hesap_isi.hata, ValueError) and str(hesap_isi.hata) == "bozuk girdi"
+    assert hesap_isi.sonuclar == {'ilk': 1} and sonraki == []
+    assert hesap_isi.aktif_asama is None and hesap_isi.ay == 3
@@ -0,0 +1,35 @@
+"""Monte Carlo: tohumla tekrarlanabilirlik ve yüzdelik bantlarının sırası."""
+
+import pytest
+
+import benchmark
+from borc_plani import MONTE_CARLO_VARSAYILAN, borc_kayitlari, gelir_kayitlari
+from borc_plani.monte_carlo import _monte_carlo_hesapla
+
+
+def _hesapla(tohum=42, **ayarlar):
+    borclar, gelirler = benchmark.sentetik_profil(8, 'orta', 0)
+    ayarlar = {**MONTE_CARLO_VARSAYILAN, 'yol_sayisi': 240, 'tohum': tohum, **ayarlar}
+    return _monte_carlo_hesapla(borc_kayitlari(borclar), gelir_kayitlari(gelirler), {}, benchmark.SIM_PARAMS, ayarlar)
+
+
+@pytest.mark.parametrize('dagilim', ['normal', 'duzgun'])
+def test_ayni_tohum_parca_ve_surec_sayisindan_bagimsiz(dagilim):
+    referans = _hesapla(dagilim=dagilim, parca_boyutu=240, surec_sayisi=1)
+    assert referans['yol_sayisi'] == 240
+    for parca_boyutu, surec_sayisi in [(100, 1), (37, 1), (100, 2), (37, 3)]:
+        assert _hesapla(dagilim=dagilim, parca_boyutu=parca_boyutu, surec_sayisi=surec_sayisi) == referans, (parca_boyutu, surec_sayisi)
+
+
+def test_farkli_tohum_farkli_yollar_uretir():
+    assert _hesapla(tohum=1) != _hesapla(tohum=2)
+
+
+@pytest.mark.parametrize('tohum', [0, 7])
+def test_yuzdelik_bantlari_sirali(tohum):
+    sonuc = _hesapla(tohum=tohum, parca_boyutu=80)
+    for ad, bant in sonuc['yuzdelikler'].items():
+        assert list(bant) == ['P10', 'P50', 'P90']
+        assert bant['P10'] <= bant['P50'] <= bant['P90'], ad
+    assert sonuc['yuzdelikler']['toplam_faiz']['P10'] < sonuc['yuzdelikler']['toplam_faiz']['P90']  # Belirsizlik bandı açılır
+    assert 0.0 <= sonuc['limit_asimi_orani'] <= 1.0
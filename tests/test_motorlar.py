@@ -0,0 +1,111 @@
+"""Döngü, NumPy ve olay güdümlü motorların eşitliği, kontrol noktasından devam, toplu senaryo izgarası ve erken kesme sınırı."""
+
+import pytest
+
+import benchmark
+from borc_plani import Gelir, borc_kayitlari, gelir_kayitlari, kontrol_noktasi_onbellegi
+from borc_plani.sabitler import FAIZ_CARPANI_IZGARASI, ONCELIK_STRATEJILERI, STRATEJILER
+from borc_plani.simulasyon import _simule_borc_planı_dongu, _simule_borc_planı_hesapla, _vektorel_simulasyon, simule_senaryo_izgarasi
+
+MOTORLAR = ['dongu', 'numpy', 'olay']
+
+
+def _ozet(sonuc):
+    return {anahtar: deger for anahtar, deger in sonuc.items() if anahtar not in ('df', 'tamamlandi')}
+
+
+def _calistir(borclar, gelirler, motor, **params):
+    return _simule_borc_planı_hesapla(borclar, gelirler, {}, **{**benchmark.SIM_PARAMS, **params, 'motor': motor})
+
+
+@pytest.mark.parametrize('kalem_sayisi', [8, 40])
+@pytest.mark.parametrize('ufuk', ['kisa', 'orta', 'uzun'])
+@pytest.mark.parametrize('tohum', [0, 1])
+@pytest.mark.parametrize('strateji', ['Avalanche', 'Snowball'])
+def test_motorlar_ayni_sonucu_verir(kalem_sayisi, ufuk, tohum, strateji):
+    borclar, gelirler = benchmark.sentetik_profil(kalem_sayisi, ufuk, tohum)
+    sonuclar = {motor: _calistir(borclar, gelirler, motor, oncelik_stratejisi=strateji) for motor in MOTORLAR}
+
+    referans = sonuclar['dongu']
+    for motor in MOTORLAR[1:]:
+        assert _ozet(sonuclar[motor]) == _ozet(referans), motor
+        assert sonuclar[motor]['df'].equals(referans['df']), motor
+        assert sonuclar[motor]['tamamlandi'].equals(referans['tamamlandi']), motor
+
+
+@pytest.mark.parametrize('motor', ['numpy', 'olay'])
+@pytest.mark.parametrize('baslangic_ay', [13, 40])
+def test_kontrol_noktasindan_devam_bastan_hesapla_ayni(motor, baslangic_ay):
+    """Gelir takvimi sonradan değişen plan kontrol noktasından devam eder ve baştan hesaplanmış planla aynıdır."""
+    borclar, gelirler = benchmark.sentetik_profil(20, 'orta', 3)
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    ek = Gelir(isim="Ek Gelir", tutar=5000.0, baslangic_ay=baslangic_ay, artis_yuzdesi=0.1)
+    degisen = gelirler + (ek.degistir(artis_yuzdesi=0.3),)
+    onbellek = kontrol_noktasi_onbellegi()
+
+    onbellek.temizle()
+    _calistir(borclar, gelirler + (ek,), motor)
+    isabet = onbellek.istatistikler()['isabet']
+    devam = _calistir(borclar, degisen, motor)
+    assert onbellek.istatistikler()['isabet'] == isabet + 1
+
+    onbellek.temizle()
+    bastan = _calistir(borclar, degisen, motor)
+    assert _ozet(devam) == _ozet(bastan)
+    assert devam['df'].equals(bastan['df'])
+    assert devam['tamamlandi'].equals(bastan['tamamlandi'])
+
+
+@pytest.mark.parametrize('tohum', [0, 1])
+def test_senaryo_izgarasi_tek_tek_dongu_calistirmalariyla_ayni(tohum):
+    """Toplu izgaranın her hücresi, o hücrenin parametreleriyle tek başına çalışan döngü motoruna eşittir."""
+    borclar, gelirler = benchmark.sentetik_profil(12, 'orta', tohum)
+    borclar, gelirler = borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+    manuel = {borc.isim: sira for sira, borc in enumerate(reversed(borclar))}
+    izgara = simule_senaryo_izgarasi(borclar, gelirler, manuel, dict(benchmark.SIM_PARAMS))
+    assert len(izgara) == len(ONCELIK_STRATEJILERI) * len(STRATEJILER) * len(FAIZ_CARPANI_IZGARASI) == 36
+
+    for satir in izgara:
+        tekil = _simule_borc_planı_dongu(borclar, gelirler, manuel, **{
+            **benchmark.SIM_PARAMS,
+            'oncelik_stratejisi': ONCELIK_STRATEJILERI[satir['oncelik']],
+            'agresiflik_carpan': STRATEJILER[satir['agresiflik']],
+            'faiz_carpani': satir['faiz_carpani'],
+        })
+        for alan in ('ay_sayisi', 'toplam_faiz', 'toplam_birikim', 'limit_asimi'):
+            assert satir[alan] == tekil[alan], (satir['isim'], satir['faiz_carpani'], alan)
+
+
+def _vektorel(borclar, gelirler, motor, **sinir):
+    return _vektorel_simulasyon(borclar, gelirler, {}, [{}], **sinir, **{**benchmark.SIM_PARAMS, 'motor': motor})[0]
+
+
+@pytest.mark.parametrize('motor', ['numpy', 'olay'])
+@pytest.mark.parametrize('ufuk', ['orta', 'uzun'])
+@pytest.mark.parametrize('tohum', [0, 1])
+def test_sinira_ulasmayan_senaryonun_ozeti_degismez(motor, ufuk, tohum):
+    borclar, gelirler = benchmark.sentetik_profil(12, ufuk, tohum)
+    sinirsiz = _vektorel(borclar, gelirler, motor)
+    # Sınıra tam eşit biten senaryo da kesilmez (faiz sınırı yuvarlanmış toplamın yarım birim üstüdür).
+    for sinir in ({'faiz_siniri': sinirsiz['toplam_faiz'] + 0.5}, {'ay_siniri': sinirsiz['ay_sayisi']},
+                  {'faiz_siniri': sinirsiz['toplam_faiz'] * 2 + 1, 'ay_siniri': 360}):
+        sinirli = _vektorel(borclar, gelirler, motor, **sinir)
+        assert sinirli.pop('kesildi') is False, sinir
+        assert sinirli == sinirsiz, sinir
+
+
+@pytest.mark.parametrize('ufuk', ['orta', 'uzun'])
+@pytest.mark.parametrize('tohum', [0, 1, 2])
+def test_olay_kipi_kesme_ayinda_durur(ufuk, tohum):
+    """Olay güdümlü kip sessiz ayları atlarken kesme ayını geçmez; kesilen özet NumPy motoruyla aynıdır."""
+    borclar, gelirler = benchmark.sentetik_profil(12, ufuk, tohum)
+    sinirsiz = _vektorel(borclar, gelirler, 'numpy')
+    assert sinirsiz['ay_sayisi'] > 10
+    for sinir in ({'ay_siniri': sinirsiz['ay_sayisi'] // 2}, {'ay_siniri': sinirsiz['ay_sayisi'] - 2},
+                  {'faiz_siniri': sinirsiz['toplam_faiz'] / 2}):
+        olay = _vektorel(borclar, gelirler, 'olay', **sinir)
+        assert olay == _vektorel(borclar, gelirler, 'numpy', **sinir), sinir
+        if 'ay_siniri' in sinir:
+            assert olay['kesildi'] is True and olay['ay_sayisi'] == sinir['ay_siniri'] + 1
+        elif olay['kesildi']:  # Faiz sınırı, faizi hâlâ azalabilecek (sabit taksitli) kalem varken kesmez
+            assert olay['ay_sayisi'] < sinirsiz['ay_sayisi'] and olay['toplam_faiz'] > sinir['faiz_siniri']
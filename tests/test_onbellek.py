@@ -0,0 +1,163 @@
+"""Sonuç önbelleği: içerik özeti anahtarı, LRU tahliyesi, çağırana dönen kopya ve diske taşma."""
+
+import os
+from datetime import date
+
+import numpy as np
+
+import benchmark
+from borc_plani import borc_kayitlari, gelir_kayitlari, simule_borc_planı
+from borc_plani.onbellek import SonucOnbellegi, onbellek_anahtari, simulasyon_onbellegi
+
+
+def _profil(tohum=0):
+    borclar, gelirler = benchmark.sentetik_profil(8, 'kisa', tohum)
+    return borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+
+
+def test_anahtar_icerikten_uretilir():
+    borclar, gelirler = _profil()
+    params = dict(benchmark.SIM_PARAMS)
+    anahtar = onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, params)
+
+    # Aynı içerik: yeni nesneler, farklı sözlük sırası, int/float ve NumPy skalerleri aynı anahtarı verir.
+    yeniden = _profil()
+    ters_sira = dict(reversed(list(params.items())))
+    ters_sira['aylik_zorunlu_birikim'] = np.float64(params['aylik_zorunlu_birikim'])
+    assert onbellek_anahtari('simule_borc_planı', *yeniden, {}, ters_sira) == anahtar
+
+    # İçerik değişince anahtar değişir.
+    assert onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, {**params, 'faiz_carpani': 1.2}) != anahtar
+    assert onbellek_anahtari('simule_borc_planı', (borclar[0].degistir(tutar=borclar[0].tutar + 1),) + borclar[1:], gelirler, {}, params) != anahtar
+    assert onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, {**params, 'baslangic_tarihi': date(2026, 1, 1)}) != anahtar
+    assert onbellek_anahtari('simule_senaryo_izgarasi', borclar, gelirler, {}, params) != anahtar
+
+
+def test_motor_ve_profilleme_anahtara_girmez():
+    borclar, gelirler = _profil()
+    params = dict(benchmark.SIM_PARAMS)
+    anahtar = onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, params)
+    for motor in ('dongu', 'numpy', 'olay'):
+        assert onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, {**params, 'motor': motor}) == anahtar
+    assert onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, {**params, 'profilleme': True}) == anahtar
+
+
+def test_manuel_oncelikler_yalnizca_kullanici_stratejisinde_anahtara_girer():
+    borclar, gelirler = _profil()
+    manuel = {borclar[0].isim: 5}
+    avalanche = {**benchmark.SIM_PARAMS, 'oncelik_stratejisi': 'Avalanche'}
+    kullanici = {**benchmark.SIM_PARAMS, 'oncelik_stratejisi': 'Kullanici'}
+    assert onbellek_anahtari('simule_borc_planı', borclar, gelirler, manuel, avalanche) == onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, avalanche)
+    assert onbellek_anahtari('simule_borc_planı', borclar, gelirler, manuel, kullanici) != onbellek_anahtari('simule_borc_planı', borclar, gelirler, {}, kullanici)
+
+
+def test_lru_en_az_kullanilani_tahliye_eder():
+    onbellek = SonucOnbellegi(max_kayit=2)
+    onbellek.kaydet('a', {'deger': 1})
+    onbellek.kaydet('b', {'deger': 2})
+    assert onbellek.getir('a') == {'deger': 1}  # 'a' en son kullanılan olur
+    onbellek.kaydet('c', {'deger': 3})
+
+    assert onbellek.getir('b') is None
+    assert onbellek.getir('a') == {'deger': 1}
+    assert onbellek.getir('c') == {'deger': 3}
+    istatistik = onbellek.istatistikler()
+    assert (istatistik['kayit'], istatistik['tahliye'], istatistik['isabet'], istatistik['iskalama']) == (2, 1, 3, 1)
+
+    onbellek.boyut_ayarla(max_kayit=1)
+    assert onbellek.getir('a') is None and onbellek.getir('c') == {'deger': 3}
+
+
+def test_donen_sonuc_sig_kopyadir_ve_motorlar_kaydi_paylasir():
+    onbellek = simulasyon_onbellegi()
+    onbellek.temizle()
+    borclar, gelirler = _profil(1)
+
+    ilk = simule_borc_planı(borclar, gelirler, {}, **benchmark.SIM_PARAMS, motor='dongu')
+    assert onbellek.istatistikler()['iskalama'] == 1
+    ikinci = simule_borc_planı(borclar, gelirler, {}, **benchmark.SIM_PARAMS, motor='numpy')
+    istatistik = onbellek.istatistikler()
+    assert (istatistik['kayit'], istatistik['isabet']) == (1, 1)
+
+    # Sözlük çağırana aittir; içindeki tablolar paylaşılır (sığ kopya).
+    assert ikinci is not ilk and ikinci['df'] is ilk['df']
+    ilk['ay_sayisi'] = -1
+    del ilk['toplam_faiz']
+    ucuncu = simule_borc_planı(borclar, gelirler, {}, **benchmark.SIM_PARAMS)
+    assert ucuncu['ay_sayisi'] == ikinci['ay_sayisi'] != -1
+    assert 'toplam_faiz' in ucuncu
+    onbellek.temizle()
+
+
+def _buyuk_deger(i):
+    return {'sira': i, 'dizi': np.arange(20000, dtype=float) + i}
+
+
+def _ayni(a, b):
+    return a['sira'] == b['sira'] and np.array_equal(a['dizi'], b['dizi'])
+
+
+def test_diske_tasan_kayit_geri_okunur():
+    onbellek = SonucOnbellegi(max_kayit=1, diske_tasma=True)
+    onbellek.kaydet('a', _buyuk_deger(1))
+    onbellek.kaydet('b', _buyuk_deger(2))
+    istatistik = onbellek.istatistikler()
+    assert (istatistik['kayit'], istatistik['disk_kayit'], istatistik['tasma'], istatistik['tahliye']) == (1, 1, 1, 0)
+    yol = onbellek._diskte['a'][0]
+    assert os.path.dirname(yol) == onbellek.tasma_dizini and os.path.exists(yol)
+
+    assert _ayni(onbellek.getir('a'), _buyuk_deger(1))
+    istatistik = onbellek.istatistikler()
+    assert (istatistik['disk_isabet'], istatistik['iskalama']) == (1, 0)
+    assert not os.path.exists(yol)  # Okunan dosya silinir; kayıt belleğe döner, 'b' diske taşınır
+    assert list(onbellek._kayitlar) == ['a'] and list(onbellek._diskte) == ['b']
+    assert _ayni(onbellek.getir('b'), _buyuk_deger(2))
+    onbellek.temizle()
+
+
+def test_bozulmus_tasma_dosyasi_reddedilir():
+    onbellek = SonucOnbellegi(max_kayit=1, diske_tasma=True)
+    onbellek.kaydet('a', _buyuk_deger(1))
+    onbellek.kaydet('b', _buyuk_deger(2))
+    yol = onbellek._diskte['a'][0]
+    with open(yol, 'r+b') as f:
+        f.seek(os.path.getsize(yol) // 2)
+        bayt = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([bayt[0] ^ 0xFF]))
+
+    assert onbellek.getir('a') is None
+    istatistik = onbellek.istatistikler()
+    assert (istatistik['iskalama'], istatistik['disk_isabet'], istatistik['disk_kayit'], istatistik['disk_bayt']) == (1, 0, 0, 0)
+    assert not os.path.exists(yol)
+    onbellek.temizle()
+
+
+def test_bayt_sinirini_kucultmek_kayitlari_tasir_veya_tahliye_eder():
+    tasan = SonucOnbellegi(max_kayit=10, max_bayt=10 ** 8, diske_tasma=True)
+    atilan = SonucOnbellegi(max_kayit=10, max_bayt=10 ** 8)
+    for onbellek in (tasan, atilan):
+        for i in range(4):
+            onbellek.kaydet(i, _buyuk_deger(i))
+    kayit_boyutu = tasan.istatistikler()['bayt'] // 4
+
+    for onbellek in (tasan, atilan):
+        onbellek.boyut_ayarla(max_bayt=int(kayit_boyutu * 1.5))
+        istatistik = onbellek.istatistikler()
+        assert istatistik['kayit'] == 1 and istatistik['bayt'] <= istatistik['max_bayt']
+        assert list(onbellek._kayitlar) == [3]  # En yeni kayıt kalır
+    assert (tasan.istatistikler()['tasma'], tasan.istatistikler()['tahliye'], tasan.istatistikler()['disk_kayit']) == (3, 0, 3)
+    assert (atilan.istatistikler()['tahliye'], atilan.istatistikler()['disk_kayit']) == (3, 0)
+
+    assert _ayni(tasan.getir(0), _buyuk_deger(0)) and atilan.getir(0) is None
+    tasan.temizle()
+
+
+def test_disk_butcesi_en_eski_dosyalari_siler():
+    onbellek = SonucOnbellegi(max_kayit=1, diske_tasma=True, max_disk_bayt=1)
+    for i in range(3):
+        onbellek.kaydet(i, _buyuk_deger(i))
+    istatistik = onbellek.istatistikler()
+    assert (istatistik['disk_kayit'], istatistik['disk_bayt'], istatistik['tahliye']) == (0, 0, 2)
+    assert os.listdir(onbellek.tasma_dizini) == []
+    onbellek.temizle()
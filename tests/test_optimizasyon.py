@@ -0,0 +1,53 @@
+"""Ödeme sırası optimizasyonu: başlangıçtan kötü olmama ve erken kesme sınırının güvenliği."""
+
+import pytest
+
+import benchmark
+from borc_plani import borc_kayitlari, gelir_kayitlari, optimize_odeme_sirasi
+from borc_plani import optimizasyon
+from borc_plani.optimizasyon import _optimizasyon_puani
+from borc_plani.simulasyon import _simule_borc_planı_dongu, _vektorel_simulasyon
+
+HEDEFLER = ['toplam_faiz', 'ay_sayisi']
+
+
+def _profil(tohum):
+    borclar, gelirler = benchmark.sentetik_profil(7, 'orta', tohum)
+    return borc_kayitlari(borclar), gelir_kayitlari(gelirler)
+
+
+@pytest.mark.parametrize('hedef', HEDEFLER)
+@pytest.mark.parametrize('tohum', [0, 1, 2])
+def test_sonuc_baslangic_sirasindan_kotu_degil(hedef, tohum):
+    borclar, gelirler = _profil(tohum)
+    sonuc = optimize_odeme_sirasi(borclar, gelirler, benchmark.SIM_PARAMS, hedef=hedef, agresiflik_ara=True)
+    assert _optimizasyon_puani(sonuc['ozet'], hedef) <= _optimizasyon_puani(sonuc['baslangic'], hedef)
+    assert not sonuc['ozet'].get('kesildi', False)
+
+    # Önerilen sıra ve agresiflik döngü motorunda tek başına çalıştırıldığında aynı özeti verir.
+    params = {**benchmark.SIM_PARAMS, 'oncelik_stratejisi': 'Kullanici', 'agresiflik_carpan': sonuc['agresiflik_carpan']}
+    tekil = _simule_borc_planı_dongu(borclar, gelirler, sonuc['manuel_oncelikler'], **params)
+    for alan in ('ay_sayisi', 'toplam_faiz', 'toplam_birikim', 'limit_asimi'):
+        assert tekil[alan] == sonuc['ozet'][alan], alan
+
+
+@pytest.mark.parametrize('hedef', HEDEFLER)
+@pytest.mark.parametrize('tohum', [0, 1, 2])
+def test_erken_kesme_kazanacak_komsuyu_elemez(monkeypatch, hedef, tohum):
+    """Sınırlı arama, komşuları sınırsız değerlendiren aramayla aynı yolu izler ve aynı sonuca varır."""
+    borclar, gelirler = _profil(tohum)
+    sinirli = optimize_odeme_sirasi(borclar, gelirler, benchmark.SIM_PARAMS, hedef=hedef, agresiflik_ara=True)
+
+    kesilen = []
+
+    def sinirsiz(*args, faiz_siniri=None, ay_siniri=None, **kwargs):
+        kesilen.append((faiz_siniri, ay_siniri))
+        return _vektorel_simulasyon(*args, **kwargs)
+
+    monkeypatch.setattr(optimizasyon, '_vektorel_simulasyon', sinirsiz)
+    tam = optimize_odeme_sirasi(borclar, gelirler, benchmark.SIM_PARAMS, hedef=hedef, agresiflik_ara=True)
+
+    assert any(s != (None, None) for s in kesilen)  # Sınır gerçekten devredeydi
+    assert {k: sinirli[k] for k in ('manuel_oncelikler', 'agresiflik_carpan', 'tur', 'degerlendirilen')} == \
+           {k: tam[k] for k in ('manuel_oncelikler', 'agresiflik_carpan', 'tur', 'degerlendirilen')}
+    assert {k: v for k, v in sinirli['ozet'].items() if k != 'kesildi'} == tam['ozet']
@@ -0,0 +1,33 @@
+"""Aylık detay tablosu: kapanış ayı detayları ve motorlar arası eşitlik."""
+
+from datetime import date
+
+import pytest
+
+from borc_plani import Borc, Gelir, KURAL_KODLARI
+from borc_plani.simulasyon import _simule_borc_planı_hesapla
+
+SIM_PARAMS = {'agresiflik_carpan': 0.0, 'oncelik_stratejisi': 'Avalanche', 'faiz_carpani': 1.0, 'birikim_artis_aylik': 0.0,
+              'aylik_zorunlu_birikim': 0, 'baslangic_birikim': 0, 'total_birikim_hedefi': 0, 'birikim_tipi_str': "Aylık Sabit Tutar",
+              'baslangic_tarihi': date(2025, 1, 1)}
+
+
+def _sureli_profil():
+    borclar = [
+        Borc(isim="Kredi", tutar=30000.0, oncelik=1001, faiz_aylik=0.03, kalan_ay=3, sabit_taksit=10700.0, kural=KURAL_KODLARI['SABIT_TAKSIT_ANAPARA']),
+        Borc(isim="Kira", oncelik=1, kalan_ay=2, sabit_taksit=5000.0, kural=KURAL_KODLARI['SABIT_GIDER']),
+        Borc(isim="Kart", tutar=20000.0, oncelik=1002, faiz_aylik=0.04, kk_asgari_yuzdesi=0.2, kural=KURAL_KODLARI['ASGARI_FAIZ']),
+    ]
+    return borclar, [Gelir(isim="Maaş", tutar=40000.0)]
+
+
+@pytest.mark.parametrize('motor', ['dongu', 'numpy', 'olay'])
+def test_kapanis_ayinda_detaylar_sifir(motor):
+    """Süreli kalemin listeden çıktığı ayda detay sütunları 0'dır (ilk sürümdeki çıktı)."""
+    borclar, gelirler = _sureli_profil()
+    df = _simule_borc_planı_hesapla(borclar, gelirler, {}, motor=motor, **SIM_PARAMS)['df']
+
+    assert (df.loc[:1, 'Kredi (Faiz)'] > 0).all() and (df.loc[:1, 'Kredi (Anapara Min)'] > 0).all()
+    assert df.loc[2:, ['Kredi (Ek Ödeme)', 'Kredi (Faiz)', 'Kredi (Anapara Min)']].eq(0).all().all()
+    assert df.loc[0, 'Kira (Taksit/Gider)'] == 5000
+    assert df.loc[1:, 'Kira (Taksit/Gider)'].eq(0).all()
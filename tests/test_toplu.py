@@ -0,0 +1,69 @@
+"""Toplu çalıştırıcı: kesilen çalışmaya devam ve değişen profil/ayarın yeniden hesaplanması."""
+
+import json
+import os
+
+import pandas as pd
+
+import benchmark
+import toplu
+
+# Başlangıç tarihi her profilin kendi dosyasından okunur.
+SIM_PARAMS = {k: v for k, v in benchmark.SIM_PARAMS.items() if k != 'baslangic_tarihi'}
+
+
+def _profil_yaz(yol, tohum):
+    borclar, gelirler = benchmark.sentetik_profil(4, 'kisa', tohum)
+    with open(yol, 'w', encoding='utf-8') as f:
+        json.dump({'borclar': borclar, 'gelirler': gelirler, 'baslangic_tarihi': '2025-01-01'}, f, ensure_ascii=False)
+
+
+def _calistir(girdi, cikti, **params):
+    """Toplu çalıştırır; bu çalışmada günlüğe yazılan (yani hesaplanan) profil adlarını döndürür."""
+    gunluk = os.path.join(cikti, toplu.ILERLEME_DOSYASI)
+    onceki = os.path.getsize(gunluk) if os.path.exists(gunluk) else 0
+    toplu.toplu_calistir([girdi], cikti, {**SIM_PARAMS, **params}, surec_sayisi=1, parca_boyutu=2, sessiz=True)
+    with open(gunluk, encoding='utf-8') as f:
+        f.seek(onceki)
+        return sorted(json.loads(satir)['profil'] for satir in f)
+
+
+def test_yeniden_calistirma_biten_profilleri_atlar(tmp_path):
+    girdi, cikti = tmp_path / 'profiller', str(tmp_path / 'cikti')
+    girdi.mkdir()
+    for tohum in range(3):
+        _profil_yaz(girdi / f'p{tohum}.json', tohum)
+
+    assert _calistir(str(girdi), cikti) == ['p0.json', 'p1.json', 'p2.json']
+    ozet = pd.read_csv(os.path.join(cikti, toplu.OZET_DOSYASI))
+    assert ozet['hata'].isna().all() and sorted(ozet['profil'].unique()) == ['p0.json', 'p1.json', 'p2.json']
+
+    # Değişiklik yoksa hiçbir profil yeniden hesaplanmaz ve özet aynı kalır.
+    assert _calistir(str(girdi), cikti) == []
+    assert pd.read_csv(os.path.join(cikti, toplu.OZET_DOSYASI)).equals(ozet)
+
+    # Yarıda kesilmiş çalışma: günlükte olmayan ve son satırı yarım kalan profiller hesaplanır.
+    gunluk = os.path.join(cikti, toplu.ILERLEME_DOSYASI)
+    with open(gunluk, encoding='utf-8') as f:
+        satirlar = f.readlines()
+    with open(gunluk, 'w', encoding='utf-8') as f:
+        f.writelines(satirlar[:1])
+        f.write(satirlar[1][:20])
+    bitmis = json.loads(satirlar[0])['profil']
+    assert _calistir(str(girdi), cikti) == sorted({'p0.json', 'p1.json', 'p2.json'} - {bitmis})
+
+
+def test_degisen_profil_veya_ayar_yeniden_hesaplanir(tmp_path):
+    girdi, cikti = tmp_path / 'profiller', str(tmp_path / 'cikti')
+    girdi.mkdir()
+    for tohum in range(3):
+        _profil_yaz(girdi / f'p{tohum}.json', tohum)
+    _calistir(str(girdi), cikti)
+
+    _profil_yaz(girdi / 'p1.json', 7)
+    assert _calistir(str(girdi), cikti) == ['p1.json']
+    assert _calistir(str(girdi), cikti) == []
+
+    assert _calistir(str(girdi), cikti, faiz_carpani=1.2) == ['p0.json', 'p1.json', 'p2.json']
+    ozet = pd.read_csv(os.path.join(cikti, toplu.OZET_DOSYASI))
+    assert ozet.loc[ozet['mevcut'], 'faiz_carpani'].eq(1.2).all() and ozet['mevcut'].sum() == 3
@@ -0,0 +1,251 @@
+"""Kayıtlı JSON profillerini (create_save_data biçimi) Streamlit arayüzü olmadan toplu olarak çalıştırır.
+
+Her profil için ana plan ve strateji ızgarasındaki alternatifler simüle edilir; sonuçlar tek bir
+sütunlu özet tablosunda (ozet.csv) toplanır. İstenirse ana planın aylık detayı profil başına ayrı
+bir CSV olarak yazılır. Biten profiller ilerleme günlüğüne işlendiğinden, yarıda kesilen bir çalışma
+aynı komutla yeniden başlatıldığında yalnızca kalan (veya içeriği değişmiş) profilleri hesaplar.
+
+Kullanım:
+    python toplu.py profiller/ -o cikti/ --surec 4 --parca 16 --detay
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+from borc_plani.kayitlar import borc_kayitlari, gelir_kayitlari
+from borc_plani.monte_carlo import _surec_baglami
+from borc_plani.sabitler import FAIZ_CARPANI_IZGARASI, ONCELIK_STRATEJILERI, SIMULASYON_MOTORLARI, STRATEJILER
+from borc_plani.simulasyon import _simule_borc_planı_hesapla, simule_senaryo_izgarasi
+
+ILERLEME_DOSYASI = '.ilerleme.jsonl'
+OZET_DOSYASI = 'ozet.csv'
+DETAY_KLASORU = 'detay'
+OZET_SUTUNLARI = ['profil', 'senaryo', 'oncelik', 'agresiflik', 'faiz_carpani', 'mevcut', 'ay_sayisi', 'toplam_faiz', 'toplam_birikim', 'limit_asimi', 'hata']
+
+
+def profilleri_bul(girdiler):
+    """Verilen dosya/klasörlerdeki JSON profillerini (göreli ad, tam yol) çiftleri olarak sıralı döndürür."""
+    profiller = {}
+    for girdi in girdiler:
+        if os.path.isdir(girdi):
+            for kok, _, dosyalar in os.walk(girdi):
+                for dosya in dosyalar:
+                    if dosya.endswith('.json'):
+                        yol = os.path.join(kok, dosya)
+                        profiller[os.path.relpath(yol, girdi).replace(os.sep, '/')] = yol
+        elif os.path.isfile(girdi):
+            profiller[os.path.basename(girdi)] = girdi
+        else:
+            raise FileNotFoundError(f"Profil bulunamadı: {girdi}")
+    return sorted(profiller.items())
+
+
+def _dosya_ozeti(yol, ayarlar):
+    """Profil içeriği ve çalışma ayarlarının özeti; ikisinden biri değişen profil yeniden hesaplanır."""
+    with open(yol, 'rb') as f:
+        return hashlib.sha256(f.read() + json.dumps(ayarlar, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def ilerlemeyi_oku(cikti_klasoru):
+    """Günlükteki biten profilleri {profil: kayıt} olarak döndürür (aynı profilin son kaydı geçerlidir)."""
+    kayitlar = {}
+    yol = os.path.join(cikti_klasoru, ILERLEME_DOSYASI)
+    if not os.path.exists(yol):
+        return kayitlar
+    with open(yol, encoding='utf-8') as f:
+        for satir in f:
+            try:
+                kayit = json.loads(satir)
+            except json.JSONDecodeError:
+                continue  # Kesinti sırasında yarım kalmış son satır
+            kayitlar[kayit['profil']] = kayit
+    return kayitlar
+
+
+def _json_varsayilan(deger):
+    if hasattr(deger, 'item'):
+        return deger.item()
+    raise TypeError(f"JSON'a çevrilemeyen değer: {deger!r}")
+
+
+def _atomik_yaz(yol, yaz):
+    gecici = f"{yol}.tmp"
+    yaz(gecici)
+    os.replace(gecici, yol)
+
+
+def _detay_yolu(detay_klasoru, profil):
+    return os.path.join(detay_klasoru, os.path.splitext(profil)[0].replace('/', '__') + '.csv')
+
+
+def _profili_calistir(profil, yol, sim_params, faiz_carpanlari, detay_klasoru):
+    """Tek bir profilin ızgara özetini (ve istenirse aylık detayını) hesaplar."""
+    with open(yol, encoding='utf-8') as f:
+        data = json.load(f)
+
+    borclar = borc_kayitlari(data.get('borclar', []))
+    gelirler = gelir_kayitlari(data.get('gelirler', []))
+    manuel_oncelikler = data.get('manuel_oncelik_listesi', {})
+    params = dict(sim_params, baslangic_tarihi=date.fromisoformat(data['baslangic_tarihi']) if 'baslangic_tarihi' in data else date.today())
+
+    izgara = simule_senaryo_izgarasi(borclar, gelirler, manuel_oncelikler, params, faiz_carpanlari)
+    if not izgara:
+        raise ValueError("Profilde borç veya gelir kalemi yok.")
+
+    satirlar = []
+    for r in izgara:
+        mevcut = ONCELIK_STRATEJILERI[r['oncelik']] == params['oncelik_stratejisi'] and STRATEJILER[r['agresiflik']] == params['agresiflik_carpan'] and r['faiz_carpani'] == params['faiz_carpani']
+        satirlar.append({'senaryo': r['isim'], 'oncelik': r['oncelik'], 'agresiflik': r['agresiflik'], 'faiz_carpani': r['faiz_carpani'], 'mevcut': mevcut,
+                         'ay_sayisi': r['ay_sayisi'], 'toplam_faiz': r['toplam_faiz'], 'toplam_birikim': r['toplam_birikim'], 'limit_asimi': r['limit_asimi']})
+
+    if detay_klasoru:
+        sonuc = _simule_borc_planı_hesapla(borclar, gelirler, manuel_oncelikler, **params)
+        _atomik_yaz(_detay_yolu(detay_klasoru, profil), lambda gecici: sonuc['df'].to_csv(gecici, index=False))
+
+    return satirlar
+
+
+def profil_parcasi(isler, sim_params, faiz_carpanlari, detay_klasoru):
+    """Süreç havuzunda çalışan iş birimi: bir parça profili sırayla hesaplar, hatalı profili kaydedip devam eder."""
+    kayitlar = []
+    for profil, yol, ozet in isler:
+        kayit = {'profil': profil, 'ozet': ozet, 'satirlar': [], 'hata': None}
+        try:
+            kayit['satirlar'] = _profili_calistir(profil, yol, sim_params, faiz_carpanlari, detay_klasoru)
+        except Exception as e:
+            kayit['hata'] = f"{type(e).__name__}: {e}"
+        kayitlar.append(kayit)
+    return kayitlar
+
+
+def ozeti_yaz(cikti_klasoru, profiller, kayitlar):
+    """Günlükteki kayıtlardan, bu çalışmadaki profilleri kapsayan sütunlu özet tablosunu yazar."""
+    sutunlar = {ad: [] for ad in OZET_SUTUNLARI}
+    for profil, _ in profiller:
+        kayit = kayitlar.get(profil)
+        if kayit is None:
+            continue
+        for satir in kayit['satirlar'] or [{}]:
+            sutunlar['profil'].append(profil)
+            sutunlar['hata'].append(kayit['hata'])
+            for ad in OZET_SUTUNLARI[1:-1]:
+                sutunlar[ad].append(satir.get(ad))
+
+    yol = os.path.join(cikti_klasoru, OZET_DOSYASI)
+    import pandas as pd
+
+    _atomik_yaz(yol, lambda gecici: pd.DataFrame(sutunlar).convert_dtypes().to_csv(gecici, index=False))
+    return yol
+
+
+def _sure(saniye):
+    dakika, saniye = divmod(int(saniye), 60)
+    return f"{dakika}dk {saniye:02d}sn" if dakika else f"{saniye}sn"
+
+
+def toplu_calistir(girdiler, cikti_klasoru, sim_params, faiz_carpanlari=None, surec_sayisi=None, parca_boyutu=16, detay=False, sessiz=False):
+    """Profilleri parçalara bölüp süreç havuzunda çalıştırır; biten her parçayı günlüğe işler ve sonunda özeti yazar."""
+    profiller = profilleri_bul(girdiler)
+    os.makedirs(cikti_klasoru, exist_ok=True)
+    detay_klasoru = os.path.join(cikti_klasoru, DETAY_KLASORU) if detay else None
+    if detay_klasoru:
+        os.makedirs(detay_klasoru, exist_ok=True)
+
+    # İçeriği ve ayarları değişmemiş, (detay istendiyse) detay dosyası yazılmış profiller yeniden hesaplanmaz.
+    kayitlar = ilerlemeyi_oku(cikti_klasoru)
+    ayarlar = [sim_params, faiz_carpanlari]
+    isler = []
+    for profil, yol in profiller:
+        ozet = _dosya_ozeti(yol, ayarlar)
+        onceki = kayitlar.get(profil)
+        detay_eksik = detay_klasoru and not os.path.exists(_detay_yolu(detay_klasoru, profil))
+        if onceki is None or onceki['ozet'] != ozet or (detay_eksik and not onceki['hata']):
+            isler.append((profil, yol, ozet))
+
+    toplam, biten = len(profiller), len(profiller) - len(isler)
+    if not sessiz:
+        print(f"{toplam} profil bulundu; {biten} tanesi önceki çalışmadan alındı, {len(isler)} tanesi hesaplanacak.", file=sys.stderr)
+
+    parcalar = [isler[i:i + parca_boyutu] for i in range(0, len(isler), parca_boyutu)]
+    baslangic = time.perf_counter()
+    hesaplanan = 0
+
+    with open(os.path.join(cikti_klasoru, ILERLEME_DOSYASI), 'a', encoding='utf-8') as gunluk:
+        havuz = ProcessPoolExecutor(max_workers=surec_sayisi or os.cpu_count(), mp_context=_surec_baglami())
+        try:
+            gorevler = [havuz.submit(profil_parcasi, parca, sim_params, faiz_carpanlari, detay_klasoru) for parca in parcalar]
+            for gorev in as_completed(gorevler):
+                for kayit in gorev.result():
+                    gunluk.write(json.dumps(kayit, ensure_ascii=False, default=_json_varsayilan) + '\n')
+                    kayitlar[kayit['profil']] = kayit
+                gunluk.flush()
+                os.fsync(gunluk.fileno())
+
+                hesaplanan += len(gorev.result())
+                if not sessiz:
+                    gecen = time.perf_counter() - baslangic
+                    hiz = hesaplanan / gecen if gecen else 0.0
+                    kalan = (len(isler) - hesaplanan) / hiz if hiz else 0.0
+                    print(f"[{biten + hesaplanan:>{len(str(toplam))}}/{toplam}] {100 * (biten + hesaplanan) / toplam:5.1f}% | {hiz:.1f} profil/sn | kalan ~{_sure(kalan)}", file=sys.stderr)
+        finally:
+            havuz.shutdown(wait=True, cancel_futures=True)
+
+    yol = ozeti_yaz(cikti_klasoru, profiller, kayitlar)
+    hatali = sum(1 for profil, _ in profiller if kayitlar[profil]['hata'])
+    if not sessiz:
+        print(f"Özet yazıldı: {yol} ({toplam} profil, {hatali} hatalı, {_sure(time.perf_counter() - baslangic)})", file=sys.stderr)
+    return yol
+
+
+def _arguman_ayristirici():
+    ayristirici = argparse.ArgumentParser(description="Kayıtlı JSON profillerini ana plan ve alternatif stratejilerle toplu olarak çalıştırır.")
+    ayristirici.add_argument('girdiler', nargs='+', help="Profil JSON dosyaları veya bunları içeren klasörler (alt klasörler dahil)")
+    ayristirici.add_argument('-o', '--cikti', required=True, help="Özet, detay ve ilerleme günlüğünün yazılacağı klasör")
+    ayristirici.add_argument('--surec', type=int, default=None, help="Süreç sayısı (varsayılan: işlemci sayısı)")
+    ayristirici.add_argument('--parca', type=int, default=16, help="Bir görevde işlenecek profil sayısı (varsayılan: 16)")
+    ayristirici.add_argument('--detay', action='store_true', help="Ana planın aylık detayını profil başına CSV olarak yaz")
+    ayristirici.add_argument('--sessiz', action='store_true', help="İlerleme bilgisi yazdırma")
+    ayristirici.add_argument('--oncelik', choices=list(ONCELIK_STRATEJILERI.values()), default='Avalanche', help="Ana planın borç kapatma yöntemi")
+    ayristirici.add_argument('--agresiflik', type=float, choices=list(STRATEJILER.values()), default=1.0, help="Ana planın ek ödeme agresifliği çarpanı")
+    ayristirici.add_argument('--faiz-carpani', type=float, default=1.0, help="Ana planın faiz oranı çarpanı")
+    ayristirici.add_argument('--izgara-faiz-carpanlari', default=','.join(str(c) for c in FAIZ_CARPANI_IZGARASI), help="Alternatiflerde denenecek faiz çarpanları (virgülle ayrılmış)")
+    ayristirici.add_argument('--birikim-artis', type=float, default=3.5, help="Birikim yıllık artış yüzdesi")
+    ayristirici.add_argument('--aylik-birikim', type=float, default=5000, help="Aylık zorunlu birikim tutarı")
+    ayristirici.add_argument('--toplam-birikim-hedefi', type=float, default=None, help="Verilirse birikim, borç bitimine kadar bu toplam tutara ulaşacak şekilde ayrılır")
+    ayristirici.add_argument('--baslangic-birikim', type=float, default=0, help="Mevcut başlangıç birikimi")
+    ayristirici.add_argument('--motor', choices=list(SIMULASYON_MOTORLARI.values()), default='numpy', help="Aylık detay için simülasyon motoru")
+    return ayristirici
+
+
+def main(argv=None):
+    args = _arguman_ayristirici().parse_args(argv)
+    toplam_hedefli = args.toplam_birikim_hedefi is not None
+    sim_params = {
+        'agresiflik_carpan': args.agresiflik,
+        'oncelik_stratejisi': args.oncelik,
+        'faiz_carpani': args.faiz_carpani,
+        'birikim_artis_aylik': args.birikim_artis,
+        'aylik_zorunlu_birikim': 0 if toplam_hedefli else args.aylik_birikim,
+        'baslangic_birikim': args.baslangic_birikim,
+        'total_birikim_hedefi': args.toplam_birikim_hedefi if toplam_hedefli else 0,
+        'birikim_tipi_str': "Borç Bitimine Kadar Toplam Tutar" if toplam_hedefli else "Aylık Sabit Tutar",
+        'motor': args.motor,
+    }
+    faiz_carpanlari = [float(c) for c in args.izgara_faiz_carpanlari.split(',') if c.strip()]
+
+    try:
+        toplu_calistir(args.girdiler, args.cikti, sim_params, faiz_carpanlari, args.surec, args.parca, args.detay, args.sessiz)
+    except KeyboardInterrupt:
+        print("Kesildi; aynı komut yeniden çalıştırıldığında kalan profillerden devam edilir.", file=sys.stderr)
+        return 130
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())